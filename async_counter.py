@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+异步接口：在 asyncio 服务中统计和标注文档
+
+VideoScriptCounter 是同步的、基于文件路径的。这里的 AsyncScriptCounter 接受文件内容（bytes）
+或异步文件流（有协程 read() 的对象，如 asyncio.StreamReader、aiofiles 打开的文件），
+把解析、统计和标注交给执行器，事件循环不会被阻塞；同时处理多个文档时限制并发数。
+
+用法：
+    async with AsyncScriptCounter(concurrency=4) as counter:
+        stats = await counter.count(data)                  # DocumentStats
+        stats, annotated = await counter.annotate(reader)
+        results = await counter.count_many([data1, data2, data3])
+"""
+
+import asyncio
+import inspect
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from video_script_counter import process_bytes
+
+# 读取异步文件流时每次读取的字节数
+READ_CHUNK = 1 << 16
+
+
+async def read_source(source):
+    """
+    读出文档内容
+
+    Args:
+        source: bytes / bytearray / memoryview，或有协程 read(n) 方法的异步文件流
+
+    Returns:
+        bytes
+
+    Raises:
+        TypeError: 不支持的输入类型
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+
+    read = getattr(source, 'read', None)
+    if read is None:
+        raise TypeError(f"需要 bytes 或异步文件流，而不是 {type(source).__name__}")
+
+    chunks = []
+    while True:
+        chunk = read(READ_CHUNK)
+        if not inspect.isawaitable(chunk):
+            # 同步文件对象的 read() 会阻塞事件循环
+            raise TypeError(f"{type(source).__name__}.read() 不是协程，需要异步文件流")
+        data = await chunk
+        if not data:
+            return b''.join(chunks)
+        chunks.append(data)
+
+
+class AsyncScriptCounter:
+    """在执行器中处理文档的异步接口，可在多个协程之间共用"""
+
+    def __init__(self, executor=None, concurrency=None, engine=None):
+        """
+        初始化
+
+        Args:
+            executor: concurrent.futures 执行器（默认在第一次使用时创建进程池，
+                工作进程数为 concurrency 或 CPU 核数；close() 时关闭）
+            concurrency: 同时处理的文档数上限（默认为 CPU 核数）
+            engine: 提供统计配置的 CountingEngine 对象（可选；随每个文档传给执行器）
+        """
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.engine = engine
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def _get_executor(self):
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.concurrency)
+        return self._executor
+
+    def _discard(self, broken):
+        """工作进程异常退出后进程池不能再用：丢弃自动创建的进程池，下次使用时重新创建"""
+        if self._owns_executor and self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, source, write):
+        # 读取也在名额内进行：同时在内存中的文档不超过 concurrency 个
+        async with self._semaphore:
+            data = await read_source(source)
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, process_bytes, data, write, None,
+                                                  self.engine)
+            except BrokenProcessPool:
+                # 这个文档（或同时在处理的其他文档）导致工作进程退出，之后的文档不受影响
+                self._discard(executor)
+                raise
+
+    async def count(self, source):
+        """
+        只统计、不生成文档
+
+        Args:
+            source: 文档内容（bytes）或异步文件流
+
+        Returns:
+            DocumentStats
+        """
+        stats, _ = await self._run(source, False)
+        return stats
+
+    async def annotate(self, source):
+        """
+        统计并生成带标注的文档
+
+        Args:
+            source: 文档内容（bytes）或异步文件流
+
+        Returns:
+            (DocumentStats, 带标注的文档内容)
+        """
+        return await self._run(source, True)
+
+    async def count_many(self, sources, return_exceptions=False):
+        """
+        并发统计多个文档（同时处理的数量不超过 concurrency）
+
+        Args:
+            sources: 文档内容或异步文件流的列表
+            return_exceptions: 为 True 时出错的文档返回异常对象，不影响其他文档
+
+        Returns:
+            与 sources 一一对应的 DocumentStats 列表
+        """
+        return await asyncio.gather(*(self.count(source) for source in sources),
+                                    return_exceptions=return_exceptions)
+
+    async def annotate_many(self, sources, return_exceptions=False):
+        """并发统计并标注多个文档，返回 (DocumentStats, 带标注的文档内容) 列表"""
+        return await asyncio.gather(*(self.annotate(source) for source in sources),
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        """关闭自动创建的进程池（传入的执行器由调用方关闭）"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # 等待工作进程退出也放到线程中，不阻塞事件循环
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""字数统计性能对比：三次正则扫描 vs 单次扫描分类，以及逐段统计 vs 批量统计"""
+
+import random
+import re
+import time
+import tracemalloc
+
+import bulk_count
+from video_script_counter import VideoScriptCounter
+
+# test_new_counting.py 中的示例文本
+sample = """Hello everyone! 欢迎来到我们的"语法基地"！我是你们的首席语法工程师，Jade！
+
+(凑近镜头，神秘地) 有些同学一听到"语法"这两个字，眉头就皱成了一个大大的"川"字。是不是觉得语法就是一堆枯燥的规则，听着就头大？
+
+其实啊，你们被骗啦！学语法根本不是死记硬背。大家可以把学英语想象成是盖一座摩天大楼。我们背的那些单词，就是一块块砖头、水泥，它们是建筑材料。语法就是大楼的钢筋骨架！只要把骨架搭好，材料填进去，这栋大楼就会稳稳当当，又漂亮又结实！
+
+在这门课程里，Jade老师会带着大家，从零开始，亲手搭建属于你自己的英语大厦！今天我们的任务是——打牢地基！也是对我们整个30天课程知识点的一个提前剧透！因为所有的课程都会围绕今天的"地基内容"展开。只要搞定今天这三个核心概念，我保证，你以后看英语句子的眼光都会不一样。
+
+Are you ready? Let's build!"""
+
+
+# 原来的三次正则扫描实现
+def count_characters_three_pass(text):
+    chinese_chars = len(re.findall(r'[一-鿿　-〿＀-￯]', text))
+    english_words = len(re.findall(r"[a-zA-Z]+(?:'[a-zA-Z]+)?", text))
+    digits = len(re.findall(r'\d', text))
+    return chinese_chars + english_words + digits
+
+
+def make_corpus(paragraphs, seed=0):
+    """生成中英文混合的大规模测试语料"""
+    rng = random.Random(seed)
+    pieces = [
+        sample,
+        "首先，我们来看看什么是加法。加法就是把两个数字合在一起，比如2 + 3 = 5。\n",
+        "Let's count together: one, two, three! Don't forget the apples.\n",
+        "第１题：院子里有３只小猫，又来了４只小猫，现在一共有几只？\n",
+    ]
+    return ''.join(rng.choice(pieces) for _ in range(paragraphs))
+
+
+def bench(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func, text):
+    """返回统计过程中的内存峰值（字节）"""
+    tracemalloc.start()
+    func(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    counter = VideoScriptCounter.__new__(VideoScriptCounter)
+    corpus = make_corpus(20000)
+
+    print("=" * 70)
+    print("字数统计性能对比（取多次运行的最好成绩）")
+    print("=" * 70)
+
+    for name, text, repeat in (("示例文本", sample, 2000), ("合成语料", corpus, 5)):
+        old = count_characters_three_pass(text)
+        new = counter.count_characters(text)
+        assert old == new, f"统计结果不一致: {old} != {new}"
+
+        old_time = bench(count_characters_three_pass, text, repeat)
+        new_time = bench(counter.count_breakdown, text, repeat)
+
+        print(f"\n{name}（{len(text)} 个字符，{new} 字）:")
+        print(f"  三次正则扫描: {old_time * 1000:.3f} ms")
+        print(f"  单次扫描分类: {new_time * 1000:.3f} ms")
+        print(f"  加速比: {old_time / new_time:.2f}x")
+        print(f"  内存峰值: {peak_memory(count_characters_three_pass, text) / 1024:.1f} KB"
+              f" -> {peak_memory(counter.count_breakdown, text) / 1024:.1f} KB")
+        print(f"  分类统计: {counter.count_breakdown(text)}")
+
+    # 大量段落：逐段统计 vs 拼接成码位数组的批量统计
+    paragraphs = corpus.split('\n')
+    expected = [counter.count_characters(text) for text in paragraphs]
+    bulk = [int(total) for total in bulk_count.count_characters(paragraphs)]
+    assert bulk == expected, "批量统计结果与逐段统计不一致"
+
+    per_text_time = bench(lambda texts: [counter.count_characters(t) for t in texts], paragraphs, 3)
+    bulk_time = bench(bulk_count.count_characters, paragraphs, 3)
+    mode = "numpy" if bulk_count.HAVE_NUMPY else "未安装 numpy，逐段统计"
+    print(f"\n{len(paragraphs)} 个段落（{sum(expected)} 字）:")
+    print(f"  逐段统计: {per_text_time * 1000:.1f} ms")
+    print(f"  批量统计（{mode}）: {bulk_time * 1000:.1f} ms")
+    print(f"  加速比: {per_text_time / bulk_time:.2f}x")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+启动时间测试：比较解释器启动、导入模块和只统计的命令行调用的用时
+
+编辑器钩子等场景每次都会启动新进程处理一个小脚本，启动和导入的用时往往比统计本身更长。
+只统计的路径（--report、count_document）不应导入 python-docx。
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+HERE = Path(__file__).resolve().parent
+
+
+def best_time(args, repeat):
+    """运行命令 repeat 次，返回最短用时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=HERE, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '脚本.docx'
+        doc = Document()
+        for text in ("第一部分：引入", "大家好！（播放开场动画）",
+                     "第二部分：知识点讲解", "首先，我们来看看什么是加法。"):
+            doc.add_paragraph(text)
+        doc.save(str(path))
+
+        python = sys.executable
+        cases = [
+            ("解释器启动", [python, '-c', 'pass']),
+            ("导入 python-docx", [python, '-c', 'import docx']),
+            ("导入 video_script_counter", [python, '-c', 'import video_script_counter']),
+            ("只统计（--report json）",
+             [python, 'video_script_counter.py', str(path), '--report', 'json', '--no-cache']),
+            ("统计并写入标注",
+             [python, 'video_script_counter.py', str(path), '--no-cache']),
+        ]
+
+        print("=" * 70)
+        print(f"启动时间测试（取 {repeat} 次运行的最好成绩）")
+        print("=" * 70)
+        for name, args in cases:
+            print(f"  {name:<28}{best_time(args, repeat) * 1000:>8.1f} ms")
+
+        # 只统计的路径不应导入 python-docx
+        check = (
+            "import sys, video_script_counter as v\n"
+            f"v.VideoScriptCounter({str(path)!r}, verbose=False).count_document()\n"
+            "print(sorted(m for m in ('docx', 'lxml') if m in sys.modules))"
+        )
+        loaded = subprocess.run([python, '-c', check], cwd=HERE, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        status = "✓" if loaded == '[]' else "✗"
+        print(f"\n只统计时导入的重型模块: {loaded} {status}")
+        print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
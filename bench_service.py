@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP 标注服务压力测试
+
+多个线程并发上传同一个脚本，统计吞吐量、延迟分位数和各状态码的数量。
+503（服务繁忙）说明背压生效：超出容量的请求被立即拒绝，而不是无限排队。
+
+    python service.py --port 8000 -j 4 &
+    python bench_service.py --url http://127.0.0.1:8000 -c 16 -n 400
+
+也可以由本脚本启动服务（--start），测试结束后自动关闭：
+    python bench_service.py --start -j 4 -c 16 -n 400
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+HERE = Path(__file__).resolve().parent
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=30.0):
+    """等待服务的 /health 可以访问"""
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=1)
+            connection.request('GET', '/health')
+            status = json.loads(connection.getresponse().read())
+            connection.close()
+            return status
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def load_test(url, data, endpoint='annotate', concurrency=8, requests=100):
+    """
+    并发发送请求
+
+    Args:
+        url: 服务地址（如 http://127.0.0.1:8000）
+        data: 上传的 .docx 文件内容
+        endpoint: annotate 或 stats
+        concurrency: 并发的客户端线程数（每个线程保持一个长连接）
+        requests: 请求总数
+
+    Returns:
+        字典：elapsed（秒）、statuses（状态码计数）、latencies（成功请求的延迟，秒）
+    """
+    parts = urlsplit(url)
+    path = f'/{endpoint}?filename=bench.docx'
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    statuses = Counter()
+    latencies = []
+
+    def client():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            start = time.perf_counter()
+            try:
+                connection.request('POST', path, body=data)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                if response.will_close:
+                    connection.close()
+            except OSError as e:
+                status = type(e).__name__
+                connection.close()
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        'elapsed': time.perf_counter() - start,
+        'statuses': dict(statuses),
+        'latencies': sorted(latencies),
+    }
+
+
+def percentile(values, fraction):
+    """已排序列表的分位数"""
+    if not values:
+        return float('nan')
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def print_results(result, concurrency):
+    latencies = result['latencies']
+    succeeded = len(latencies)
+    print(f"并发 {concurrency}，共 {sum(result['statuses'].values())} 个请求，"
+          f"用时 {result['elapsed']:.2f} 秒")
+    print(f"  状态码: {', '.join(f'{k}×{v}' for k, v in sorted(result['statuses'].items(), key=str))}")
+    print(f"  吞吐量: {succeeded / result['elapsed']:.1f} 个文档/秒（成功的请求）")
+    print("  延迟: " + '  '.join(f"{name} {percentile(latencies, q) * 1000:.1f}ms"
+                                for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 标注服务压力测试")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="服务地址")
+    parser.add_argument('--start', action='store_true', help="启动一个临时的服务进行测试")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="--start 时服务的工作进程数")
+    parser.add_argument('--queue', type=int, default=None, help="--start 时服务的排队上限")
+    parser.add_argument('--endpoint', choices=('annotate', 'stats'), default='annotate')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="并发的客户端数（默认 8）")
+    parser.add_argument('-n', '--requests', type=int, default=100, help="请求总数（默认 100）")
+    parser.add_argument('--file', help="上传的 .docx（默认生成 200 段的测试脚本）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            data = Path(args.file).read_bytes()
+        else:
+            from benchmark import generate_script
+            path = Path(tmp) / 'bench.docx'
+            generate_script(path, paragraphs=200)
+            data = path.read_bytes()
+
+        server = None
+        url = args.url
+        if args.start:
+            port = _free_port()
+            url = f'http://127.0.0.1:{port}'
+            command = [sys.executable, str(HERE / 'service.py'), '--port', str(port)]
+            if args.jobs:
+                command += ['-j', str(args.jobs)]
+            if args.queue is not None:
+                command += ['--queue', str(args.queue)]
+            server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        try:
+            status = wait_until_ready(url)
+            print(f"服务: {url}（{status['workers']} 个工作进程，容量 {status['capacity']}），"
+                  f"上传 {len(data) / 1024:.0f} KB 到 /{args.endpoint}")
+            result = load_test(url, data, args.endpoint, args.concurrency, args.requests)
+            print_results(result, args.concurrency)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
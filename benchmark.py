@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+性能基准测试
+
+用参数化的生成器合成不同规模的视频脚本，分别计时 VideoScriptCounter 的各个阶段：
+读取文档、切分部分、移除括号、统计字数、添加标注、保存文档，
+并检查 PRD 5.3 的"处理单个文档时间 < 1秒"。
+
+结果以 JSON 输出，可以保存为基准，之后与基准比较以发现性能退化：
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json
+
+也可以只生成测试文档：
+    python benchmark.py --generate 大脚本.docx --paragraphs 5000 --images 10
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Inches
+
+from video_script_counter import VideoScriptCounter, document_paragraphs
+
+# PRD 5.3：处理单个文档时间 < 1秒
+TARGET_SECONDS = 1.0
+
+STAGES = ('load', 'segment', 'remove_brackets', 'count_characters', 'annotate', 'save')
+
+# 预设的测试用例：生成参数
+CASES = {
+    'small': dict(paragraphs=40),
+    'medium': dict(paragraphs=1000),
+    'large': dict(paragraphs=10000),
+    'brackets': dict(paragraphs=1000, bracket_density=1.0, nesting_depth=6),
+    'english': dict(paragraphs=1000, english_ratio=0.8),
+    'images': dict(paragraphs=200, images=20),
+}
+
+_CJK_TEXT = ("今天我们来学习加法的基本概念首先看看什么是加法就是把两个数字合在一起"
+             "小明有两个苹果小红又给了他三个苹果那么现在一共有几个苹果呢大家想一想")
+_CJK_PUNCT = "，。！？"
+_ENGLISH_WORDS = ("let's count together one two three apples grammar is the skeleton "
+                  "of a building words are the bricks are you ready").split()
+_CUES = ("展示图片", "播放动画", "停顿3秒", "板书展示", "背景音乐渐起", "鼓掌音效")
+
+
+def _png(width, height, rng):
+    """生成随机噪点 PNG（几乎不可压缩，模拟照片）"""
+    raw = b''.join(b'\0' + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data)))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw))
+            + chunk(b'IEND', b''))
+
+
+def _cue(rng, depth):
+    """生成一个括号内的画面提示，最多嵌套 depth 层"""
+    opener, closer = rng.choice(VideoScriptCounter.BRACKET_PAIRS)
+    inner = rng.choice(_CUES)
+    if depth > 1 and rng.random() < 0.5:
+        inner += _cue(rng, depth - 1)
+    return opener + inner + closer
+
+
+def _sentence(rng, bracket_density, nesting_depth, english_ratio):
+    """生成一句口播文本"""
+    if rng.random() < english_ratio:
+        words = [rng.choice(_ENGLISH_WORDS) for _ in range(rng.randint(4, 12))]
+        text = ' '.join(words).capitalize() + rng.choice('.!?')
+    else:
+        start = rng.randrange(len(_CJK_TEXT) - 20)
+        text = _CJK_TEXT[start:start + rng.randint(8, 20)]
+        if rng.random() < 0.3:
+            text += str(rng.randint(1, 100))
+        text += rng.choice(_CJK_PUNCT)
+    if nesting_depth > 0 and rng.random() < bracket_density:
+        cut = rng.randint(0, len(text))
+        text = text[:cut] + _cue(rng, nesting_depth) + text[cut:]
+    return text
+
+
+def generate_script(path, paragraphs=200, bracket_density=0.3, nesting_depth=2,
+                    english_ratio=0.2, images=0, seed=0):
+    """
+    生成包含四个部分的合成视频脚本
+
+    Args:
+        path: 输出 .docx 路径
+        paragraphs: 正文段落数（平均分配到四个部分，不含标题）
+        bracket_density: 每句话带括号提示的概率（0~1）
+        nesting_depth: 括号最大嵌套层数（0 表示没有括号）
+        english_ratio: 英文句子的比例（0~1）
+        images: 嵌入的图片数量（每张约 120KB，几乎不可压缩）
+        seed: 随机种子（相同参数生成相同文档）
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    section_names = VideoScriptCounter.rules.section_names
+    per_section = max(1, paragraphs // len(section_names))
+    image_every = max(1, paragraphs // images) if images else 0
+
+    written = 0
+    for number, name in zip("一二三四五六七八九十", section_names):
+        doc.add_paragraph(f"第{number}部分：{name}")
+        for i in range(per_section):
+            if i and i % 50 == 0:
+                doc.add_paragraph(f"知识点{i // 50}：小标题")
+            sentences = [_sentence(rng, bracket_density, nesting_depth, english_ratio)
+                         for _ in range(rng.randint(1, 4))]
+            doc.add_paragraph(''.join(sentences))
+            written += 1
+            if image_every and written % image_every == 0 and images:
+                doc.add_picture(io.BytesIO(_png(200, 200, rng)), width=Inches(2))
+                images -= 1
+
+    doc.save(str(path))
+
+
+def _best(func, repeat):
+    """运行 repeat 次，返回 (最短用时, 最后一次的结果)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_document(path, repeat=5):
+    """
+    分阶段计时处理一个文档
+
+    Args:
+        path: .docx 路径（带标注的输出写在同一目录）
+        repeat: 每个阶段重复的次数（取最短用时）
+
+    Returns:
+        字典：paragraphs、chars、size、stages（各阶段秒数）、total、end_to_end
+    """
+    counter = VideoScriptCounter(path, verbose=False)
+    stages = {}
+
+    def load():
+        doc = Document(str(path))
+        return doc, [p.text for p in document_paragraphs(doc)]
+
+    stages['load'], (doc, texts) = _best(load, repeat)
+    stages['segment'], sections = _best(lambda: counter.segment_sections(texts), repeat)
+    found = [section for section in sections if section['para_index'] is not None]
+    stages['remove_brackets'], spoken = _best(
+        lambda: [counter.remove_brackets(section['text']) for section in found], repeat)
+    stages['count_characters'], counts = _best(
+        lambda: [counter.count_breakdown(text) for text in spoken], repeat)
+
+    counts = iter(counts)
+    breakdowns = [next(counts) if section['para_index'] is not None else None
+                  for section in sections]
+    sections_info = counter.build_sections_info(sections, breakdowns)
+    stages['annotate'], _ = _best(lambda: counter.annotate(doc, sections_info), repeat)
+    stages['save'], _ = _best(lambda: counter.save_document(doc), repeat)
+
+    end_to_end, _ = _best(counter.process_document, repeat)
+    return {
+        'paragraphs': len(texts),
+        'chars': sum(info.char_count for info in sections_info),
+        'size': os.path.getsize(path),
+        'stages': stages,
+        'total': sum(stages.values()),
+        'end_to_end': end_to_end,
+    }
+
+
+def run(case_names, repeat=5):
+    """
+    生成并测试各个用例
+
+    Returns:
+        可序列化为 JSON 的结果字典
+    """
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'cases': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in case_names:
+            params = CASES[name]
+            path = Path(tmp) / f'{name}.docx'
+            generate_script(path, **params)
+            result = bench_document(path, repeat)
+            result['params'] = params
+            results['cases'][name] = result
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, floor=0.002):
+    """
+    与基准比较，找出变慢的阶段
+
+    用时增加超过 tolerance（比例）且超过 floor 秒时记为退化，
+    避免毫秒以下的计时抖动被误报。
+
+    Returns:
+        [(用例, 阶段, 基准用时, 当前用时), ...]
+    """
+    regressions = []
+    for name, result in results['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if base is None:
+            continue
+        timings = dict(result['stages'], end_to_end=result['end_to_end'])
+        base_timings = dict(base['stages'], end_to_end=base['end_to_end'])
+        for stage, seconds in timings.items():
+            before = base_timings.get(stage)
+            if before is None:
+                continue
+            if seconds > before * (1 + tolerance) and seconds - before > floor:
+                regressions.append((name, stage, before, seconds))
+    return regressions
+
+
+def print_results(results):
+    """打印各用例的分阶段用时"""
+    header = f"{'用例':<10}{'段落':>7}{'字数':>9}" + ''.join(f"{stage:>18}" for stage in STAGES)
+    print(header + f"{'end_to_end':>12}")
+    for name, result in results['cases'].items():
+        row = f"{name:<10}{result['paragraphs']:>8}{result['chars']:>10}"
+        row += ''.join(f"{result['stages'][stage] * 1000:>16.2f}ms" for stage in STAGES)
+        status = "✓" if result['end_to_end'] < TARGET_SECONDS else "✗"
+        row += f"{result['end_to_end'] * 1000:>10.1f}ms {status}"
+        print(row)
+    print(f"\n✓/✗: 端到端处理是否满足 PRD 5.3（< {TARGET_SECONDS:g} 秒）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="视频脚本字数统计性能基准测试")
+    parser.add_argument('--cases', default=','.join(CASES),
+                        help=f"要运行的用例，逗号分隔（默认全部：{','.join(CASES)}）")
+    parser.add_argument('--repeat', type=int, default=5, help="每个阶段的重复次数（默认 5）")
+    parser.add_argument('--output', help="把结果写入 JSON 文件")
+    parser.add_argument('--baseline', help="与基准 JSON 比较，有退化时返回非零状态")
+    parser.add_argument('--save-baseline', help="把结果保存为基准 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="允许的用时增幅（默认 0.25，即 25%%）")
+
+    generate = parser.add_argument_group("只生成测试文档")
+    generate.add_argument('--generate', metavar='PATH', help="生成测试文档后退出")
+    generate.add_argument('--paragraphs', type=int, default=200)
+    generate.add_argument('--bracket-density', type=float, default=0.3)
+    generate.add_argument('--nesting-depth', type=int, default=2)
+    generate.add_argument('--english-ratio', type=float, default=0.2)
+    generate.add_argument('--images', type=int, default=0)
+    generate.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_script(args.generate, args.paragraphs, args.bracket_density,
+                        args.nesting_depth, args.english_ratio, args.images, args.seed)
+        print(f"已生成: {args.generate}")
+        return
+
+    case_names = [name.strip() for name in args.cases.split(',') if name.strip()]
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        parser.error(f"未知的用例: {', '.join(unknown)}")
+
+    results = run(case_names, args.repeat)
+    print_results(results)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            print(f"结果已写入: {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n与基准比较（{args.baseline}，允许增幅 {args.tolerance:.0%}）:")
+        if not regressions:
+            print("  ✓ 没有发现性能退化")
+        for name, stage, before, seconds in regressions:
+            print(f"  ✗ {name}/{stage}: {before * 1000:.2f}ms -> {seconds * 1000:.2f}ms"
+                  f"（+{seconds / before - 1:.0%}）")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+大规模语料的批量字数统计
+
+逐段调用 count_breakdown 时，每段都要运行一次分词正则，统计整个归档的上百万段落时成为瓶颈。
+这里把许多段文本拼成一个码位数组，用区间掩码一次分类汉字、中文标点、全角数字、数字等字符，
+用字母与非字母的边界找出英文单词的起点，结果与 count_breakdown 逐段统计完全一致。
+
+需要 numpy（可选依赖）；未安装时退回逐段统计，结果相同。
+
+用法：
+    from bulk_count import count_breakdowns, count_characters
+    counts = count_breakdowns(texts)   # 每段一行：汉字、中文标点、英文单词、数字、其他
+    totals = count_characters(texts)   # 每段的总字数
+"""
+
+from video_script_counter import VideoScriptCounter
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# 字符类别（与 _COUNT_TOKEN_RE 的分组对应；空白不计数）
+_SPACE, _CJK, _PUNCT, _FULLWIDTH_DIGIT, _LETTER, _DIGIT, _OTHER = range(7)
+_CLASSES = 8
+
+# 结果的列数：CharBreakdown 中的五类字符（不含停顿时长）
+_COLUMNS = 5
+
+# 每块最多拼接的字符数，限制临时数组占用的内存
+CHUNK_CHARS = 1 << 20
+
+# 拼接时放在每段文本之后的分隔符：空白字符，保证单词不会跨段
+_SEPARATOR = '\n'
+
+_APOSTROPHE = ord("'")
+
+
+def _classify_code_point(code):
+    """分类一个码位（用于 ASCII 查找表和区间之外的字符）"""
+    char = chr(code)
+    if char.isspace():
+        return _SPACE
+    if 'a' <= char <= 'z' or 'A' <= char <= 'Z':
+        return _LETTER
+    if char.isdecimal():
+        return _DIGIT
+    return _OTHER
+
+
+if HAVE_NUMPY:
+    _ASCII_CLASSES = np.array([_classify_code_point(code) for code in range(128)], dtype=np.uint8)
+
+# 区间之外的非 ASCII 字符的类别缓存（Unicode 空白和数字需要逐个查表）
+_extra_classes = {}
+
+
+def _classify(codes):
+    """
+    把码位数组分类为字符类别数组
+
+    优先级与 _COUNT_TOKEN_RE 的分组顺序一致：汉字、CJK 符号和全角字符、全角数字、
+    英文字母、数字，其余非空白字符为其他。
+    """
+    classes = np.full(codes.shape, _OTHER, dtype=np.uint8)
+    ascii_mask = codes < 128
+    classes[ascii_mask] = _ASCII_CLASSES[codes[ascii_mask]]
+    classes[(codes >= 0x4e00) & (codes <= 0x9fff)] = _CJK
+    classes[(codes >= 0x3000) & (codes <= 0x303f)] = _PUNCT
+    classes[(codes >= 0xff00) & (codes <= 0xffef)] = _PUNCT
+    classes[(codes >= 0xff10) & (codes <= 0xff19)] = _FULLWIDTH_DIGIT
+
+    # 其余非 ASCII 字符：Unicode 空白（如 \xa0）和其他文字的数字，按不同码位逐个分类
+    rest = ~ascii_mask & (classes == _OTHER)
+    if rest.any():
+        unique, inverse = np.unique(codes[rest], return_inverse=True)
+        lookup = np.array([
+            _extra_classes.get(code) if code in _extra_classes
+            else _extra_classes.setdefault(code, _classify_code_point(code))
+            for code in unique.tolist()
+        ], dtype=np.uint8)
+        classes[rest] = lookup[inverse]
+    return classes
+
+
+def _word_starts(codes, letters):
+    """
+    找出英文单词（[a-zA-Z]+(?:'[a-zA-Z]+)?）的起点
+
+    字母段的起点是非字母到字母的边界。前面紧跟"字母 + 撇号"的字母段会并入前一个单词，
+    但前一段已经是并入的后半部分时除外：a'b'c 是 a'b 和 c 两个单词。
+
+    Returns:
+        (单词起点, 被并入前一个单词的字母段起点)：两个下标数组
+    """
+    boundary = letters.copy()
+    boundary[1:] &= ~letters[:-1]
+    starts = np.flatnonzero(boundary)
+
+    joinable = np.zeros(starts.shape, dtype=bool)
+    inner = starts >= 2
+    candidates = starts[inner]
+    joinable[inner] = (codes[candidates - 1] == _APOSTROPHE) & letters[candidates - 2]
+
+    # 相连的字母段组成链，链中第奇数个（从 0 数）并入前一段
+    index = np.arange(len(starts))
+    chain_start = np.maximum.accumulate(np.where(joinable, 0, index))
+    merged = joinable & ((index - chain_start) % 2 == 1)
+    return starts[~merged], starts[merged]
+
+
+def _count_chunk(texts):
+    """统计一块文本，返回 (段数, 5) 的数组"""
+    joined = _SEPARATOR.join(texts) + _SEPARATOR
+    codes = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + len(_SEPARATOR)
+    text_ids = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    classes = _classify(codes)
+    per_class = np.bincount(text_ids * _CLASSES + classes,
+                            minlength=len(texts) * _CLASSES).reshape(len(texts), _CLASSES)
+
+    words, merged = _word_starts(codes, classes == _LETTER)
+    word_counts = np.bincount(text_ids[words], minlength=len(texts))
+    # 并入单词的撇号不再算作其他字符
+    apostrophes = np.bincount(text_ids[merged], minlength=len(texts))
+
+    fullwidth_digits = per_class[:, _FULLWIDTH_DIGIT]
+    return np.column_stack((
+        per_class[:, _CJK],
+        per_class[:, _PUNCT] + fullwidth_digits,
+        word_counts,
+        per_class[:, _DIGIT] + fullwidth_digits,
+        per_class[:, _OTHER] - apostrophes,
+    ))
+
+
+def count_breakdowns(texts, chunk_chars=CHUNK_CHARS):
+    """
+    批量统计各类字符
+
+    Args:
+        texts: 文本的可迭代对象（可以是生成器，按块处理）
+        chunk_chars: 每块拼接的字符数上限
+
+    Returns:
+        有 numpy 时为 (段数, 5) 的 int64 数组，各列依次为 CharBreakdown 的
+        cjk、punct、words、digits、other；没有 numpy 时为 CharBreakdown 列表
+    """
+    if not HAVE_NUMPY:
+        counter = VideoScriptCounter.__new__(VideoScriptCounter)
+        return [counter.count_breakdown(text) for text in texts]
+
+    blocks = []
+    chunk = []
+    size = 0
+    for text in texts:
+        chunk.append(text)
+        size += len(text) + 1
+        if size >= chunk_chars:
+            blocks.append(_count_chunk(chunk))
+            chunk = []
+            size = 0
+    if chunk or not blocks:
+        blocks.append(_count_chunk(chunk) if chunk
+                      else np.zeros((0, _COLUMNS), dtype=np.int64))
+    return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+
+def count_characters(texts, chunk_chars=CHUNK_CHARS):
+    """
+    批量统计总字数（与 VideoScriptCounter.count_characters 逐段统计的结果相同）
+
+    Returns:
+        有 numpy 时为 int64 数组，没有 numpy 时为整数列表
+    """
+    counts = count_breakdowns(texts, chunk_chars)
+    if not HAVE_NUMPY:
+        return [breakdown.total for breakdown in counts]
+    # 总字数 = 汉字 + 中文标点 + 英文单词 + 数字
+    return counts[:, :4].sum(axis=1)
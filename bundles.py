@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+脚本压缩包的输入和输出
+
+供应商常把一批脚本打包成 .zip 或 .tar(.gz) 发来。这里不先解压到磁盘：
+逐个把包内的 .docx 读入内存直接统计，带标注的文档（或统计报表）写入一个新的压缩包，
+省去在网络存储上解压、再逐个读取的两次 I/O。
+
+- 输出包与输入包格式相同，放在输入包旁：供应商.zip → 供应商_带标注.zip（或 供应商_统计.zip）
+- 包内目录结构不变，文档名加 _带标注 后缀；处理失败的文档不写入输出包
+- 带标注的文档和 Word 临时文件（~$ 开头）、macOS 附带的 __MACOSX/._ 文件会被跳过
+- .zip 按目录逐个读取成员；.tar 系列按顺序流式读取，不需要随机访问
+
+用法：
+    python video_script_counter.py 供应商.zip
+    python video_script_counter.py 供应商.tar.gz --report csv -j 4
+"""
+
+import io
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from functools import partial
+from pathlib import Path, PurePosixPath
+
+from video_script_counter import (VideoScriptCounter, _error_result, is_script_file, iter_pool,
+                                  print_batch, process_bytes, write_report)
+
+# 支持的压缩包后缀及对应的 tar 压缩方式（.zip 为 None）
+BUNDLE_SUFFIXES = {
+    '.zip': None,
+    '.tar': '',
+    '.tar.gz': 'gz',
+    '.tgz': 'gz',
+    '.tar.bz2': 'bz2',
+    '.tar.xz': 'xz',
+}
+
+# 输出包的文件名后缀（加在输入包的名称之后、扩展名之前）
+ANNOTATED_TAG = VideoScriptCounter.OUTPUT_SUFFIX[:-len('.docx')]
+REPORT_TAG = '_统计'
+
+# 输出包中报表的文件名（不含扩展名）
+REPORT_NAME = '统计报表'
+
+# zip 文件名使用 UTF-8 编码的标志位
+_UTF8_FLAG = 0x800
+
+
+def bundle_suffix(path):
+    """
+    压缩包的后缀（如 '.tar.gz'）
+
+    Returns:
+        小写的后缀；不是支持的压缩包时为 None
+    """
+    name = Path(path).name.lower()
+    matches = [suffix for suffix in BUNDLE_SUFFIXES if name.endswith(suffix)]
+    return max(matches, key=len) if matches else None
+
+
+def is_bundle(path):
+    """判断是否为支持的压缩包（按文件名后缀）"""
+    return bundle_suffix(path) is not None
+
+
+def output_path(path, tag=ANNOTATED_TAG):
+    """
+    输出包的路径：输入包旁的"<包名><tag><后缀>"
+
+    Args:
+        path: 输入包路径
+        tag: 加在包名之后的后缀（ANNOTATED_TAG 或 REPORT_TAG）
+    """
+    path = Path(path)
+    split = len(path.name) - len(bundle_suffix(path))
+    return path.with_name(path.name[:split] + tag + path.name[split:])
+
+
+def _zip_member_name(info):
+    """
+    zip 成员的文件名
+
+    没有 UTF-8 标志的文件名被 zipfile 按 cp437 解码；
+    中文系统打包的 zip 通常是 UTF-8（不设标志）或 GBK，依次尝试重新解码。
+    """
+    if info.flag_bits & _UTF8_FLAG:
+        return info.filename
+    raw = info.filename.encode('cp437')
+    for encoding in ('utf-8', 'gbk'):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            pass
+    return info.filename
+
+
+def _is_script_member(name):
+    """判断包内文件是否为待处理的脚本（见 is_script_file）"""
+    path = PurePosixPath(name)
+    return (is_script_file(path) and not path.name.startswith('._')
+            and '__MACOSX' not in path.parts)
+
+
+def iter_members(path):
+    """
+    按包内顺序逐个读取压缩包中的脚本（每次只有一个成员的内容在内存中）
+
+    Args:
+        path: 压缩包路径
+
+    Yields:
+        (包内路径, 文件内容)
+
+    Raises:
+        zipfile.BadZipFile, tarfile.TarError: 压缩包损坏或格式不符
+    """
+    if BUNDLE_SUFFIXES[bundle_suffix(path)] is None:
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = _zip_member_name(info)
+                if not info.is_dir() and _is_script_member(name):
+                    yield name, archive.read(info)
+    else:
+        # 流式读取：按顺序读一遍，不回头查找
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and _is_script_member(member.name):
+                    yield member.name, archive.extractfile(member).read()
+
+
+class BundleWriter:
+    """
+    写出新的压缩包（格式由文件名后缀决定）
+
+    先写入临时文件，关闭时才替换为正式文件名；出错时删除临时文件，不留下不完整的压缩包。
+
+    用法：
+        with BundleWriter('供应商_带标注.zip') as bundle:
+            bundle.add('第1课_带标注.docx', data)
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 输出包路径（.zip、.tar、.tar.gz 等）
+        """
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + '.tmp')
+        compression = BUNDLE_SUFFIXES[bundle_suffix(self.path)]
+        if compression is None:
+            self.archive = zipfile.ZipFile(self.temp_path, 'w')
+            self.is_zip = True
+        else:
+            self.archive = tarfile.open(self.temp_path, 'w:' + compression)
+            self.is_zip = False
+
+    def add(self, name, data, compress=False):
+        """
+        添加一个文件
+
+        Args:
+            name: 包内路径
+            data: 文件内容（bytes）
+            compress: zip 中是否压缩（.docx 本身已经压缩，直接存储）
+        """
+        if self.is_zip:
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            self.archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        """写完压缩包并替换为正式文件名"""
+        self.archive.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """放弃写出，删除临时文件"""
+        self.archive.close()
+        self.temp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def annotated_name(name):
+    """包内带标注文档的路径：同一目录下的"<文件名>_带标注.docx\""""
+    path = PurePosixPath(name)
+    return str(path.with_name(path.stem + VideoScriptCounter.OUTPUT_SUFFIX))
+
+
+def _process_member(member, write, cache_dir, engine):
+    """处理一个成员（工作进程入口，member 为 iter_members 返回的 (包内路径, 文件内容)）"""
+    return process_bytes(member[1], write, cache_dir, engine)
+
+
+def _member_result(bundle, name, outcome, error, write):
+    """
+    把一个成员的处理结果整理为与 process_files 相同的结果字典
+
+    Args:
+        outcome: process_bytes 的返回值（出错时为 None）
+        error: 出错时的异常
+
+    Returns:
+        (结果字典, 带标注的文档内容；只统计或失败时为 None)
+    """
+    file = f"{bundle}/{name}"
+    if error is not None:
+        return _error_result(file, error), None
+    stats, annotated = outcome
+    stats.file = file
+    result = {'file': file, 'output': annotated_name(name) if write else None,
+              'stats': stats, 'error': None}
+    return result, annotated
+
+
+def iter_bundle(path, jobs=None, write=True, cache_dir=None, engine=None):
+    """
+    处理压缩包中的所有脚本，按包内顺序逐个返回结果
+
+    成员内容直接传给工作进程（见 process_bytes），同时在途的成员数量有上限（见 iter_pool），
+    内存占用与压缩包大小无关。单个文档出错或工作进程异常退出都不会中断其他文档的处理。
+
+    Args:
+        path: 压缩包路径
+        jobs: 工作进程数（默认为 CPU 核数；为 1 时在当前进程中处理）
+        write: 是否生成带标注的文档（为 False 时只统计）
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        engine: 提供统计配置的 CountingEngine 对象（可选；随任务传给工作进程）
+
+    Yields:
+        (结果字典, 带标注的文档内容)，结果字典的 file 为"<压缩包>/<包内路径>"，
+        output 为带标注文档的包内路径
+
+    Raises:
+        zipfile.BadZipFile, tarfile.TarError: 压缩包损坏或格式不符（见 iter_members）
+    """
+    members = iter_members(path)
+    if jobs == 1:
+        for member in members:
+            try:
+                outcome, error = _process_member(member, write, cache_dir, engine), None
+            except Exception as e:
+                outcome, error = None, e
+            yield _member_result(path, member[0], outcome, error, write)
+        return
+
+    function = partial(_process_member, write=write, cache_dir=cache_dir, engine=engine)
+    for (name, _), outcome, error in iter_pool(function, members, jobs, ordered=True):
+        yield _member_result(path, name, outcome, error, write)
+
+
+def run_bundle(path, jobs=None, report_format=None, layout='section', cache_dir=None,
+               totals=None, engine=None):
+    """
+    处理一个压缩包并打印汇总：带标注的文档或统计报表写入输入包旁的新压缩包
+
+    Args:
+        path: 压缩包路径
+        jobs: 工作进程数（默认为 CPU 核数）
+        report_format: 'json'、'csv' 或 'xlsx' 时只统计，报表写入"<包名>_统计"压缩包
+        layout: 表格报表的布局（见 run_report）
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        totals: 表格报表是否追加合计行（见 run_report）
+        engine: 提供统计配置的 CountingEngine 对象（可选）
+
+    Returns:
+        失败的文档数
+
+    Raises:
+        OSError, zipfile.BadZipFile, tarfile.TarError: 压缩包无法读取或写出
+    """
+    output = output_path(path, REPORT_TAG if report_format else ANNOTATED_TAG)
+    print(f"处理压缩包 {path} ...")
+    with BundleWriter(output) as bundle:
+        if report_format:
+            buffer = io.BytesIO()
+            stream = buffer if report_format == 'xlsx' else io.TextIOWrapper(
+                buffer, encoding='utf-8', newline='')
+            results = (result for result, _ in iter_bundle(path, jobs, False, cache_dir, engine))
+            failures = write_report(results, report_format, stream, layout, totals, engine)
+            stream.flush()
+            bundle.add(f'{REPORT_NAME}.{report_format}', buffer.getvalue(), compress=True)
+        else:
+            def results():
+                for result, annotated in iter_bundle(path, jobs, True, cache_dir, engine):
+                    if annotated is not None:
+                        bundle.add(result['output'], annotated)
+                    yield result
+            failures = print_batch(results())
+    print(f"输出文件: {output}")
+    return failures
+
+
+def run_bundles(paths, jobs=None, report_format=None, layout='section', cache_dir=None,
+                totals=None, engine=None):
+    """
+    依次处理多个压缩包（见 run_bundle），无法读取的压缩包不影响其他压缩包
+
+    Returns:
+        失败的文档数与无法处理的压缩包数之和
+    """
+    failures = 0
+    for path in paths:
+        try:
+            failures += run_bundle(path, jobs, report_format, layout, cache_dir, totals, engine)
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            print(f"❌ 错误: 无法处理压缩包 {path}: {e}", file=sys.stderr)
+            failures += 1
+    return failures
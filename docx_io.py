@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+.docx 轻量读写工具
+
+直接操作 .docx 压缩包中的 XML，不构建 python-docx 对象模型：
+- iter_paragraphs: 流式读取全部段落文本（包括表格和文本框，可选页眉页脚），
+  内存占用与文档大小无关
+- read_main_part: 读取主文档部件的原始字节（用于计算内容哈希）
+- iter_block_paragraphs: 按相同的顺序遍历已解析的（lxml）部件中的段落
+- write_patched: 只替换被修改的部件，其余部件按原压缩数据逐字节复制
+"""
+
+import os
+import posixpath
+import struct
+import zipfile
+import zlib
+from xml.etree.ElementTree import iterparse
+
+# WordprocessingML 命名空间
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+OFFICE_DOCUMENT_REL = (
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+)
+HEADER_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'
+FOOTER_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer'
+
+_P = f'{{{W_NS}}}p'
+_R = f'{{{W_NS}}}r'
+_HYPERLINK = f'{{{W_NS}}}hyperlink'
+_T = f'{{{W_NS}}}t'
+_BR = f'{{{W_NS}}}br'
+_BR_TYPE = f'{{{W_NS}}}type'
+# 文本框同时以 DrawingML（mc:Choice）和 VML（mc:Fallback）保存两份，只读取前者
+_FALLBACK = f'{{{MC_NS}}}Fallback'
+
+# 段内元素对应的文本（与 python-docx 的 Run.text 一致）
+_RUN_CHARS = {
+    f'{{{W_NS}}}tab': '\t',
+    f'{{{W_NS}}}ptab': '\t',
+    f'{{{W_NS}}}cr': '\n',
+    f'{{{W_NS}}}noBreakHyphen': '-',
+}
+
+
+def main_part_name(archive):
+    """
+    查找主文档部件的名称（通常为 word/document.xml）
+
+    Args:
+        archive: 已打开的 zipfile.ZipFile
+
+    Returns:
+        主文档部件在压缩包中的路径
+    """
+    try:
+        with archive.open('_rels/.rels') as rels:
+            for _, elem in iterparse(rels):
+                if (elem.tag == f'{{{REL_NS}}}Relationship'
+                        and elem.get('Type') == OFFICE_DOCUMENT_REL):
+                    return posixpath.normpath(elem.get('Target').lstrip('/'))
+    except KeyError:
+        pass
+    return 'word/document.xml'
+
+
+def header_footer_parts(archive, main_part):
+    """
+    查找主文档引用的页眉和页脚部件
+
+    Args:
+        archive: 已打开的 zipfile.ZipFile
+        main_part: 主文档部件的名称（见 main_part_name）
+
+    Returns:
+        (页眉部件名称列表, 页脚部件名称列表)，按关系文件中的顺序，不重复
+    """
+    folder, name = posixpath.split(main_part)
+    headers, footers = [], []
+    try:
+        with archive.open(posixpath.join(folder, '_rels', name + '.rels')) as rels:
+            for _, elem in iterparse(rels):
+                if (elem.tag != f'{{{REL_NS}}}Relationship'
+                        or elem.get('TargetMode') == 'External'):
+                    continue
+                found = {HEADER_REL: headers, FOOTER_REL: footers}.get(elem.get('Type'))
+                if found is not None:
+                    target = elem.get('Target')
+                    part = posixpath.normpath(target.lstrip('/') if target.startswith('/')
+                                              else posixpath.join(folder, target))
+                    if part not in found:
+                        found.append(part)
+    except KeyError:
+        pass
+    return headers, footers
+
+
+def read_main_part(source, headers_footers=False):
+    """
+    读取主文档部件（word/document.xml）的原始字节
+
+    Args:
+        source: .docx 文件路径或二进制文件对象
+        headers_footers: 是否同时读取页眉和页脚部件（拼接在主文档之后）
+
+    Returns:
+        解压后的 XML 字节
+    """
+    with zipfile.ZipFile(source) as archive:
+        main_part = main_part_name(archive)
+        data = archive.read(main_part)
+        if headers_footers:
+            headers, footers = header_footer_parts(archive, main_part)
+            data = b''.join([data] + [archive.read(part) for part in headers + footers])
+        return data
+
+
+def _run_text(run):
+    """提取 w:r 元素的文本"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or '')
+        elif tag == _BR:
+            # 只有换行符计为"\n"，分页符和分栏符为空
+            if child.get(_BR_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            char = _RUN_CHARS.get(tag)
+            if char is not None:
+                parts.append(char)
+    return ''.join(parts)
+
+
+def paragraph_text(paragraph):
+    """
+    提取 w:p 元素的文本（与 python-docx 的 Paragraph.text 一致）
+
+    Args:
+        paragraph: w:p 元素
+
+    Returns:
+        段落文本
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == _R)
+    return ''.join(parts)
+
+
+def iter_block_paragraphs(root):
+    """
+    按文档顺序遍历已解析的部件中的全部段落（与 iter_paragraphs 的顺序一致）
+
+    包括表格单元格、嵌套表格和文本框中的段落；文本框中的段落排在
+    包含该文本框的段落之后。mc:Fallback 中的备用副本不重复计入。
+
+    Args:
+        root: lxml 元素（如 python-docx 的 doc.element.body 或页眉部件的根元素）
+
+    Returns:
+        w:p 元素列表
+    """
+    paragraphs = []
+    skipped = set()
+    # lxml 的 iter 可以同时匹配多个标签，按文档顺序（先序）返回
+    for elem in root.iter(_P, _FALLBACK):
+        if elem.tag == _FALLBACK:
+            skipped.update(elem.iter(_P))
+        elif elem not in skipped:
+            paragraphs.append(elem)
+    return paragraphs
+
+
+def _iter_part_paragraphs(part, block_depth):
+    """
+    流式遍历一个 XML 部件中的全部段落（见 iter_block_paragraphs）
+
+    用 iterparse 边解压边解析，每处理完一个块级元素（段落、表格）就把它从树中移除，
+    内存占用只与单个块级元素的大小有关。
+
+    Args:
+        part: 已打开的部件
+        block_depth: 块级元素所在的深度（正文为 w:document/w:body/* 即 3，页眉页脚为 2）
+
+    Yields:
+        段落文本
+    """
+    depth = 0
+    container = None
+    container_depth = block_depth - 1
+    fallback = 0
+    # 文本框中的段落先于包含它的段落结束：外层段落未结束时，
+    # 段落文本按开始的顺序暂存在 pending 中（opened 为各未结束段落在 pending 中的位置）
+    opened = []
+    pending = []
+    for event, elem in iterparse(part, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            depth += 1
+            if tag == _P:
+                if not fallback:
+                    opened.append(len(pending))
+                    pending.append(None)
+            elif tag == _FALLBACK:
+                fallback += 1
+            elif depth == container_depth:
+                container = elem
+            continue
+
+        if tag == _P:
+            if not fallback:
+                text = paragraph_text(elem)
+                if len(opened) == 1:
+                    # 最外层段落结束
+                    opened.pop()
+                    if len(pending) == 1:
+                        yield text
+                    else:
+                        pending[0] = text
+                        yield from pending
+                    pending.clear()
+                    elem.clear()
+                else:
+                    pending[opened.pop()] = text
+        elif tag == _FALLBACK:
+            fallback -= 1
+        if depth == block_depth:
+            container.remove(elem)
+        depth -= 1
+
+
+def iter_paragraphs(source, headers_footers=False):
+    """
+    流式读取 .docx 中的全部段落
+
+    按文档顺序读取正文中的段落，包括表格单元格、嵌套表格和文本框中的段落；
+    headers_footers 为 True 时，页眉中的段落排在正文之前，页脚中的段落排在正文之后。
+    每个部件只解析一遍，内存占用与文档大小无关。
+
+    Args:
+        source: .docx 文件路径或二进制文件对象
+        headers_footers: 是否包括页眉和页脚
+
+    Yields:
+        (para_index, text): 段落的序号（与 video_script_counter.document_paragraphs
+        的下标一致）和段落文本
+    """
+    with zipfile.ZipFile(source) as archive:
+        main_part = main_part_name(archive)
+        headers, footers = (header_footer_parts(archive, main_part) if headers_footers
+                            else ([], []))
+        parts = ([(name, 2) for name in headers] + [(main_part, 3)]
+                 + [(name, 2) for name in footers])
+        para_index = 0
+        for name, block_depth in parts:
+            with archive.open(name) as part:
+                for text in _iter_part_paragraphs(part, block_depth):
+                    yield para_index, text
+                    para_index += 1
+
+
+# ZIP 结构（见 PKWARE APPNOTE 4.3）
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_LOCAL_SIGNATURE = b'PK\x03\x04'
+_CENTRAL_SIGNATURE = b'PK\x01\x02'
+_END_SIGNATURE = b'PK\x05\x06'
+_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_ZIP64_LIMIT = 0xFFFFFFFF
+_COPY_BLOCK = 1 << 20
+
+
+def _dos_datetime(date_time):
+    """把 ZipInfo.date_time 转换为 DOS 格式的 (time, date)"""
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day)
+
+
+def _copy_range(src, dst, length):
+    """从 src 当前位置复制 length 个字节到 dst"""
+    while length:
+        block = src.read(min(length, _COPY_BLOCK))
+        if not block:
+            raise ValueError("压缩包数据不完整")
+        dst.write(block)
+        length -= len(block)
+
+
+def _local_record_length(fp, info):
+    """计算成员在压缩包中的本地记录长度（文件头 + 压缩数据 + 数据描述符）"""
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_SIGNATURE:
+        raise ValueError(f"本地文件头损坏: {info.filename}")
+    name_length, extra_length = header[9], header[10]
+    length = _LOCAL_HEADER.size + name_length + extra_length + info.compress_size
+
+    if info.flag_bits & _FLAG_DATA_DESCRIPTOR:
+        fp.seek(info.header_offset + length)
+        # 数据描述符：可选签名 + CRC + 压缩前后大小
+        length += 16 if fp.read(4) == _DESCRIPTOR_SIGNATURE else 12
+    return length
+
+
+def write_patched(source, dest, replacements, compresslevel=6):
+    """
+    复制 .docx 压缩包并替换部分成员
+
+    未修改的成员（图片、样式等）连同本地文件头按原始压缩数据逐字节复制，
+    不解压也不重新压缩；只有 replacements 中的成员重新压缩。
+    中央目录除偏移量外与原文件一致。
+
+    Args:
+        source: 原 .docx 文件路径或可随机读取的二进制文件对象
+        dest: 输出文件路径或二进制文件对象
+        replacements: {成员名: 新内容(bytes)}，如 {'word/document.xml': xml}
+        compresslevel: 替换成员的压缩级别
+
+    Returns:
+        写入的字节数
+
+    Raises:
+        ValueError: 压缩包使用了不支持的格式（ZIP64、分卷或加密）
+    """
+    with zipfile.ZipFile(source) as archive:
+        infos = archive.infolist()
+        for info in infos:
+            if (info.header_offset >= _ZIP64_LIMIT or info.compress_size >= _ZIP64_LIMIT
+                    or info.file_size >= _ZIP64_LIMIT or info.volume or info.flag_bits & 0x01):
+                raise ValueError(f"不支持的压缩包成员: {info.filename}")
+
+        missing = set(replacements) - set(archive.namelist())
+        if missing:
+            raise KeyError(f"压缩包中没有这些成员: {sorted(missing)}")
+
+        out = open(dest, 'wb') if isinstance(dest, (str, bytes, os.PathLike)) else dest
+        try:
+            fp = archive.fp
+            start = out.tell()
+            central = []
+
+            for info in infos:
+                offset = out.tell() - start
+                name = info.filename.encode('utf-8' if info.flag_bits & _FLAG_UTF8 else 'cp437')
+                dos_time, dos_date = _dos_datetime(info.date_time)
+
+                if info.filename in replacements:
+                    content = replacements[info.filename]
+                    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+                    data = compressor.compress(content) + compressor.flush()
+                    flag_bits = info.flag_bits & _FLAG_UTF8
+                    fields = (zipfile.ZIP_DEFLATED, dos_time, dos_date,
+                              zlib.crc32(content), len(data), len(content))
+                    out.write(_LOCAL_HEADER.pack(
+                        _LOCAL_SIGNATURE, 20, flag_bits, *fields, len(name), 0))
+                    out.write(name)
+                    out.write(data)
+                    versions = (info.create_system << 8 | info.create_version,
+                                max(info.extract_version, 20))
+                else:
+                    length = _local_record_length(fp, info)
+                    fp.seek(info.header_offset)
+                    _copy_range(fp, out, length)
+                    flag_bits = info.flag_bits
+                    fields = (info.compress_type, dos_time, dos_date,
+                              info.CRC, info.compress_size, info.file_size)
+                    versions = (info.create_system << 8 | info.create_version,
+                                info.reserved << 8 | info.extract_version)
+
+                central.append(_CENTRAL_HEADER.pack(
+                    _CENTRAL_SIGNATURE, *versions, flag_bits, *fields,
+                    len(name), len(info.extra), len(info.comment), 0,
+                    info.internal_attr, info.external_attr, offset,
+                ) + name + info.extra + info.comment)
+
+            central_offset = out.tell() - start
+            for record in central:
+                out.write(record)
+            central_size = out.tell() - start - central_offset
+
+            comment = archive.comment
+            out.write(_END_RECORD.pack(
+                _END_SIGNATURE, 0, 0, len(central), len(central),
+                central_size, central_offset, len(comment),
+            ) + comment)
+            return out.tell() - start
+        finally:
+            if out is not dest:
+                out.close()
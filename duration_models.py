@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+口播时长模型
+
+统计字数时每段文本只扫描一次，得到各类字符的数量和停顿标记的时长（CharBreakdown）；
+时长模型只根据这些统计换算秒数，不再读取文本。模型对各项统计都是线性的，
+所以可以先把各段的统计相加，再对合计换算一次，结果与逐段换算后相加一致。
+
+- SpeechRateModel: 按总字数匀速换算（默认算法，与 CountingEngine.SPEECH_RATE 相同）
+- ClassCostModel: 汉字、标点、英文单词、数字各自的用时，再加上"（停顿3秒）"等括号内标记的时长，
+  适合中英混合的脚本
+
+用法：
+    engine = CountingEngine(duration_model=ClassCostModel(costs={'words': 0.5}))
+    python video_script_counter.py 脚本.docx --duration-model class_cost
+    python video_script_counter.py 脚本.docx --duration-model 我的模型.json
+
+模型文件为 JSON，格式见 model_from_dict。
+"""
+
+import json
+import re
+
+# 各类字符每个（英文为每个单词）的默认用时（秒），字段与 CharBreakdown 一致
+DEFAULT_COSTS = {
+    'cjk': 60 / 220,   # 汉字：儿童教学语速 220 字/分钟
+    'punct': 0.3,      # 中文标点：句读处的短停顿
+    'words': 0.45,     # 英文单词：约 130 词/分钟，一个单词通常有多个音节
+    'digits': 0.3,     # 数字：逐位读出，"125" 读作"一百二十五"
+    'other': 0.1,      # 英文标点和其他符号
+}
+
+# 停顿标记只认括号里的舞台提示：标记是括号中的一项，前面是左括号或顿号、逗号等分隔符，
+# 后面是右括号或分隔符，如"（停顿3秒）"、"（展示图片，停顿2秒）"、"(pause 1.5s)"。
+# 正文里的"不要停顿"、"Please pause and think" 都是要读出来的话，不计停顿。
+# （同一括号中的多个标记：后一个紧接在前一个匹配之后的分隔符，且后面还有右括号）
+_STAGE_OPEN = (r'(?:[（(【\[](?:[^（()）【】\[\]\n]*?[，,、；;])??'
+               r'|(?<=[，,、；;])(?=[^（(【\[\n]*[）)】\]]))[ \t　]*')
+_STAGE_CLOSE = r'[ \t　]*(?=[，,、；;）)】\]])'
+
+# 分组为秒数，省略秒数（如"（停顿）"）时按 default_pause 计。
+# 标记在移除括号之前识别（括号内的文字仍不计字数）；不能跨段（不匹配换行）
+DEFAULT_PAUSE_PATTERNS = [
+    _STAGE_OPEN + r'停顿[ \t　]*(?:(\d+(?:\.\d+)?)[ \t　]*(?:秒|s\b))?' + _STAGE_CLOSE,
+    _STAGE_OPEN + r'pause\b[ \t]*(?:(\d+(?:\.\d+)?)[ \t]*(?:s|secs?|seconds?)\b)?' + _STAGE_CLOSE,
+]
+
+
+class DurationModel:
+    """
+    时长模型基类
+
+    子类实现 seconds(breakdown)，把字符分类统计换算为秒数（不取整）。
+    pause_re 不为 None 时，统计字数时同时识别停顿标记，时长记在 breakdown.pause_ms 中。
+    """
+
+    # 模型类型名称（模型文件中的 type）
+    type_name = None
+
+    # 识别停顿标记的正则（None 表示不识别停顿标记）
+    pause_re = None
+
+    # 没有写明秒数的停顿标记的时长（秒）
+    default_pause = 0
+
+    def seconds(self, breakdown):
+        """
+        估算口播时长
+
+        Args:
+            breakdown: CharBreakdown（各类字符数和停顿时长）
+
+        Returns:
+            秒数（浮点数，由调用方取整）
+        """
+        raise NotImplementedError
+
+    def pause_ms(self, text):
+        """
+        识别文本（移除括号之前）中的停顿标记
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            停顿的总时长（整数毫秒，相加时没有舍入误差）
+        """
+        total = 0
+        for match in self.pause_re.finditer(text):
+            seconds = next((group for group in match.groups() if group), None)
+            total += round(float(seconds) * 1000) if seconds else round(self.default_pause * 1000)
+        return total
+
+    def describe(self):
+        """
+        模型的参数（用于结果缓存的配置指纹和模型文件）
+
+        Returns:
+            可序列化为 JSON 的字典
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.describe() == other.describe()
+
+    def __hash__(self):
+        return hash(json.dumps(self.describe(), sort_keys=True))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.describe()!r})"
+
+
+class SpeechRateModel(DurationModel):
+    """按总字数匀速换算：字数 / 语速 × 60"""
+
+    type_name = 'speech_rate'
+
+    def __init__(self, rate=220):
+        """
+        Args:
+            rate: 语速（字/分钟）
+        """
+        if not rate or rate <= 0:
+            raise ValueError(f"语速必须大于 0: {rate!r}")
+        self.rate = rate
+
+    def seconds(self, breakdown):
+        return (breakdown.total / self.rate) * 60
+
+    def describe(self):
+        return {'type': self.type_name, 'rate': self.rate}
+
+
+class ClassCostModel(DurationModel):
+    """
+    按字符类别计时：Σ 各类字符数 × 每个的用时 + 停顿标记的时长
+
+    中英混合的脚本中，一个英文单词的朗读时间约为一个汉字的一倍半到两倍，
+    按总字数匀速换算会明显低估；数字和句读停顿也各有不同的用时。
+    """
+
+    type_name = 'class_cost'
+
+    def __init__(self, costs=None, pause_patterns=None, default_pause=1.0):
+        """
+        Args:
+            costs: 各类字符的用时（秒），省略的类别使用 DEFAULT_COSTS
+            pause_patterns: 停顿标记的正则列表（默认 DEFAULT_PAUSE_PATTERNS；空列表表示不识别）
+            default_pause: 没有写明秒数的停顿标记的时长（秒）
+        """
+        self.costs = dict(DEFAULT_COSTS)
+        for name, cost in (costs or {}).items():
+            if name not in DEFAULT_COSTS:
+                raise ValueError(f"未知的字符类别 {name!r}（可用：{'、'.join(DEFAULT_COSTS)}）")
+            if not isinstance(cost, (int, float)) or cost < 0:
+                raise ValueError(f"字符类别 {name!r} 的用时必须是非负数: {cost!r}")
+            self.costs[name] = cost
+        if not isinstance(default_pause, (int, float)) or default_pause < 0:
+            raise ValueError(f"default_pause 必须是非负数: {default_pause!r}")
+        self.default_pause = default_pause
+
+        self.pause_patterns = list(DEFAULT_PAUSE_PATTERNS if pause_patterns is None
+                                   else pause_patterns)
+        for pattern in self.pause_patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"停顿标记 {pattern!r} 无法编译: {e}") from None
+        if self.pause_patterns:
+            self.pause_re = re.compile(
+                '|'.join(f'(?:{pattern})' for pattern in self.pause_patterns), re.IGNORECASE)
+        # 按类别顺序保存，seconds() 中直接与 CharBreakdown 的前五项相乘
+        self._cost_vector = tuple(self.costs[name] for name in DEFAULT_COSTS)
+
+    def seconds(self, breakdown):
+        seconds = sum(count * cost for count, cost in zip(breakdown, self._cost_vector))
+        return seconds + breakdown.pause_ms / 1000
+
+    def describe(self):
+        return {
+            'type': self.type_name,
+            'costs': self.costs,
+            'pause_patterns': self.pause_patterns,
+            'default_pause': self.default_pause,
+        }
+
+
+MODEL_TYPES = {model.type_name: model for model in (SpeechRateModel, ClassCostModel)}
+
+
+def model_from_dict(spec):
+    """
+    根据字典创建时长模型
+
+    格式（JSON）：
+        {"type": "speech_rate", "rate": 200}
+        {
+          "type": "class_cost",
+          "costs": {"cjk": 0.27, "punct": 0.3, "words": 0.45, "digits": 0.3, "other": 0.1},
+          "pause_patterns": ["[（(]停顿[ \\t]*(?:(\\d+)秒)?[）)]"],
+          "default_pause": 1
+        }
+
+    除 type 外的字段都可省略，省略时使用默认值。
+
+    Raises:
+        ValueError: 格式错误或参数不合法
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("时长模型必须是 JSON 对象")
+    model_type = MODEL_TYPES.get(spec.get('type'))
+    if model_type is None:
+        raise ValueError(f"未知的时长模型类型 {spec.get('type')!r}"
+                         f"（可用：{'、'.join(MODEL_TYPES)}）")
+    options = {key: value for key, value in spec.items() if key != 'type'}
+    try:
+        return model_type(**options)
+    except TypeError:
+        raise ValueError(f"时长模型 {model_type.type_name} 不支持参数: "
+                         f"{'、'.join(sorted(options))}") from None
+
+
+def load_model(source, speech_rate=None):
+    """
+    按名称（speech_rate、class_cost，使用默认参数）或 JSON 模型文件创建时长模型
+
+    Args:
+        source: 模型名称或模型文件路径
+        speech_rate: 按名称创建 speech_rate 模型时的语速（通常为引擎的 SPEECH_RATE；
+            省略时为 SpeechRateModel 的默认语速）
+
+    Raises:
+        OSError: 无法读取文件
+        ValueError: 文件不是合法的 JSON 或模型格式错误
+    """
+    if source == SpeechRateModel.type_name and speech_rate is not None:
+        return SpeechRateModel(speech_rate)
+    if source in MODEL_TYPES:
+        return MODEL_TYPES[source]()
+    with open(source, encoding='utf-8') as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"时长模型文件不是合法的 JSON: {e}") from None
+    return model_from_dict(spec)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+分阶段计时
+
+VideoScriptCounter 在各处理阶段（读取、切分、移除括号、统计、标注、保存）
+进入 Profiler.stage()，记录墙钟时间、CPU 时间以及处理的段落数和字符数。
+未启用时使用空操作的计时器，几乎没有额外开销。
+"""
+
+import time
+
+# 阶段名称及其说明（按处理顺序）
+STAGE_LABELS = {
+    'cache': '查询缓存',
+    'load': '读取文档',
+    'segment': '切分部分',
+    'remove_brackets': '移除括号',
+    'count_characters': '统计字数',
+    'annotate': '添加标注',
+    'save': '保存文档',
+}
+
+
+class StageStats:
+    """单个阶段的累计统计"""
+
+    __slots__ = ('name', 'wall', 'cpu', 'calls', 'paragraphs', 'chars')
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+        self.paragraphs = 0
+        self.chars = 0
+
+    def as_dict(self):
+        """转换为字典（时间单位为秒）"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class _StageTimer:
+    """计时上下文：退出时把用时累加到 StageStats"""
+
+    __slots__ = ('stats', '_wall', '_cpu')
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        stats = self.stats
+        stats.wall += time.perf_counter() - self._wall
+        stats.cpu += time.process_time() - self._cpu
+        stats.calls += 1
+
+    def count(self, paragraphs=0, chars=0):
+        """记录本阶段处理的段落数和字符数"""
+        self.stats.paragraphs += paragraphs
+        self.stats.chars += chars
+
+
+class _NullTimer:
+    """未启用计时时使用的空操作上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def count(self, paragraphs=0, chars=0):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """记录各处理阶段的用时，可在多个文档之间累计"""
+
+    def __init__(self):
+        self.stages = {}
+        self.documents = 0
+
+    def stage(self, name):
+        """
+        进入一个阶段
+
+        用法：
+            with profiler.stage('load') as stage:
+                ...
+                stage.count(paragraphs=len(texts))
+        """
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        return _StageTimer(stats)
+
+    def ordered(self):
+        """按处理顺序排列的各阶段统计"""
+        order = list(STAGE_LABELS)
+        return sorted(self.stages.values(),
+                      key=lambda stats: (order.index(stats.name) if stats.name in order
+                                         else len(order)))
+
+    def as_dict(self):
+        """转换为可序列化为 JSON 的字典"""
+        return {
+            'documents': self.documents,
+            'stages': [stats.as_dict() for stats in self.ordered()],
+        }
+
+    def format(self):
+        """格式化为表格文本"""
+        widths = (10, 12, 12, 8, 10, 12)
+        lines = [
+            f"分阶段耗时（{self.documents} 个文档）",
+            _row(('阶段', '墙钟(ms)', 'CPU(ms)', '次数', '段落数', '字符数'), widths),
+        ]
+        total_wall = total_cpu = 0.0
+        for stats in self.ordered():
+            total_wall += stats.wall
+            total_cpu += stats.cpu
+            lines.append(_row((STAGE_LABELS.get(stats.name, stats.name),
+                               f"{stats.wall * 1000:.2f}", f"{stats.cpu * 1000:.2f}",
+                               stats.calls, stats.paragraphs, stats.chars), widths))
+        lines.append(_row(('合计', f"{total_wall * 1000:.2f}", f"{total_cpu * 1000:.2f}"), widths))
+        return '\n'.join(lines)
+
+
+def _display_width(text):
+    """文本在终端中的显示宽度（全角字符占两列）"""
+    import unicodedata
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def _row(cells, widths):
+    """第一列左对齐、其余列右对齐，按显示宽度补齐空格"""
+    parts = []
+    for i, (cell, width) in enumerate(zip(cells, widths)):
+        cell = str(cell)
+        padding = ' ' * max(0, width - _display_width(cell))
+        parts.append(cell + padding if i == 0 else padding + cell)
+    return ''.join(parts)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+统计报表输出
+
+把各文档的统计结果（见 video_script_counter.process_files）逐个写出为 JSON、CSV 或 Excel，
+每处理完一个文档就写出一个，不在内存中累积全部结果：
+- JSON: 每个文档一个对象
+- CSV: 每个文档一行或每个部分一行，英文列名（供脚本和看板读取），需要时可追加合计行
+- Excel (.xlsx): 与 CSV 相同的行，中文列名，最后一行为合计
+
+Excel 文件由 XlsxSheetWriter 直接写出（工作表边生成边压缩，字符串内联在单元格中），
+内存占用与文档数量无关，不需要 openpyxl 等额外依赖。
+"""
+
+import csv
+import json
+import re
+import time
+import zipfile
+
+REPORT_FORMATS = ('json', 'csv', 'xlsx')
+# 表格报表的行：每个文档一行或每个部分一行
+REPORT_LAYOUTS = ('section', 'document')
+
+
+def document_record(result, format_time):
+    """
+    把单个文档的处理结果整理为报表记录
+
+    Args:
+        result: process_files 返回的结果字典（stats 为 DocumentStats，失败时为 None）
+        format_time: 把秒数格式化为 MM:SS 的函数
+
+    Returns:
+        字典：file、total_chars、total_duration、total_time、sections、error
+    """
+    sections = result['stats'].sections if result['stats'] is not None else ()
+    total_duration = sum(info.duration for info in sections)
+    return {
+        'file': result['file'],
+        'total_chars': sum(info.char_count for info in sections),
+        'total_duration': total_duration,
+        'total_time': format_time(total_duration),
+        'sections': [
+            {
+                'name': info.name,
+                'char_count': info.char_count,
+                'duration': info.duration,
+                'start_time': info.start_time,
+                'end_time': info.end_time,
+                'time_range': info.time_range,
+                'subsections': [
+                    {
+                        'title': sub.title,
+                        'char_count': sub.char_count,
+                        'duration': sub.duration,
+                        'start_time': sub.start_time,
+                        'end_time': sub.end_time,
+                        'time_range': sub.time_range,
+                    }
+                    for sub in info.subsections
+                ],
+            }
+            for info in sections
+        ],
+        'error': result['error'],
+    }
+
+
+class JsonReportWriter:
+    """把文档记录写为 JSON 数组（逐个写出）"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, record):
+        """写出一个文档记录"""
+        self.stream.write('[\n' if self.count == 0 else ',\n')
+        self.stream.write(json.dumps(record, ensure_ascii=False, indent=2))
+        self.count += 1
+
+    def close(self):
+        """结束 JSON 数组"""
+        self.stream.write('[]\n' if self.count == 0 else '\n]\n')
+        self.stream.flush()
+
+
+class TableReportWriter:
+    """
+    把文档记录写为表格（CSV 或 Excel），可在最后追加合计行
+
+    只保存合计数，内存占用与文档数量无关。
+    """
+
+    # 每个部分一行时的列名（CSV 的列名，与 --report csv 最初的格式相同）
+    FIELDS = ('file', 'section', 'char_count', 'duration', 'start_time', 'end_time',
+              'time_range', 'error')
+    # 每个文档一行时的列名；每个部分另有"<部分名>.char_count"等三列，位于 error 之前
+    DOCUMENT_FIELDS = ('file', 'total_chars', 'total_duration', 'total_time', 'speech_rate')
+    SECTION_FIELDS = ('char_count', 'duration', 'time_range')
+
+    # 中文列名（Excel 报表）
+    LABELS = {
+        'file': '文件', 'section': '部分', 'char_count': '字数', 'duration': '时长(秒)',
+        'start_time': '开始(秒)', 'end_time': '结束(秒)', 'time_range': '时间轴', 'error': '错误',
+        'total_chars': '总字数', 'total_duration': '总时长(秒)', 'total_time': '总时长',
+        'speech_rate': '平均语速(字/分钟)',
+    }
+
+    def __init__(self, sink, layout, section_names, speech_rate, format_time,
+                 chinese_headers=False, totals=False):
+        """
+        初始化
+
+        Args:
+            sink: 行写出对象，提供 writerow(values) 和 close()
+            layout: 'section'（每个部分一行）或 'document'（每个文档一行）
+            section_names: 部分名称列表（每个文档一行时，每个部分占若干列）
+            speech_rate: 语速（字/分钟）
+            format_time: 把秒数格式化为 MM:SS 的函数
+            chinese_headers: 是否使用中文列名（默认为英文列名）
+            totals: 是否在最后追加合计行
+        """
+        if layout not in REPORT_LAYOUTS:
+            raise ValueError(f"不支持的报表布局: {layout}")
+        self.sink = sink
+        self.layout = layout
+        self.section_names = list(section_names)
+        self.speech_rate = speech_rate
+        self.format_time = format_time
+        self.chinese_headers = chinese_headers
+        self.totals_row = totals
+
+        self.documents = 0
+        self.failures = 0
+        self.total_chars = 0
+        self.total_duration = 0
+        self.section_chars = [0] * len(self.section_names)
+        self.section_durations = [0] * len(self.section_names)
+
+        self.sink.writerow(self.header())
+
+    def header(self):
+        """表头"""
+        if self.layout == 'section':
+            return [self._label(field) for field in self.FIELDS]
+        row = [self._label(field) for field in self.DOCUMENT_FIELDS]
+        for name in self.section_names:
+            row += [self._label(field, name) for field in self.SECTION_FIELDS]
+        row.append(self._label('error'))
+        return row
+
+    def _label(self, field, section=None):
+        """列名（section 为部分名称时是该部分的列）"""
+        if self.chinese_headers:
+            return f'{section or ""}{self.LABELS[field]}'
+        return f'{section}.{field}' if section else field
+
+    def write(self, record):
+        """写出一个文档记录"""
+        self.documents += 1
+        if record['error'] is not None:
+            self.failures += 1
+        else:
+            self.total_chars += record['total_chars']
+            self.total_duration += record['total_duration']
+
+        if self.layout == 'section':
+            if record['error'] is not None:
+                self.sink.writerow([record['file'], '', '', '', '', '', '', record['error']])
+            for section in record['sections']:
+                self.sink.writerow([
+                    record['file'], section['name'], section['char_count'], section['duration'],
+                    section['start_time'], section['end_time'], section['time_range'], '',
+                ])
+            return
+
+        by_name = {section['name']: section for section in record['sections']}
+        if record['error'] is not None:
+            row = [record['file'], '', '', '', '']
+        else:
+            row = [record['file'], record['total_chars'], record['total_duration'],
+                   record['total_time'], self.speech_rate]
+        for i, name in enumerate(self.section_names):
+            section = by_name.get(name)
+            if section is None:
+                row += ['', '', '']
+                continue
+            self.section_chars[i] += section['char_count']
+            self.section_durations[i] += section['duration']
+            row += [section['char_count'], section['duration'], section['time_range']]
+        row.append(record['error'] or '')
+        self.sink.writerow(row)
+
+    def totals(self):
+        """合计行"""
+        failed = f"{self.failures} 个文件失败" if self.failures else ''
+        if self.layout == 'section':
+            return [f'合计（{self.documents} 个文件）', '', self.total_chars, self.total_duration,
+                    '', '', self.format_time(self.total_duration), failed]
+        row = [f'合计（{self.documents} 个文件）', self.total_chars, self.total_duration,
+               self.format_time(self.total_duration), self.speech_rate]
+        for chars, duration in zip(self.section_chars, self.section_durations):
+            row += [chars, duration, '']
+        row.append(failed)
+        return row
+
+    def close(self):
+        """写出合计行（如需要）并结束报表"""
+        if self.totals_row:
+            self.sink.writerow(self.totals())
+        self.sink.close()
+
+
+class _CsvSink:
+    """CSV 行写出对象"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.writer(stream)
+
+    def writerow(self, values):
+        self.writer.writerow(values)
+
+    def close(self):
+        self.stream.flush()
+
+
+# XML 1.0 不允许的控制字符
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _escape(text):
+    """转义 XML 文本（xml.sax.saxutils 会连带导入 urllib，启动较慢）"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _column_name(index):
+    """列序号（从 0 开始）转换为列名：0 -> A, 26 -> AA"""
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord('A') + remainder) + name
+    return name
+
+
+class XlsxSheetWriter:
+    """
+    只写的单工作表 .xlsx 写出对象
+
+    工作表 XML 逐行写入压缩流，字符串以内联字符串保存（不使用共享字符串表），
+    内存占用只与单行大小有关。
+    """
+
+    def __init__(self, file, sheet_name='统计'):
+        """
+        初始化
+
+        Args:
+            file: 输出文件路径或可写的二进制文件对象
+            sheet_name: 工作表名称
+        """
+        self.archive = zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED)
+        self.sheet_name = sheet_name
+        info = zipfile.ZipInfo('xl/worksheets/sheet1.xml', time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.sheet = self.archive.open(info, 'w', force_zip64=True)
+        self.sheet.write(_SHEET_HEAD.encode('utf-8'))
+        self.rows = 0
+        self._columns = []
+
+    def writerow(self, values):
+        """写出一行（数字写为数值单元格，其他值写为文本）"""
+        self.rows += 1
+        while len(self._columns) < len(values):
+            self._columns.append(_column_name(len(self._columns)))
+
+        cells = [f'<row r="{self.rows}">']
+        for column, value in zip(self._columns, values):
+            ref = f'{column}{self.rows}'
+            if value is None or value == '':
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            else:
+                text = _escape(_INVALID_XML_CHARS.sub('', str(value)))
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">'
+                             f'{text}</t></is></c>')
+        cells.append('</row>')
+        self.sheet.write(''.join(cells).encode('utf-8'))
+
+    def close(self):
+        """写完工作表和其余部件"""
+        self.sheet.write(_SHEET_TAIL.encode('utf-8'))
+        self.sheet.close()
+        self.archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        self.archive.writestr('_rels/.rels', _ROOT_RELS)
+        self.archive.writestr('xl/workbook.xml',
+                              _WORKBOOK.format(name=_escape(self.sheet_name).replace('"', '&quot;')))
+        self.archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        self.archive.close()
+
+
+def open_report(report_format, stream, layout='section', section_names=(), speech_rate=None,
+                format_time=str, totals=None):
+    """
+    创建报表写出器
+
+    Args:
+        report_format: 'json'、'csv' 或 'xlsx'
+        stream: 输出流（CSV 为以 newline='' 打开的文本流；xlsx 为二进制流或文件路径）
+        layout: 表格报表的布局：'section'（每个部分一行）或 'document'（每个文档一行）
+        section_names: 部分名称列表
+        speech_rate: 语速（字/分钟）
+        format_time: 把秒数格式化为 MM:SS 的函数
+        totals: 是否追加合计行（默认 Excel 追加、CSV 不追加）
+
+    Returns:
+        JsonReportWriter 或 TableReportWriter
+    """
+    if report_format == 'json':
+        return JsonReportWriter(stream)
+    if report_format == 'csv':
+        sink = _CsvSink(stream)
+    elif report_format == 'xlsx':
+        sink = XlsxSheetWriter(stream)
+    else:
+        raise ValueError(f"不支持的报表格式: {report_format}")
+    is_xlsx = report_format == 'xlsx'
+    return TableReportWriter(sink, layout, section_names, speech_rate, format_time,
+                             chinese_headers=is_xlsx, totals=is_xlsx if totals is None else totals)
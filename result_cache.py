@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+统计结果的磁盘缓存
+
+以主文档内容（word/document.xml）和统计配置的哈希作为键，
+缓存各部分的统计信息。文档或规则（括号类型、标题模式、语速等）
+任何一项变化都会得到新的键，旧条目不会再被命中，最终按 LRU 淘汰。
+
+缓存只是加速手段：缓存目录不可写、磁盘已满等 I/O 错误一律按"没有缓存"处理，不影响统计和输出。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+class ResultCache:
+    """按内容哈希缓存统计结果，按条目数和总大小做 LRU 淘汰"""
+
+    # 两次淘汰检查之间的最短间隔（秒）；上次检查的时间记在缓存目录的标记文件中，
+    # 批量处理的各工作进程、各个 ResultCache 对象共用，不会每处理一批文件就扫描一次目录
+    EVICT_INTERVAL = 600
+
+    # 记录上次淘汰检查时间的标记文件
+    EVICT_MARKER = '.last_evict'
+
+    def __init__(self, directory=None, max_entries=5000, max_bytes=64 * 1024 * 1024):
+        """
+        初始化
+
+        Args:
+            directory: 缓存目录（默认为 default_directory()）
+            max_entries: 最多保留的条目数
+            max_bytes: 所有条目的总大小上限（字节）
+        """
+        self.directory = Path(directory) if directory else self.default_directory()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def default_directory():
+        """默认缓存目录：$XDG_CACHE_HOME/video_script_counter 或 ~/.cache/video_script_counter"""
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return Path(base) / 'video_script_counter'
+
+    @staticmethod
+    def make_key(document_xml, fingerprint):
+        """
+        计算缓存键
+
+        Args:
+            document_xml: 主文档部件的原始字节
+            fingerprint: 统计配置的指纹字符串
+
+        Returns:
+            十六进制的 SHA-256 摘要
+        """
+        digest = hashlib.sha256(fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(document_xml)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f'{key}.json'
+
+    def get(self, key):
+        """
+        读取缓存条目，命中时刷新其使用时间
+
+        Returns:
+            写入时的条目（字典），未命中时为 None
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key, entry):
+        """
+        写入缓存条目（先写临时文件再替换，多进程同时写入也不会损坏）
+
+        距上次淘汰检查超过 EVICT_INTERVAL 秒时顺带淘汰旧条目。
+
+        Args:
+            key: 缓存键
+            entry: 可序列化为 JSON 的字典
+
+        Returns:
+            是否写入成功（I/O 错误时返回 False，不抛出异常）
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            if isinstance(e, OSError):
+                return False
+            raise
+
+        self._evict_if_due()
+        return True
+
+    def _evict_if_due(self):
+        """距上次淘汰检查超过 EVICT_INTERVAL 秒时淘汰旧条目"""
+        marker = self.directory / self.EVICT_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < self.EVICT_INTERVAL:
+                return
+        except OSError:
+            pass  # 还没有检查过
+        try:
+            marker.touch()
+        except OSError:
+            return
+        self.evict()
+
+    def _entries(self):
+        """列出所有条目：[(修改时间, 大小, 路径), ...]"""
+        entries = []
+        try:
+            paths = list(self.directory.glob('*.json'))
+        except OSError:
+            return entries
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """
+        淘汰最久未使用的条目，直到条目数和总大小都不超过上限
+
+        Returns:
+            删除的条目数（无法列出目录时为 0）
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        count = len(entries)
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            count -= 1
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """
+        删除所有条目
+
+        Returns:
+            删除的条目数
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+本地 HTTP 标注服务
+
+    POST /annotate   请求体为 .docx 文件内容，返回带标注的文档
+    POST /stats      请求体为 .docx 文件内容，返回 JSON 统计（与 --report json 的单个文档相同）
+    GET  /health     工作进程数、正在处理的请求数和累计计数
+
+文档在预热的工作进程池中处理：进程启动时已导入 python-docx、编译好规则，
+第一个请求不承担启动开销。正在处理和排队的请求总数有上限，
+超过时立即返回 503 和 Retry-After（背压），而不是无限排队；
+单个请求超过超时时间返回 504。
+
+用法：
+    python service.py --port 8000 -j 4
+    curl --data-binary @脚本.docx -o 脚本_带标注.docx http://127.0.0.1:8000/annotate
+    curl --data-binary @脚本.docx 'http://127.0.0.1:8000/stats?filename=脚本.docx'
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+from duration_models import load_model
+from video_script_counter import (CountingEngine, RuleRegistry, VideoScriptCounter,
+                                  _non_negative_int, _positive_int, process_bytes)
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# 无法读取的上传文档（返回 400 而不是 500）
+_CLIENT_ERRORS = (zipfile.BadZipFile, KeyError, ValueError)
+
+
+class ServiceBusy(Exception):
+    """正在处理和排队的请求已达上限"""
+
+
+# 工作进程中的统计引擎（由 _warm_worker 设置，每个进程只反序列化一次）
+_worker_engine = None
+
+
+def _warm_worker(engine):
+    """工作进程初始化：保存主进程传来的统计引擎，预先导入 python-docx 并运行一次统计"""
+    global _worker_engine
+    _worker_engine = engine
+    import docx  # noqa: F401
+    engine.analyze(["第一部分：引入", "大家好！（预热）"])
+
+
+def _process(data, annotate):
+    """处理一个上传的文档（在工作进程中运行，见 process_bytes）"""
+    return process_bytes(data, annotate, engine=_worker_engine)
+
+
+def _ping():
+    """空任务：确认工作进程已启动并完成初始化"""
+    return os.getpid()
+
+
+class AnnotationService:
+    """预热的工作进程池，加上有上限的请求队列"""
+
+    def __init__(self, workers=None, queue_size=None, timeout=30.0, engine=None):
+        """
+        初始化并启动工作进程
+
+        Args:
+            workers: 工作进程数（默认为 CPU 核数）
+            queue_size: 工作进程都忙时最多排队的请求数（默认为工作进程数的两倍）
+            timeout: 单个请求的超时时间（秒）
+            engine: 提供统计配置的 CountingEngine 对象（默认使用类属性中的配置）
+        """
+        self.engine = engine if engine is not None else CountingEngine()
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = self.workers * 2 if queue_size is None else queue_size
+        self.capacity = self.workers + self.queue_size
+        self.timeout = timeout
+        self.counts = {'completed': 0, 'rejected': 0, 'timed_out': 0, 'failed': 0}
+        self.in_flight = 0
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._executor = self._start_pool()
+
+    def _start_pool(self):
+        """启动工作进程池，等所有进程完成初始化后返回"""
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                       initargs=(self.engine,))
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _finished(self, future):
+        """任务真正结束（或被取消）时才释放名额：超时的任务仍占用着工作进程"""
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def submit(self, data, annotate=True):
+        """
+        处理一个文档，等待结果
+
+        Args:
+            data: .docx 文件内容
+            annotate: 是否生成带标注的文档
+
+        Returns:
+            (DocumentStats, 带标注的文档内容或 None)
+
+        Raises:
+            ServiceBusy: 正在处理和排队的请求已达上限
+            TimeoutError: 超过 timeout 秒未完成
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise ServiceBusy(f"服务繁忙（已有 {self.capacity} 个请求在处理或排队）")
+
+        executor = self._executor
+        try:
+            future = executor.submit(_process, data, annotate)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_flight += 1
+        future.add_done_callback(self._finished)
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Python 3.11 之前 concurrent.futures.TimeoutError 不是内置的 TimeoutError
+            future.cancel()  # 还在排队时直接取消
+            self._count('timed_out')
+            raise TimeoutError(f"处理超过 {self.timeout:g} 秒") from None
+        except BrokenProcessPool:
+            # 工作进程异常退出：重建进程池，之后的请求不受影响
+            self._count('failed')
+            self._restart(executor)
+            raise
+        except BaseException:
+            self._count('failed')
+            raise
+        self._count('completed')
+        return result
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start_pool()
+
+    def status(self):
+        """服务状态（用于 /health）"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                **self.counts,
+            }
+
+    def close(self):
+        """关闭工作进程池"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """请求处理：读取上传的文档，交给 AnnotationService"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'VideoScriptCounter'
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data, headers=()):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, 'application/json; charset=utf-8', headers)
+
+    def _send_error(self, status, message, headers=()):
+        self._send_json(status, {'error': message}, headers)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/health':
+            self._send_json(HTTPStatus.OK, self.server.service.status())
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "未知的路径")
+
+    def _url(self):
+        # http.server 按 latin-1 解码请求行；curl 等客户端可能直接发送未转义的 UTF-8 文件名
+        try:
+            return urlsplit(self.path.encode('latin-1').decode('utf-8'))
+        except UnicodeError:
+            return urlsplit(self.path)
+
+    def _check_upload(self):
+        """
+        检查请求路径和大小，不符合时直接回复错误并关闭连接（不读取请求体）
+
+        Returns:
+            请求体的长度；已回复错误时为 None
+        """
+        if self._url().path not in ('/annotate', '/stats'):
+            status, message = HTTPStatus.NOT_FOUND, "未知的路径"
+        else:
+            length = self.headers.get('Content-Length')
+            if length is None or not length.isdigit():
+                status, message = HTTPStatus.LENGTH_REQUIRED, "需要 Content-Length"
+            elif int(length) > self.server.max_upload:
+                status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                message = f"文档超过 {self.server.max_upload} 字节"
+            else:
+                return int(length)
+        self.close_connection = True
+        self._send_error(status, message)
+        return None
+
+    def handle_expect_100(self):
+        # 带 Expect: 100-continue 的客户端（如 curl 上传大文件）在上传前就能收到错误
+        if self.command == 'POST' and self._check_upload() is None:
+            return False
+        return super().handle_expect_100()
+
+    def do_POST(self):
+        length = self._check_upload()
+        if length is None:
+            return
+        url = self._url()
+        data = self.rfile.read(length)
+        if not data.startswith(b'PK'):
+            self._send_error(HTTPStatus.BAD_REQUEST, "请求体不是 .docx 文件")
+            return
+
+        filename = parse_qs(url.query).get('filename', ['upload.docx'])[0]
+        annotate = url.path == '/annotate'
+        try:
+            stats, output = self.server.service.submit(data, annotate)
+        except ServiceBusy as e:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e), [('Retry-After', '1')])
+            return
+        except TimeoutError as e:
+            self._send_error(HTTPStatus.GATEWAY_TIMEOUT, str(e))
+            return
+        except _CLIENT_ERRORS as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"无法读取文档: {type(e).__name__}: {e}")
+            return
+        except Exception as e:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+            return
+
+        stats.file = filename
+        record = stats.as_record()
+        if not annotate:
+            self._send_json(HTTPStatus.OK, record)
+            return
+
+        stem = filename[:-5] if filename.lower().endswith('.docx') else filename
+        output_name = quote(stem + VideoScriptCounter.OUTPUT_SUFFIX)
+        self._send(HTTPStatus.OK, output, DOCX_CONTENT_TYPE, [
+            ('Content-Disposition', f"attachment; filename*=UTF-8''{output_name}"),
+            ('X-Total-Chars', str(record['total_chars'])),
+            ('X-Total-Duration', str(record['total_duration'])),
+        ])
+
+
+class AnnotationServer(ThreadingHTTPServer):
+    """每个连接一个线程；处理能力由 AnnotationService 的名额限制"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, service, max_upload=20 << 20, access_log=False):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.max_upload = max_upload
+        self.access_log = access_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="视频脚本字数统计 HTTP 标注服务")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址（默认 127.0.0.1）")
+    parser.add_argument('--port', type=int, default=8000, help="监听端口（默认 8000）")
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                        help="工作进程数（默认为 CPU 核数）")
+    parser.add_argument('--queue', type=_non_negative_int, default=None,
+                        help="工作进程都忙时最多排队的请求数（默认为工作进程数的两倍）")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="单个请求的超时时间（秒，默认 30）")
+    parser.add_argument('--max-upload-mb', type=float, default=20.0,
+                        help="上传文档的大小上限（MB，默认 20）")
+    parser.add_argument('--schema', metavar='FILE',
+                        help="从 JSON 方案文件读取部分的名称和标题模式")
+    parser.add_argument('--subsections', action='store_true',
+                        help="同时标注子部分的字数和时间")
+    parser.add_argument('--headers-footers', action='store_true',
+                        help="同时统计页眉和页脚中的文字")
+    parser.add_argument('--duration-model', metavar='MODEL',
+                        help="时长模型：speech_rate（默认）、class_cost 或 JSON 模型文件")
+    parser.add_argument('--access-log', action='store_true', help="打印每个请求的访问日志")
+    args = parser.parse_args()
+
+    duration_model = rules = None
+    if args.duration_model:
+        try:
+            duration_model = load_model(args.duration_model, CountingEngine.SPEECH_RATE)
+        except (OSError, ValueError) as e:
+            print(f"❌ 错误: 无法读取时长模型 {args.duration_model}: {e}", file=sys.stderr)
+            sys.exit(1)
+    if args.schema:
+        try:
+            rules = RuleRegistry.load(args.schema)
+        except (OSError, ValueError) as e:
+            print(f"❌ 错误: 无法读取方案文件 {args.schema}: {e}", file=sys.stderr)
+            sys.exit(1)
+    engine = CountingEngine(rules=rules, annotate_subsections=args.subsections or None,
+                            headers_footers=args.headers_footers or None,
+                            duration_model=duration_model)
+
+    service = AnnotationService(args.jobs, args.queue, args.timeout, engine)
+    server = AnnotationServer((args.host, args.port), service,
+                              int(args.max_upload_mb * (1 << 20)), args.access_log)
+    host, port = server.server_address[:2]
+    print(f"标注服务已启动: http://{host}:{port}"
+          f"（{service.workers} 个工作进程，最多 {service.capacity} 个请求同时处理或排队）")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n已停止服务")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
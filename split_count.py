@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+大文档的分块并行统计
+
+汇编成册的课程脚本可能有上万段，移除括号和统计字数都在一个核上完成。
+这里把每段要统计的文本按段落分块，在进程池中分别统计，再合并为与整段统计完全一致的结果。
+
+括号可能跨块：前一块的左括号被后一块的右括号闭合时，两者之间的内容（包括块边界）都要移除。
+每块统计时记录最内层括号对之外剩下的括号序列，其中块首是可能与前面的左括号配对的右括号，
+块尾是留给后面的未闭合左括号。合并时只按这些括号模拟一遍括号栈，就能得到每个块边界处的栈：
+- 边界处的左括号之后都不会再被闭合（包括栈为空）时，边界两侧互不影响，
+  各块的结果直接相加（块在换行处切分，单词和停顿标记不会跨块）
+- 否则把跨越边界的几块拼起来重新统计（同样在进程池中），结果与整段统计一致
+- UNCLOSED_BRACKET_POLICY 为 'drop' 时，最外层未闭合左括号所在的块之后的块都不计字数
+
+用法：
+    engine = CountingEngine(split_jobs=4)
+    sections_info = engine.analyze(paragraph_texts)
+    python video_script_counter.py 课程合集.docx --split-jobs 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from video_script_counter import CharBreakdown, CountingEngine, _bracket_table, _sum_breakdowns
+
+# 影响括号移除和字数统计、需要传给工作进程的引擎属性
+_CHUNK_SETTINGS = ('BRACKET_PAIRS', 'UNCLOSED_BRACKET_POLICY', 'FLAT_BRACKET_PASSES',
+                   'duration_model')
+
+
+def split_text(text, chunk_chars):
+    """
+    在换行处把文本切成约 chunk_chars 个字符的块（换行留在块尾）
+
+    Returns:
+        块的列表，拼接后等于原文本（空文本为一个空块）
+    """
+    chunks = []
+    start = 0
+    while len(text) - start > chunk_chars:
+        end = text.find('\n', start + chunk_chars - 1)
+        if end < 0:
+            break
+        chunks.append(text[start:end + 1])
+        start = end + 1
+    if start < len(text) or not chunks:
+        chunks.append(text[start:])
+    return chunks
+
+
+def _engine(settings):
+    engine = CountingEngine()
+    for name, value in settings.items():
+        setattr(engine, name, value)
+    return engine
+
+
+def _count_chunk(settings, text):
+    """
+    统计一块文本（在工作进程中运行）
+
+    Returns:
+        (CharBreakdown, 栈扫描遇到的括号字符)
+    """
+    trace = []
+    breakdown, _ = _engine(settings)._count_text(text, trace)
+    return breakdown, ''.join(trace)
+
+
+def _count_group(settings, text):
+    """统计跨越块边界的几块拼成的文本（在工作进程中运行）"""
+    return _engine(settings)._count_text(text)[0]
+
+
+def bracket_depths(engine, traces):
+    """
+    按各块剩下的括号序列依次模拟括号栈（规则与 CountingEngine._scan_brackets 相同）
+
+    Args:
+        engine: CountingEngine（使用其 BRACKET_PAIRS）
+        traces: 每块一个括号字符序列
+
+    Returns:
+        (depths, lows): 每块结束时栈的深度，以及每块处理过程中（含块首）栈的最小深度
+    """
+    openers, closers, _, _ = _bracket_table(tuple(engine.BRACKET_PAIRS))
+    stack = []
+    open_counts = [0] * len(engine.BRACKET_PAIRS)
+    depths = []
+    lows = []
+    for trace in traces:
+        low = len(stack)
+        for char in trace:
+            kind = closers.get(char)
+            if kind is not None and open_counts[kind]:
+                while True:
+                    top = stack.pop()
+                    open_counts[top] -= 1
+                    if top == kind:
+                        break
+                low = min(low, len(stack))
+                continue
+
+            kind = openers.get(char)
+            if kind is not None:
+                stack.append(kind)
+                open_counts[kind] += 1
+        depths.append(len(stack))
+        lows.append(low)
+    return depths, lows
+
+
+def plan_groups(engine, traces):
+    """
+    把块分成互不影响的组
+
+    块边界处栈中的左括号之后都不会再被弹出时（这些左括号直到文本末尾都不闭合，
+    不影响后面的配对），边界两侧的统计互不影响，在此处分组。
+
+    Returns:
+        (groups, dropped_from, unclosed): 每组一个 (起始块, 结束块) 区间的列表（不含结束块）；
+        按 'drop' 处理未闭合左括号时，从第几组开始不计字数（None 表示都计）；
+        整段文本结束时是否有未闭合的左括号
+    """
+    depths, lows = bracket_depths(engine, traces)
+
+    # 边界之后的最小深度不低于边界处的深度，说明边界处的左括号都不会再被弹出
+    clean = [False] * len(traces)
+    future_low = float('inf')
+    for i in reversed(range(len(traces))):
+        clean[i] = depths[i] <= future_low
+        future_low = min(future_low, lows[i])
+
+    groups = []
+    start = 0
+    for i, is_clean in enumerate(clean):
+        if is_clean:
+            groups.append((start, i + 1))
+            start = i + 1
+
+    unclosed = bool(depths and depths[-1])
+    dropped_from = None
+    if unclosed and engine.UNCLOSED_BRACKET_POLICY == 'drop':
+        # 最外层未闭合的左括号在栈最后一次为空之后入栈，它所在的组之后全部移除
+        opened_in = max(i for i, low in enumerate(lows) if low == 0)
+        dropped_from = next(index + 1 for index, (first, end) in enumerate(groups)
+                            if first <= opened_in < end)
+    return groups, dropped_from, unclosed
+
+
+def count_texts(engine, texts, jobs=None, chunk_chars=100_000, executor=None):
+    """
+    分块并行统计多段文本
+
+    Args:
+        engine: CountingEngine（括号类型、未闭合括号的处理方式和时长模型传给工作进程）
+        texts: 文本列表（如各部分的正文）
+        jobs: 工作进程数（默认为 CPU 核数；为 1 时在当前进程中分块统计）
+        chunk_chars: 每块的字符数
+        executor: 可选的 concurrent.futures 执行器（提供时不创建进程池）
+
+    Returns:
+        每段文本一个 (CharBreakdown, 是否有未闭合的左括号) 元组的列表，
+        与逐段调用 engine._count_text 的结果相同
+    """
+    if executor is None and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return count_texts(engine, texts, jobs, chunk_chars, executor)
+
+    settings = {name: getattr(engine, name) for name in _CHUNK_SETTINGS}
+
+    def run(function, items):
+        if executor is None:
+            return [function(settings, item) for item in items]
+        return list(executor.map(function, [settings] * len(items), items))
+
+    chunked = [split_text(text, chunk_chars) for text in texts]
+    results = iter(run(_count_chunk, [chunk for chunks in chunked for chunk in chunks]))
+
+    plans = []
+    regroup = []
+    for chunks in chunked:
+        chunk_results = [next(results) for _ in chunks]
+        groups, dropped_from, unclosed = plan_groups(
+            engine, [trace for _, trace in chunk_results])
+        plans.append((chunk_results, groups, dropped_from, unclosed))
+        # 跨块的组拼起来重新统计（移除的组不需要统计）
+        regroup.extend(''.join(chunks[start:end])
+                       for start, end in groups[:dropped_from] if end - start > 1)
+    regrouped = iter(run(_count_group, regroup))
+
+    merged = []
+    for chunk_results, groups, dropped_from, unclosed in plans:
+        parts = []
+        for index, (start, end) in enumerate(groups):
+            if dropped_from is not None and index >= dropped_from:
+                # 停顿标记在移除括号前的文本中统计，移除的内容中的停顿照样计入
+                pause_ms = sum(breakdown.pause_ms for breakdown, _ in chunk_results[start:end])
+                parts.append(CharBreakdown(0, 0, 0, 0, 0, pause_ms))
+            elif end - start > 1:
+                parts.append(next(regrouped))
+            else:
+                parts.append(chunk_results[start][0])
+        merged.append((_sum_breakdowns(parts), unclosed))
+    return merged
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试异步接口"""
+
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from docx import Document
+
+from async_counter import AsyncScriptCounter
+from video_script_counter import CountingEngine, DocumentStats, VideoScriptCounter
+
+
+def make_docx(paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+data = make_docx(["第一部分：引入", "大家好！（播放开场动画）",
+                  "第二部分：知识点讲解", "首先，我们来看看什么是加法。"])
+large = make_docx(["第一部分：引入"] + ["今天我们来学习加法的基本概念（展示图片）。" * 5] * 5000)
+
+
+class TrackingExecutor(ThreadPoolExecutor):
+    """记录同时在执行的任务数"""
+
+    def __init__(self):
+        super().__init__(max_workers=8)
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        def tracked():
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                time.sleep(0.02)
+                return fn(*args)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return super().submit(tracked)
+
+
+print("=" * 70)
+print("测试异步接口")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+
+async def main():
+    expected_output = io.BytesIO()
+    expected = DocumentStats(None, VideoScriptCounter(io.BytesIO(data), verbose=False,
+                                                      output_file=expected_output).process_document())
+
+    async with AsyncScriptCounter(concurrency=2) as counter:
+        check("统计 bytes", await counter.count(data) == expected)
+
+        stats, annotated = await counter.annotate(bytearray(data))
+        check("标注 bytes", stats == expected and annotated == expected_output.getvalue())
+
+        # 异步文件流：分多次写入的 StreamReader
+        reader = asyncio.StreamReader()
+        for i in range(0, len(data), 1000):
+            reader.feed_data(data[i:i + 1000])
+        reader.feed_eof()
+        check("异步文件流", await counter.count(reader) == expected)
+
+        try:
+            await counter.count(io.BytesIO(data))
+            rejected = False
+        except TypeError:
+            rejected = True
+        check("拒绝同步文件对象", rejected)
+
+        # 处理大文档时事件循环仍然响应
+        gaps = []
+
+        async def ticker(done):
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        done = asyncio.Event()
+        tick = asyncio.create_task(ticker(done))
+        await counter.annotate(large)
+        done.set()
+        await tick
+        check(f"事件循环未被阻塞（最长间隔 {max(gaps) * 1000:.0f}ms）", max(gaps) < 0.1)
+
+        results = await counter.count_many([data, b'PK broken', data], return_exceptions=True)
+        check("批量统计中的错误不影响其他文档", results[0] == expected and results[2] == expected
+              and isinstance(results[1], Exception))
+
+    # 统计配置随文档传给工作进程
+    async with AsyncScriptCounter(concurrency=1, engine=CountingEngine(speech_rate=110)) as counter:
+        slow = await counter.count(data)
+    check("使用传入的引擎配置", slow.total_chars == expected.total_chars
+          and slow.total_duration > expected.total_duration)
+
+    # 并发上限
+    executor = TrackingExecutor()
+    counter = AsyncScriptCounter(executor, concurrency=3)
+    results = await counter.count_many([data] * 12)
+    executor.shutdown()
+    check(f"并发上限（最多同时 {executor.peak} 个）",
+          executor.peak == 3 and all(result == expected for result in results))
+
+
+asyncio.run(main())
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试批量处理：进程池的在途任务上限和工作进程异常退出"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+
+from docx import Document
+
+from video_script_counter import CountingEngine, iter_batch, iter_pool
+
+# 工作进程中的任务：默认被忽略的信号什么也不做（返回 None），SIGKILL 模拟工作进程被杀
+# （内存不足、lxml 崩溃等）。任务函数不能定义在本文件中：pytest 导入本文件时持有导入锁，
+# 进程池无法在导入过程中 pickle 本模块的函数
+IGNORED = (signal.SIGWINCH, signal.SIGURG)
+KILLED = signal.SIGKILL
+
+print("=" * 70)
+print("测试批量处理")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+
+tasks = [*IGNORED, KILLED, *IGNORED, *IGNORED]
+results = list(iter_pool(signal.raise_signal, tasks, jobs=2, ordered=True))
+check("工作进程异常退出只影响引起退出的任务", [task for task, _, _ in results] == tasks
+      and [type(error).__name__ for _, _, error in results]
+      == ['NoneType'] * 2 + ['BrokenProcessPool'] + ['NoneType'] * 4)
+
+tasks = [KILLED, IGNORED[0], KILLED, IGNORED[1], -1]
+results = {task: error for task, _, error in iter_pool(signal.raise_signal, tasks, jobs=2)}
+check("按完成顺序返回，任务抛出的异常照常返回", len(results) == 4
+      and type(results[KILLED]).__name__ == 'BrokenProcessPool'
+      and results[IGNORED[0]] is None and results[IGNORED[1]] is None
+      and isinstance(results[-1], OSError))
+
+with tempfile.TemporaryDirectory() as tmp:
+    paths = []
+    for i in range(5):
+        doc = Document()
+        for text in ["第一部分：引入", "大家好！" * (i + 1)]:
+            doc.add_paragraph(text)
+        paths.append(os.path.join(tmp, f'第{i}课.docx'))
+        doc.save(paths[-1])
+    paths.append(os.path.join(tmp, '不存在.docx'))
+
+    results = {result['file']: result for result in iter_batch(paths, jobs=2, chunk_size=2,
+                                                                  write=False)}
+    check("批量处理收集每个文件的错误", sorted(results) == sorted(paths)
+          and [results[path]['stats'].total_chars for path in paths[:5]] == [4, 8, 12, 16, 20]
+          and results[paths[5]]['error'] is not None and results[paths[5]]['stats'] is None)
+
+    # 配置好的引擎随任务传给工作进程，不修改 CountingEngine 的类属性
+    engine = CountingEngine(speech_rate=60)
+    results = list(iter_batch(paths[:5], jobs=2, chunk_size=2, write=False, engine=engine))
+    check("工作进程使用传入的引擎配置", sorted(result['stats'].total_duration for result in results)
+          == [4, 8, 12, 16, 20] and CountingEngine.SPEECH_RATE == 220)
+
+run = subprocess.run([sys.executable, 'video_script_counter.py', tmp, '-j', '0'],
+                     cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+check("拒绝小于 1 的进程数", run.returncode == 2 and '-j' in run.stderr)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试批量字数统计与逐段统计的一致性"""
+
+import random
+
+import bulk_count
+from bulk_count import count_breakdowns, count_characters
+from video_script_counter import VideoScriptCounter
+
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+
+print("=" * 70)
+print("测试批量字数统计")
+print("=" * 70)
+
+if not bulk_count.HAVE_NUMPY:
+    print("\n未安装 numpy，测试逐段统计的退回实现")
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+def expected(texts):
+    # 比较五类字符（批量统计不识别停顿标记）
+    return [tuple(counter.count_breakdown(text))[:5] for text in texts]
+
+def actual(texts, **kwargs):
+    return [tuple(int(value) for value in row)[:5] for row in count_breakdowns(texts, **kwargs)]
+
+# 典型文本与边界情况
+texts = [
+    "大家好！我是你们的首席语法工程师，Jade！",
+    "Let's count together: one, two, three! Don't forget the apples.",
+    "第１题：院子里有３只小猫，又来了４只小猫，现在一共有几只？",
+    "a'b'c'd'e rock'n'roll 'quoted' it's'",
+    "2 + 3 = 5，１２３，٣٤ 𝟙",
+    "　全角空格\xa0不换行空格\x1c分隔符",
+    "😀 emoji 𠀀 扩展汉字",
+    "",
+    "'",
+    "x",
+]
+check("典型文本与边界情况", actual(texts) == expected(texts))
+
+# 随机组合容易出错的字符，并用很小的分块跨越块边界
+pieces = list("中文，。！abcXYZ'' 0123\t\n１２３＠　\xa0٣😀-_.?")
+rng = random.Random(0)
+texts = [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30))) for _ in range(3000)]
+check("随机文本", actual(texts) == expected(texts))
+check("分块统计", actual(texts, chunk_chars=50) == expected(texts))
+
+# 逐个码位分类与正则一致（基本多文种平面）
+chars = [chr(code) for code in range(0x10000) if not 0xd800 <= code <= 0xdfff]
+check("基本多文种平面的每个字符", actual(chars) == expected(chars))
+
+# 总字数
+texts = texts[:200]
+check("总字数", [int(total) for total in count_characters(texts)]
+      == [counter.count_characters(text) for text in texts])
+check("生成器与空输入", actual(iter(texts)) == expected(texts) and len(count_breakdowns([])) == 0)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
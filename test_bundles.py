@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试压缩包输入和输出"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import zipfile
+
+from docx import Document
+
+from bundles import (BundleWriter, is_bundle, iter_bundle, iter_members, output_path,
+                     run_bundle, run_bundles)
+from video_script_counter import process_bytes
+
+
+def make_docx(paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+lesson1 = make_docx(["第一部分：引入", "大家好！（播放开场动画）",
+                     "第二部分：知识点讲解", "首先，我们来看看什么是加法。"])
+lesson2 = make_docx(["第一部分：引入", "Let's count: one, two, three!"])
+members = {'第1课.docx': lesson1, '单元二/第2课.docx': lesson2}
+
+print("=" * 70)
+print("测试压缩包输入和输出")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+
+check("识别压缩包", is_bundle('供应商.zip') and is_bundle('a/供应商.TAR.GZ') and is_bundle('b.tgz')
+      and not is_bundle('第1课.docx')
+      and output_path('a/供应商.tar.gz').as_posix() == 'a/供应商_带标注.tar.gz')
+
+with tempfile.TemporaryDirectory() as tmp:
+    zip_path = os.path.join(tmp, '供应商.zip')
+    with zipfile.ZipFile(zip_path, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+        archive.writestr('坏.docx', b'not a docx')
+        archive.writestr('第1课_带标注.docx', lesson1)
+        archive.writestr('__MACOSX/._第1课.docx', b'resource fork')
+        archive.writestr('说明.txt', '说明')
+        # Windows 中文系统打包的 zip：GBK 文件名，没有 UTF-8 标志（先用等长的 ASCII 名称占位）
+        gbk_name = '第3课.docx'.encode('gbk')
+        archive.writestr('x' * len(gbk_name), lesson2)
+    with open(zip_path, 'rb') as f:
+        data = f.read().replace(b'x' * len(gbk_name), gbk_name)
+    with open(zip_path, 'wb') as f:
+        f.write(data)
+
+    tar_path = os.path.join(tmp, '供应商.tar.gz')
+    with BundleWriter(tar_path) as bundle:
+        for name, data in members.items():
+            bundle.add(name, data)
+
+    check("只读取待处理的脚本", [name for name, _ in iter_members(zip_path)]
+          == ['第1课.docx', '单元二/第2课.docx', '坏.docx', '第3课.docx'])
+    check("流式读取 tar.gz", dict(iter_members(tar_path)) == members)
+
+    # 带标注的文档与单独处理每个文档的结果相同
+    expected = {name: process_bytes(data) for name, data in members.items()}
+    results = list(iter_bundle(tar_path, jobs=1))
+    check("逐个处理包内文档", [result['file'] for result, _ in results]
+          == [f"{tar_path}/{name}" for name in members]
+          and all((result['stats'].sections, annotated) == (expected[name][0].sections, expected[name][1])
+                  for (result, annotated), name in zip(results, members)))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        failures = run_bundle(zip_path, jobs=2)
+    with zipfile.ZipFile(output_path(zip_path)) as archive:
+        check("带标注的文档写入新的压缩包", failures == 1
+              and archive.namelist() == ['第1课_带标注.docx', '单元二/第2课_带标注.docx',
+                                         '第3课_带标注.docx']
+              and archive.read('单元二/第2课_带标注.docx') == expected['单元二/第2课.docx'][1])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_bundle(tar_path, jobs=1, report_format='json')
+    with tarfile.open(output_path(tar_path, '_统计')) as archive:
+        report = json.loads(archive.extractfile('统计报表.json').read().decode('utf-8'))
+    check("统计报表写入新的压缩包", [record['file'] for record in report]
+          == [f"{tar_path}/{name}" for name in members]
+          and report[0]['total_chars']
+          == expected['第1课.docx'][0].total_chars)
+
+    # 包内的文档按内容使用结果缓存，命中时照常写出带标注的文档
+    cache_dir = os.path.join(tmp, 'cache')
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_bundle(tar_path, jobs=1, cache_dir=cache_dir)
+        entries = len([name for name in os.listdir(cache_dir) if name.endswith('.json')])
+        run_bundle(tar_path, jobs=2, cache_dir=cache_dir)
+    with tarfile.open(output_path(tar_path)) as archive:
+        check("压缩包使用结果缓存", entries == len(members)
+              and archive.extractfile('单元二/第2课_带标注.docx').read()
+              == expected['单元二/第2课.docx'][1])
+
+    run = subprocess.run([sys.executable, 'video_script_counter.py', tar_path, '--report', 'csv',
+                          '--report-file', os.path.join(tmp, '统计.csv')],
+                         cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    check("压缩包不能与 --report-file 同时使用", run.returncode == 1
+          and '--report-file' in run.stderr and not os.path.exists(os.path.join(tmp, '统计.csv')))
+
+    broken = os.path.join(tmp, '损坏.zip')
+    with open(broken, 'wb') as f:
+        f.write(b'PK broken')
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        failures = run_bundles([broken, os.path.join(tmp, '不存在.tar'), tar_path], jobs=1)
+    check("无法读取的压缩包不留下输出", failures == 2
+          and not any(name.startswith(('损坏_', '不存在_')) or name.endswith('.tmp')
+                      for name in os.listdir(tmp)))
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试无状态的统计引擎和 __slots__ 统计结果"""
+
+import io
+import os
+import pickle
+import tempfile
+import threading
+
+from docx import Document
+
+from video_script_counter import (CountingEngine, DocumentStats, RuleRegistry, SectionStats,
+                                  VideoScriptCounter)
+
+doc = Document()
+for text in ("第一部分：引入", "大家好！（播放开场动画）",
+             "第二部分：知识点讲解", "知识点1：加法", "首先，我们来看看什么是加法。",
+             "第三部分：综合练习", "一加一等于几？"):
+    doc.add_paragraph(text)
+buffer = io.BytesIO()
+doc.save(buffer)
+data = buffer.getvalue()
+
+print("=" * 70)
+print("测试统计引擎")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+engine = CountingEngine()
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, '脚本.docx')
+    with open(path, 'wb') as f:
+        f.write(data)
+    counter = VideoScriptCounter(path, verbose=False)
+    expected = counter.process_document()
+    with open(counter.output_file, 'rb') as f:
+        expected_output = f.read()
+
+    stats = engine.count(path)
+    check("统计路径", stats.file == path and list(stats.sections) == expected)
+
+    output = io.BytesIO()
+    stats = engine.process(data, output)
+    check("处理 bytes 并写入文件对象", stats.file is None and list(stats.sections) == expected
+          and output.getvalue() == expected_output)
+
+    output_path = os.path.join(tmp, '输出.docx')
+    with open(path, 'rb') as source:
+        stats = engine.process(source, output_path)
+    with open(output_path, 'rb') as f:
+        check("处理文件对象并写入路径", stats.file == path and f.read() == expected_output)
+    check("不生成默认输出文件名", sorted(os.listdir(tmp)) == ['脚本.docx', '脚本_带标注.docx', '输出.docx'])
+
+# 统计结果
+stats = engine.count(data)
+sections = stats.sections
+check("统计结果", [s.name for s in sections] == ['引入', '知识点讲解', '综合练习']
+      and isinstance(sections[0], SectionStats) and stats.total_chars == 4 + 14 + 7
+      and sections[1].time_range == '00:01-00:05'
+      and [sub.title for sub in sections[1].subsections] == ['知识点1：加法'])
+check("没有实例字典", not hasattr(sections[0], '__dict__') and not hasattr(stats, '__dict__'))
+check("与字典互相转换", DocumentStats.from_sections_info(stats.sections_info()) == stats)
+record = stats.as_record()
+check("报表记录", record['total_chars'] == stats.total_chars and record['error'] is None
+      and [s['name'] for s in record['sections']] == ['引入', '知识点讲解', '综合练习']
+      and record['sections'][1]['time_range'] == '00:01-00:05')
+check("可以序列化（传给工作进程）", pickle.loads(pickle.dumps(stats)) == stats)
+
+# 每个引擎可以有自己的配置，不影响默认配置
+slow = CountingEngine(speech_rate=110)
+three = CountingEngine(rules=RuleRegistry.from_schema({'sections': [
+    {'name': '开场', 'patterns': ['^第一部分']},
+    {'name': '讲解', 'patterns': ['^第二部分']},
+]}))
+check("引擎各自的配置", slow.count(data).total_duration > engine.count(data).total_duration
+      and [s.name for s in three.count(data).sections] == ['开场', '讲解']
+      and CountingEngine.SPEECH_RATE == 220 and len(engine.rules.section_names) == 4)
+
+# 多个线程共用一个引擎
+results = []
+def work():
+    for _ in range(5):
+        results.append(engine.process(data, io.BytesIO()))
+threads = [threading.Thread(target=work) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+check("多线程共用", len(results) == 20 and all(result == stats for result in results))
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试流式读取 .docx 段落（与 python-docx 的结果对比）"""
+
+import io
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement, parse_xml
+
+from docx_io import iter_paragraphs
+from video_script_counter import CountingEngine, document_paragraphs
+
+# 文本框：mc:Choice（DrawingML）和 mc:Fallback（VML）中各有一份相同的内容
+TEXT_BOX = """
+<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+     xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+     xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+     xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>
+      <w:p><w:r><w:t>文本框第一段</w:t></w:r></w:p>
+      <w:p><w:r><w:t>文本框第二段</w:t></w:r></w:p>
+    </w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>
+    <mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>
+      <w:p><w:r><w:t>文本框第一段</w:t></w:r></w:p>
+      <w:p><w:r><w:t>文本框第二段</w:t></w:r></w:p>
+    </w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+
+def create_document():
+    """创建包含各种段内元素的测试文档"""
+    doc = Document()
+    doc.add_paragraph("第一部分：引入")
+    doc.add_paragraph("大家好（播放开场动画）！")
+
+    # 换行符、制表符、分页符
+    para = doc.add_paragraph()
+    run = para.add_run("第一行")
+    run.add_break()
+    run.add_text("第二行")
+    run.add_tab()
+    run.add_text("制表符后")
+    run.add_break(WD_BREAK.PAGE)
+    para.add_run("分页符后")
+
+    # 超链接中的文字
+    para = doc.add_paragraph("请访问")
+    hyperlink = OxmlElement('w:hyperlink')
+    link_run = OxmlElement('w:r')
+    link_text = OxmlElement('w:t')
+    link_text.text = "课程网站"
+    link_run.append(link_text)
+    hyperlink.append(link_run)
+    para._p.append(hyperlink)
+
+    # 表格（分镜脚本）和嵌套表格中的段落
+    doc.add_paragraph("第二部分：知识点讲解")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "画面：苹果"
+    table.cell(0, 1).text = "一个苹果加一个苹果（停顿）"
+    table.cell(0, 1).add_paragraph("等于两个苹果")
+    inner = table.cell(0, 1).add_table(rows=1, cols=1)
+    inner.cell(0, 0).text = "嵌套表格"
+
+    # 文本框中的段落排在所在段落之后
+    para = doc.add_paragraph("文本框前")
+    para._p.append(parse_xml(TEXT_BOX))
+    para.add_run("文本框后")
+
+    doc.add_paragraph("")
+    doc.add_paragraph("第四部分：总结")
+
+    doc.sections[0].header.paragraphs[0].text = "页眉：第三课"
+    doc.sections[0].footer.paragraphs[0].text = "页脚"
+
+    stream = io.BytesIO()
+    doc.save(stream)
+    return stream.getvalue()
+
+
+print("=" * 70)
+print("测试流式读取 .docx 段落")
+print("=" * 70)
+
+data = create_document()
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+for headers_footers in (False, True):
+    paragraphs = document_paragraphs(Document(io.BytesIO(data)), headers_footers)
+    expected = [(i, p.text) for i, p in enumerate(paragraphs)]
+    result = list(iter_paragraphs(io.BytesIO(data), headers_footers))
+
+    all_passed = all_passed and (len(result) == len(expected))
+    for (i, expect), got in zip(expected, result):
+        passed = (got == (i, expect))
+        all_passed = all_passed and passed
+
+        status = "✓" if passed else "✗"
+        print(f"\n段落 {i}: {status}")
+        print(f"  期望: {expect!r}")
+        print(f"  结果: {got[1]!r}")
+        if not passed:
+            print(f"  ❌ 失败！")
+
+texts = [text for _, text in iter_paragraphs(io.BytesIO(data))]
+check("表格、嵌套表格和文本框按文档顺序读取",
+      texts[texts.index("画面：苹果"):texts.index("文本框第二段") + 1] == [
+          "画面：苹果", "一个苹果加一个苹果（停顿）", "等于两个苹果", "嵌套表格",
+          "", "文本框前文本框后", "文本框第一段", "文本框第二段"])
+texts = [text for _, text in iter_paragraphs(io.BytesIO(data), headers_footers=True)]
+check("页眉在正文之前、页脚在正文之后", texts[0] == "页眉：第三课" and texts[-1] == "页脚")
+
+# 表格中的口播计入所在部分，标注写在正确的段落上
+engine = CountingEngine()
+flat = Document()
+for text in texts[1:-1]:
+    flat.add_paragraph(text)
+stream = io.BytesIO()
+flat.save(stream)
+check("统计表格和文本框中的文字", engine.count(data) == engine.count(stream.getvalue())
+      and engine.count(data).sections[1].char_count > 40)
+output = io.BytesIO()
+engine.process(data, output)
+annotated = [p.text for p in document_paragraphs(Document(output))]
+check("标注", annotated[annotated.index("画面：苹果") - 1].startswith("第二部分：知识点讲解（约"))
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败！")
+print("=" * 70)
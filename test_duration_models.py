@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试口播时长模型"""
+
+import json
+import os
+import pickle
+import tempfile
+
+from duration_models import (DEFAULT_COSTS, ClassCostModel, SpeechRateModel, load_model,
+                             model_from_dict)
+from video_script_counter import CharBreakdown, CountingEngine, IncrementalCounter
+
+paragraphs = [
+    "第一部分：引入",
+    "大家好！今天我们学习 apple 和 banana（展示图片，停顿2秒）。",
+    "第二部分：知识点讲解",
+    "知识点1：数字",
+    "一共有 125 个苹果。（停顿）",
+    "知识点2：英文",
+    "Let's say it together: one, two, three!",
+    "第三部分：综合练习",
+    "请回答问题（pause 1.5s）",
+]
+
+print("=" * 70)
+print("测试口播时长模型")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# 默认按语速匀速换算，与显式指定 SpeechRateModel 的结果相同
+default = CountingEngine().analyze(paragraphs)
+check("SpeechRateModel 与默认算法一致",
+      CountingEngine(duration_model=SpeechRateModel(220)).analyze(paragraphs) == default)
+check("SpeechRateModel 使用自己的语速",
+      [info['duration'] for info in CountingEngine(
+          duration_model=SpeechRateModel(110)).analyze(paragraphs)]
+      == [info['duration'] for info in CountingEngine(speech_rate=110).analyze(paragraphs)])
+
+# 按字符类别计时：字数不变，时长由各类字符数和停顿标记换算
+model = ClassCostModel()
+engine = CountingEngine(duration_model=model)
+sections_info = engine.analyze(paragraphs)
+check("字数不受时长模型影响",
+      [info['char_count'] for info in sections_info] == [info['char_count'] for info in default])
+
+breakdown, _ = engine._count_text(paragraphs[1])
+check("停顿标记写在括号里也有效（括号内的文字不计字数）",
+      breakdown.pause_ms == 2000 and breakdown.words == 2 and breakdown.cjk == 10)
+check("没有写秒数的停顿按 default_pause 计",
+      engine._count_text(paragraphs[4])[0].pause_ms == 1000
+      and ClassCostModel(default_pause=0.5).pause_ms("（停顿）") == 500)
+check("英文停顿标记", engine._count_text(paragraphs[8])[0].pause_ms == 1500)
+check("停顿标记不跨段", model.pause_ms("（停顿）\n3秒") == 1000
+      and model.pause_ms("（停顿\n3秒）") == 0)
+check("同一括号中的多个停顿标记", model.pause_ms("（停顿1秒，展示图片，pause 2s）") == 3000)
+
+# 正文里的"停顿"、"pause"是要读出来的话：不计停顿，照常计字数
+plain = engine._count_text("读的时候不要停顿。")[0]
+check("正文中的停顿不计时长", plain.pause_ms == 0 and plain.cjk == 8
+      and model.pause_ms("Please pause and think.") == 0
+      and model.pause_ms("（不要停顿，继续读）") == 0)
+plain = engine._count_text("停顿3秒")[0]
+check("括号外的标记只计字数", plain.pause_ms == 0 and plain.cjk == 3 and plain.digits == 1)
+check("不识别停顿标记的模型", CountingEngine()._count_text(paragraphs[1])[0].pause_ms == 0
+      and ClassCostModel(pause_patterns=[]).pause_re is None)
+
+expected = round(sum(getattr(breakdown, name) * cost for name, cost in DEFAULT_COSTS.items())
+                 + 2.0)
+check("按类别换算时长", engine.estimate_duration(breakdown) == expected)
+
+a = CharBreakdown(10, 2, 3, 4, 1, 500)
+b = CharBreakdown(7, 1, 0, 2, 0, 1000)
+check("模型是线性的（先相加再换算）",
+      abs(model.seconds(CharBreakdown(*map(sum, zip(a, b))))
+          - model.seconds(a) - model.seconds(b)) < 1e-9)
+
+# 子部分的时间轴落在部分的时间范围内，首尾相接
+section = sections_info[1]
+subsections = section['subsections']
+check("子部分时间轴", subsections[0]['start_time'] >= section['start_time']
+      and subsections[-1]['end_time'] == section['end_time']
+      and subsections[0]['end_time'] == subsections[1]['start_time'])
+
+# 增量统计与完整统计一致
+incremental = IncrementalCounter(engine)
+incremental.update(paragraphs)
+edited = list(paragraphs)
+edited[6] = "Let's say it together（停顿3秒）: one, two!"
+incremental.edit(6, edited[6])
+check("增量统计", incremental.sections_info == engine.analyze(edited)
+      and incremental.sections_info != sections_info)
+
+check("配置指纹包含时长模型",
+      len({CountingEngine().config_fingerprint(), engine.config_fingerprint(),
+           CountingEngine(duration_model=ClassCostModel(costs={'words': 0.6})).config_fingerprint()})
+      == 3)
+check("可以序列化（传给工作进程）", pickle.loads(pickle.dumps(model)) == model)
+
+# 模型文件
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, '模型.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'class_cost', 'costs': {'words': 0.6}, 'default_pause': 2}, f)
+    loaded = load_model(path)
+check("读取模型文件", loaded.costs['words'] == 0.6 and loaded.costs['cjk'] == DEFAULT_COSTS['cjk']
+      and loaded.default_pause == 2)
+check("按名称创建模型", load_model('class_cost') == ClassCostModel()
+      and load_model('speech_rate') == SpeechRateModel()
+      and load_model('speech_rate', 180) == SpeechRateModel(180))
+
+# 按名称选择 speech_rate 模型时使用引擎的语速，与不设置模型时相同
+fast = CountingEngine(speech_rate=180).analyze(paragraphs)
+check("按名称创建的匀速模型使用引擎的语速",
+      CountingEngine(speech_rate=180, duration_model='speech_rate').analyze(paragraphs) == fast
+      and CountingEngine(speech_rate=180, duration_model=load_model('speech_rate', 180))
+      .analyze(paragraphs) == fast and fast != default)
+
+for spec in ({'type': 'unknown'}, {'type': 'class_cost', 'costs': {'emoji': 1}},
+             {'type': 'class_cost', 'costs': {'cjk': -1}}, {'type': 'speech_rate', 'rate': 0},
+             {'type': 'class_cost', 'pause_patterns': ['(']}, {'type': 'speech_rate', 'speed': 1},
+             []):
+    try:
+        model_from_dict(spec)
+        rejected = False
+    except ValueError:
+        rejected = True
+    check(f"拒绝错误的模型 {spec!r}", rejected)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试增量统计与完整统计的结果一致"""
+
+from video_script_counter import IncrementalCounter, VideoScriptCounter
+
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+
+paragraphs = [
+    "第一部分：引入",
+    "大家好！（播放开场动画）",
+    "第二部分：知识点讲解",
+    "知识点1：加法的基本概念",
+    "首先，我们来看看什么是加法。",
+    "（展示图片",
+    "继续说明）这里是口播。",
+    "第三部分：综合练习",
+    "院子里有3只小猫。",
+    "第四部分：总结",
+    "今天我们学习了加法。",
+]
+
+# (说明, 操作)
+edits = [
+    ("修改正文段落", lambda texts: texts.__setitem__(1, "大家好！欢迎来到数学课堂。")),
+    ("修改括号跨段的段落", lambda texts: texts.__setitem__(5, "（展示图片）")),
+    ("在正文中加入未闭合的括号", lambda texts: texts.__setitem__(8, "院子里有3只（小猫。")),
+    ("修改标题", lambda texts: texts.__setitem__(7, "第三部分：练习")),
+    ("插入段落", lambda texts: texts.insert(4, "加法就是把数合起来。")),
+    ("删除段落", lambda texts: texts.pop(2)),
+]
+
+print("=" * 70)
+print("测试增量统计")
+print("=" * 70)
+
+texts = list(paragraphs)
+sections_info = []
+incremental = IncrementalCounter(counter, sections_info)
+incremental.update(texts)
+
+all_passed = sections_info == counter.analyze(texts)
+print(f"\n初次统计: {'✓' if all_passed else '✗'}")
+
+for description, apply in edits:
+    apply(texts)
+    result = incremental.update(texts)
+    passed = result is sections_info and result == counter.analyze(texts)
+    all_passed = all_passed and passed
+
+    status = "✓" if passed else "✗"
+    print(f"\n{description}: {status}")
+    for info in result:
+        print(f"  {info['name']}: {info['char_count']}字 {info['time_range']}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# 单段修改
+texts[0] = "第一部分：引入"
+incremental.edit(0, texts[0])
+texts[1] = "同学们好。"
+incremental.edit(1, texts[1])
+passed = sections_info == counter.analyze(texts)
+all_passed = all_passed and passed
+print(f"\n单段修改: {'✓' if passed else '✗'}")
+
+# 逐字编辑：缓存不保留每个中间版本
+for i in range(300):
+    texts[1] = "同学们好" + "。" * i
+    incremental.edit(1, texts[1])
+passed = len(incremental._memo) <= 2 * len(texts) + 64 and sections_info == counter.analyze(texts)
+all_passed = all_passed and passed
+print(f"\n逐字编辑时缓存有上限: {'✓' if passed else '✗'}")
+
+# 传入生成器时，清理缓存后仍保留当前段落的结果
+for i in range(100):
+    incremental.update(text + "！" * (i % 2) for text in texts)
+incremental.update(iter(texts))
+passed = (all(text in incremental._memo for text in texts)
+          and sections_info == counter.analyze(texts))
+all_passed = all_passed and passed
+print(f"\n传入生成器: {'✓' if passed else '✗'}")
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
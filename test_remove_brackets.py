@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试单次扫描的括号移除功能"""
+
+from video_script_counter import VideoScriptCounter
+
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+
+# 测试用例
+test_cases = [
+    ("大家好（播放开场动画）！", "大家好！"),
+    ("数学就在生活中【展示生活场景图片】。", "数学就在生活中。"),
+    ("（展示[图片]）文字", "文字"),                       # 混合嵌套
+    ("文字[展示（图片）]继续", "文字继续"),                 # 混合嵌套（顺序相反）
+    ("a(b(c(d)e)f)g", "ag"),                             # 同类型多层嵌套
+    ("（停顿\n换行）内容", "内容"),                        # 括号跨行
+    ("（a[b）c]", "c]"),                                 # 交错：右括号关闭最近的同类型左括号
+    ("价格)很低", "价格)很低"),                            # 不配对的右括号保留
+    ("(未闭合（内部）内容", "(未闭合内容"),                  # 未闭合的左括号保留
+]
+
+print("=" * 70)
+print("测试括号移除功能")
+print("=" * 70)
+
+all_passed = True
+for i, (input_text, expected) in enumerate(test_cases, 1):
+    result = counter.remove_brackets(input_text)
+    passed = (result == expected)
+    all_passed = all_passed and passed
+
+    status = "✓" if passed else "✗"
+    print(f"\n测试 {i}: {status}")
+    print(f"  输入: {input_text!r}")
+    print(f"  期望: {expected!r}")
+    print(f"  结果: {result!r}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# 'drop' 策略：从未闭合的左括号开始全部移除
+counter.UNCLOSED_BRACKET_POLICY = 'drop'
+result = counter.remove_brackets("内容(未闭合（内部）内容")
+passed = (result == "内容")
+all_passed = all_passed and passed
+print(f"\n未闭合括号 'drop' 策略: {'✓' if passed else '✗'} {result!r}")
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败！")
+print("=" * 70)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试 JSON/CSV/Excel 统计报表"""
+
+import csv
+import io
+import json
+import zipfile
+from xml.etree import ElementTree
+
+from report import document_record, open_report
+from video_script_counter import DocumentStats, VideoScriptCounter
+
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+
+paragraphs = [
+    "第一部分：引入",
+    "大家好！（播放开场动画）",
+    "第二部分：知识点讲解",
+    "首先，我们来看看什么是加法。",
+]
+results = [
+    {'file': 'a.docx', 'output': None, 'stats': DocumentStats('a.docx', counter.analyze(paragraphs)),
+     'error': None},
+    {'file': 'b.docx', 'output': None, 'stats': None, 'error': 'ValueError: 仅支持 .docx 格式文件'},
+]
+records = [document_record(result, VideoScriptCounter.format_time) for result in results]
+
+print("=" * 70)
+print("测试统计报表")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# JSON：逐个写出后应为合法的数组
+stream = io.StringIO()
+writer = open_report('json', stream)
+for record in records:
+    writer.write(record)
+writer.close()
+data = json.loads(stream.getvalue())
+check("JSON 报表", data == records
+      and [s['char_count'] for s in data[0]['sections']] == [4, 14]
+      and data[0]['total_chars'] == 18 and data[1]['error'] is not None)
+
+stream = io.StringIO()
+writer = open_report('json', stream)
+writer.close()
+check("空 JSON 报表", json.loads(stream.getvalue()) == [])
+
+# CSV：每个部分一行，出错的文档一行（英文列名，默认没有合计行）
+section_names = VideoScriptCounter.rules.section_names
+
+def write_csv(layout, **kwargs):
+    stream = io.StringIO(newline='')
+    writer = open_report('csv', stream, layout, section_names,
+                         VideoScriptCounter.SPEECH_RATE, VideoScriptCounter.format_time, **kwargs)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return stream.getvalue()
+
+rows = list(csv.DictReader(io.StringIO(write_csv('section'), newline='')))
+check("CSV 报表", [(r['file'], r['section'], r['char_count'], r['time_range']) for r in rows] == [
+    ('a.docx', '引入', '4', '00:00-00:01'),
+    ('a.docx', '知识点讲解', '14', '00:01-00:05'),
+    ('b.docx', '', '', ''),
+] and rows[2]['error'].startswith('ValueError'))
+
+# 需要时追加合计行
+rows = list(csv.reader(io.StringIO(write_csv('section', totals=True), newline='')))
+check("CSV 合计行", rows[0][:3] == ['file', 'section', 'char_count']
+      and rows[-1][:4] == ['合计（2 个文件）', '', '18', '5'] and rows[-1][7] == '1 个文件失败')
+
+# 每个文档一行：各部分的字数、时长和时间轴各占一列
+rows = list(csv.reader(io.StringIO(write_csv('document'), newline='')))
+check("CSV 报表（每个文档一行）", len(rows) == 3 and len(rows[0]) == 6 + 3 * len(section_names)
+      and rows[0][:8] == ['file', 'total_chars', 'total_duration', 'total_time', 'speech_rate',
+                          '引入.char_count', '引入.duration', '引入.time_range']
+      and rows[1][:11] == ['a.docx', '18', '5', '00:05', '220',
+                           '4', '1', '00:00-00:01', '14', '4', '00:01-00:05']
+      and rows[1][11:-1] == [''] * 6
+      and rows[2][0] == 'b.docx' and rows[2][-1].startswith('ValueError'))
+
+# Excel：合法的 .xlsx 压缩包，工作表逐行写出（中文列名，最后一行为合计）
+buffer = io.BytesIO()
+writer = open_report('xlsx', buffer, 'document', section_names,
+                     VideoScriptCounter.SPEECH_RATE, VideoScriptCounter.format_time)
+for record in records:
+    writer.write(record)
+writer.close()
+with zipfile.ZipFile(buffer) as archive:
+    sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+    ElementTree.fromstring(archive.read('xl/workbook.xml'))
+ns = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+cells = {cell.get('r'): cell for cell in sheet.iter(f'{ns}c')}
+check("Excel 报表", len(sheet.findall(f'{ns}sheetData/{ns}row')) == 4
+      and cells['A1'].find(f'{ns}is/{ns}t').text == '文件'
+      and cells['A2'].find(f'{ns}is/{ns}t').text == 'a.docx'
+      and cells['B2'].find(f'{ns}v').text == '18'
+      and cells['A4'].find(f'{ns}is/{ns}t').text == '合计（2 个文件）')
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试结果缓存的淘汰和 I/O 错误处理"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+from docx import Document
+
+from result_cache import ResultCache
+from video_script_counter import VideoScriptCounter
+
+print("=" * 70)
+print("测试结果缓存")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    cache = ResultCache(tmp, max_entries=3)
+    for i in range(5):
+        ResultCache(tmp, max_entries=3).put(f'k{i}', {'sections': i})
+    # 第一次写入时淘汰过，之后的新对象不会每次写入都扫描目录
+    check("淘汰检查不随对象重复", len(cache._entries()) == 5
+          and cache.get('k4') == {'sections': 4})
+    os.utime(os.path.join(tmp, ResultCache.EVICT_MARKER), (0, 0))
+    cache.put('k5', {'sections': 5})
+    check("超过间隔后淘汰", len(cache._entries()) == 3 and cache.get('k5') is not None)
+
+    # 缓存目录不可用时按没有缓存处理
+    broken = ResultCache(os.path.join('/dev/null', 'cache'))
+    check("缓存目录不可用", broken.put('k', {'sections': []}) is False
+          and broken.get('k') is None and broken.evict() == 0)
+
+    docx = os.path.join(tmp, '测试视频脚本.docx')
+    doc = Document()
+    for text in ["第一部分：引入", "大家好！（播放开场动画）"]:
+        doc.add_paragraph(text)
+    doc.save(docx)
+    run = subprocess.run([sys.executable, 'video_script_counter.py', docx,
+                          '--cache-dir', os.path.join('/dev/null', 'cache')],
+                         cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True)
+    check("缓存不可用时照常输出", run.returncode == 0
+          and os.path.exists(os.path.join(tmp, '测试视频脚本_带标注.docx')))
+
+    # 只修改了样式等正文以外的部分：使用缓存的统计，但重新写入带标注的文档
+    cache = ResultCache(os.path.join(tmp, 'cache'))
+    output = os.path.join(tmp, '测试视频脚本_带标注.docx')
+    for _ in range(2):
+        VideoScriptCounter(docx, verbose=False, cache=cache).process_document()
+    mtime = os.stat(output).st_mtime_ns
+    with zipfile.ZipFile(docx) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    parts['word/styles.xml'] += b'<!-- changed -->'
+    with zipfile.ZipFile(docx, 'w') as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+    VideoScriptCounter(docx, verbose=False, cache=cache).process_document()
+    with zipfile.ZipFile(output) as archive:
+        styles = archive.read('word/styles.xml')
+    check("正文以外的部分修改后重新写入", os.stat(output).st_mtime_ns != mtime
+          and styles == parts['word/styles.xml'])
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试自定义部分方案和关键词预筛选"""
+
+import json
+import os
+import tempfile
+
+from video_script_counter import RuleRegistry, VideoScriptCounter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+print("=" * 70)
+print("测试自定义部分方案")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# 内置的默认方案文件与内置规则一致
+default = RuleRegistry.load(os.path.join(HERE, 'schemas', 'default.json'))
+check("默认方案与内置规则一致", default.describe() == VideoScriptCounter.rules.describe())
+
+# 预筛选只是必要条件：结果必须与对每个部分直接运行标题正则相同
+rules = VideoScriptCounter.rules
+samples = [
+    "第一部分：引入", "课程引入", "引入", "第二部分：知识点讲解", "知识点1：加法",
+    "第三部分：综合练习", "练习题1", "第四部分：总结", "课程总结与结语", "结语",
+    "大家好！（播放开场动画）", "今天我们来学习加法。", "", "第五部分：附录",
+]
+direct = [[rules.match_section(i, text) is not None for i in range(len(rules.section_names))]
+          for text in samples]
+check("预筛选后的匹配结果不变", [rules.match_sections(text) for text in samples] == direct)
+check("正文段落不运行标题正则", rules.candidate_sections("今天我们来学习加法。") == frozenset())
+check("关键词重叠时不漏掉部分", rules.candidate_sections("课程总结与结语") == {3})
+
+# 三部分的方案
+three = RuleRegistry.load(os.path.join(HERE, 'schemas', 'three_part.json'))
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+counter.rules = three
+sections = counter.analyze([
+    "第一部分：引入",
+    "大家好！",
+    "第二部分：讲解",
+    "首先，我们来看看什么是加法。",
+    "第三部分：总结",
+    "今天就到这里。",
+])
+check("三部分方案", [s['name'] for s in sections] == ['引入', '讲解', '总结']
+      and [s['char_count'] for s in sections] == [4, 14, 7])
+
+# 六部分的方案
+six = RuleRegistry.load(os.path.join(HERE, 'schemas', 'six_part.json'))
+counter.rules = six
+texts = []
+for number, name in zip("一二三四五六", six.section_names):
+    texts += [f"第{number}部分：{name}", "大家好！"]
+texts[-4:-2] = ["第五部分：课堂练习", "练习题1", "一加一等于几？"]
+sections = counter.analyze(texts)
+check("六部分方案", [s['name'] for s in sections] == six.section_names
+      and [s['char_count'] for s in sections] == [4, 4, 4, 4, 7, 4]
+      and [len(s['subsections']) for s in sections] == [0, 0, 0, 0, 1, 0])
+
+# 显式指定关键词，以及无法提取关键词的模式（每段都运行正则）
+rules = RuleRegistry.from_schema({'sections': [
+    {'name': '开场', 'patterns': ['^开场白?$'], 'keywords': ['开场']},
+    {'name': '编号', 'patterns': [r'^\d+$']},
+]})
+check("显式关键词与无关键词的部分", rules.match_sections("开场白") == [True, False]
+      and rules.match_sections("3") == [False, True]
+      and rules.candidate_sections("今天") == {1})
+
+# 格式错误的方案
+errors = 0
+for schema in ({}, {'sections': []}, {'sections': [{'name': '引入'}]},
+               {'sections': [{'name': '引入', 'patterns': ['(']}]},
+               {'sections': [{'name': '引入', 'patterns': ['引入'], 'keywords': ['']}]},
+               {'sections': [{'name': '引入', 'patterns': ['引入']}], 'subtitle_patterns': ['([']},
+               {'sections': [{'name': '引入', 'patterns': ['引入']}], 'subtitle_patterns': '^知识点'},
+               {'sections': [{'name': '引入', 'patterns': ['引入']}],
+                'annotation_patterns': ['（约', 3]}):
+    try:
+        RuleRegistry.from_schema(schema)
+    except ValueError:
+        errors += 1
+with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+    f.write('{"sections": ')
+try:
+    RuleRegistry.load(f.name)
+except ValueError:
+    errors += 1
+finally:
+    os.unlink(f.name)
+check("格式错误的方案报错", errors == 9)
+
+# 空的子标题模式列表表示没有子标题
+flat = RuleRegistry.from_schema({'sections': [{'name': '引入', 'patterns': ['^引入$']}],
+                                 'subtitle_patterns': []})
+check("空的子标题模式列表", not flat.is_subtitle("知识点1") and not flat.is_subtitle("大家好"))
+
+# 副本保留关键词，追加模式时补上新模式的关键词
+copy = rules.copy()
+copy.add_section_pattern(0, '^欢迎$')
+check("副本与追加模式", copy.match_sections("欢迎") == [True, False]
+      and rules.match_sections("欢迎") == [False, False]
+      and json.dumps(copy.describe(), ensure_ascii=False).count('欢迎') == 2)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
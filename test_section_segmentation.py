@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试单次遍历的部分切分功能"""
+
+from video_script_counter import VideoScriptCounter
+
+counter = VideoScriptCounter.__new__(VideoScriptCounter)
+
+paragraphs = [
+    "第一部分：引入(00:00 - 00:30)",          # 0 标题（带旧标注）
+    "大家好！（播放开场动画）",                 # 1
+    "第二部分：知识点讲解（约500字，00:30 - 05:00）",  # 2 标题
+    "知识点1：加法的基本概念",                  # 3 同时匹配"知识点"，作为标题行
+    "首先，我们来看看什么是加法。",              # 4
+    "第三部分：综合练习",                      # 5 标题
+    "练习题1",                               # 6 同时匹配"练习"，作为标题行
+    "院子里有3只小猫。",                       # 7
+    "第四部分：总结",                          # 8 标题
+    "今天我们学习了加法。",                     # 9
+]
+
+# (标题段落索引, 开始, 结束, 正文)
+expected = [
+    (0, 0, 2, "大家好！（播放开场动画）\n"),
+    (3, 2, 5, "首先，我们来看看什么是加法。\n"),
+    (6, 5, 8, "院子里有3只小猫。\n"),
+    (8, 8, 10, "今天我们学习了加法。\n"),
+]
+
+print("=" * 70)
+print("测试单次遍历的部分切分")
+print("=" * 70)
+
+sections = counter.segment_sections(paragraphs)
+
+all_passed = True
+for i, (section, expect) in enumerate(zip(sections, expected), 1):
+    result = (section['para_index'], section['start'], section['end'], section['text'])
+    passed = (result == expect)
+    all_passed = all_passed and passed
+
+    status = "✓" if passed else "✗"
+    print(f"\n第{i}部分: {status}")
+    print(f"  期望: {expect}")
+    print(f"  结果: {result}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+# 缺少的部分应返回 None
+missing = counter.segment_sections(["第一部分：引入", "内容"])[1]
+passed = missing['para_index'] is None and missing['text'] == ''
+all_passed = all_passed and passed
+print(f"\n缺少的部分: {'✓' if passed else '✗'}")
+
+# 子标题把部分的正文分为开场和各子部分
+section = counter.segment_sections([
+    "第二部分：知识点讲解",
+    "今天学习加法。",
+    "知识点1：加法的概念（约5字，00:00-00:01）",
+    "加法就是合在一起。",
+    "例题 2",
+    "2 + 3 = 5（板书）",
+])[1]
+result = (section['intro_text'],
+          [(sub['para_index'], sub['title'], sub['text']) for sub in section['subsections']])
+expect = ("今天学习加法。\n", [
+    (2, "知识点1：加法的概念", "加法就是合在一起。\n"),
+    (4, "例题 2", "2 + 3 = 5（板书）\n"),
+])
+passed = (result == expect)
+all_passed = all_passed and passed
+print(f"\n子部分: {'✓' if passed else '✗'}")
+if not passed:
+    print(f"  期望: {expect}")
+    print(f"  结果: {result}")
+
+# 子部分的时间轴在部分的时间范围内首尾相接
+info = counter.analyze(["第一部分：引入", "一" * 110, "例题1", "二" * 220, "例题2", "三" * 330])[0]
+result = [(sub['char_count'], sub['time_range']) for sub in info['subsections']]
+expect = [(220, "00:30-01:30"), (330, "01:30-03:00")]
+passed = (result == expect and info['time_range'] == "00:00-03:00")
+all_passed = all_passed and passed
+print(f"\n子部分时间轴: {'✓' if passed else '✗'}")
+if not passed:
+    print(f"  期望: {expect}")
+    print(f"  结果: {result}")
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败！")
+print("=" * 70)
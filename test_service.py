@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试 HTTP 标注服务"""
+
+import http.client
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+from docx import Document
+
+from service import AnnotationServer, AnnotationService
+from video_script_counter import VideoScriptCounter
+
+doc = Document()
+for text in ("第一部分：引入", "大家好！（播放开场动画）",
+             "第二部分：知识点讲解", "首先，我们来看看什么是加法。"):
+    doc.add_paragraph(text)
+buffer = io.BytesIO()
+doc.save(buffer)
+data = buffer.getvalue()
+
+service = AnnotationService(workers=1, queue_size=1, timeout=30)
+server = AnnotationServer(('127.0.0.1', 0), service, max_upload=1 << 20)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+port = server.server_address[1]
+
+def request(method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    result = response.status, dict(response.getheaders()), response.read()
+    connection.close()
+    return result
+
+print("=" * 70)
+print("测试 HTTP 标注服务")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+try:
+    status, _, body = request('POST', '/stats?filename=a.docx', data)
+    record = json.loads(body)
+    check("统计", status == 200 and record['file'] == 'a.docx' and record['total_chars'] == 18
+          and [s['char_count'] for s in record['sections']] == [4, 14])
+
+    # 与在本进程中处理内存中的文档结果相同
+    expected = io.BytesIO()
+    VideoScriptCounter(io.BytesIO(data), verbose=False, output_file=expected).process_document()
+    status, headers, body = request('POST', '/annotate', data)
+    check("生成带标注的文档", status == 200 and body == expected.getvalue()
+          and headers['X-Total-Chars'] == '18')
+
+    status, _, body = request('POST', '/stats', b'not a docx')
+    check("不是 .docx 时返回 400", status == 400 and 'error' in json.loads(body))
+    status, _, _ = request('POST', '/stats', b'PK' + b'\0' * 100)
+    check("损坏的 .docx 返回 400", status == 400)
+    # 只发送请求头：服务不读取请求体就回复 413
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(b'POST /stats HTTP/1.1\r\nHost: localhost\r\n'
+                     b'Content-Length: %d\r\n\r\n' % (2 << 20))
+        status_line = sock.makefile('rb').readline()
+    check("超过大小上限时返回 413", status_line.split()[1] == b'413')
+    status, _, _ = request('POST', '/unknown', data)
+    check("未知路径返回 404", status == 404)
+
+    # 名额用完时立即拒绝
+    for _ in range(service.capacity):
+        service._slots.acquire()
+    status, headers, _ = request('POST', '/stats', data)
+    for _ in range(service.capacity):
+        service._slots.release()
+    check("繁忙时返回 503", status == 503 and headers.get('Retry-After') == '1')
+
+    service.timeout = 1e-6
+    status, _, _ = request('POST', '/annotate', data)
+    service.timeout = 30
+    check("超时返回 504", status == 504)
+
+    status, _, body = request('GET', '/health')
+    health = json.loads(body)
+    check("健康检查", status == 200 and health['workers'] == 1 and health['rejected'] == 1
+          and health['timed_out'] == 1 and health['completed'] >= 2)
+finally:
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+for args in (['-j', '0'], ['-j', '-2'], ['--queue', '-5']):
+    run = subprocess.run([sys.executable, 'service.py', *args, '--port', '0'],
+                         cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+                         text=True, timeout=60)
+    check(f"拒绝无效的参数 {' '.join(args)}", run.returncode == 2 and args[0] in run.stderr
+          and 'Traceback' not in run.stderr)
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试大文档的分块并行统计"""
+
+import random
+
+from duration_models import ClassCostModel
+from split_count import count_texts, plan_groups, split_text
+from video_script_counter import CountingEngine
+
+print("=" * 70)
+print("测试分块并行统计")
+print("=" * 70)
+
+all_passed = True
+
+def check(description, passed):
+    global all_passed
+    all_passed = all_passed and passed
+    print(f"\n{description}: {'✓' if passed else '✗'}")
+    if not passed:
+        print(f"  ❌ 失败！")
+
+
+def engine_with(policy='keep', model=None):
+    engine = CountingEngine(duration_model=model)
+    engine.UNCLOSED_BRACKET_POLICY = policy
+    return engine
+
+
+def same_as_serial(engine, texts, chunk_chars, jobs=1):
+    expected = [engine._count_text(text) for text in texts]
+    return count_texts(engine, texts, jobs, chunk_chars) == expected
+
+
+text = "第一段（注释\n第二段\n第三段）结束\n"
+check("在换行处切分", split_text(text, 4) == ["第一段（注释\n", "第二段\n", "第三段）结束\n"]
+      and split_text("", 4) == [""] and split_text("没有换行的长段落", 2) == ["没有换行的长段落"])
+
+# 跨块的括号：第一块的左括号被第三块的右括号闭合，三块一起重新统计
+engine = engine_with()
+groups, dropped_from, unclosed = plan_groups(engine, ["（", "", "）"])
+check("跨块的括号合为一组", groups == [(0, 3)] and dropped_from is None and not unclosed)
+check("跨块的括号与整段统计一致", same_as_serial(engine, [text], 4))
+
+# 到末尾都不闭合的左括号不影响后面的配对，不需要合并
+groups, _, unclosed = plan_groups(engine, ["（", "[]", "(", ")"])
+check("不闭合的左括号之后照常分组", groups == [(0, 1), (1, 2), (2, 4)] and unclosed)
+
+# 块首的右括号弹出了前一块中不同类型的左括号
+check("右括号弹出其他类型的左括号", same_as_serial(engine, ["（甲[乙\n）丙]丁\n"], 4))
+
+# 'drop' 时从最外层未闭合的左括号移除到末尾，后面的块只计停顿时长
+drop = engine_with('drop', ClassCostModel())
+texts = ["开头（没有闭合\n中间（停顿2秒）\nmore words\n", "（a\nb）c\n（d\n"]
+check("按 drop 处理未闭合的左括号", same_as_serial(drop, texts, 3)
+      and count_texts(drop, texts[:1], 1, 3)[0][0].pause_ms == 2000)
+
+# 随机文本与整段统计一致
+rng = random.Random(0)
+alphabet = list("ab c'（）()[]【】汉字，1") + ["停顿1秒", "pause", "\n", "\n"]
+passed = True
+for _ in range(500):
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 80))) for _ in range(3)]
+    for policy in ('keep', 'drop'):
+        passed = passed and same_as_serial(engine_with(policy, ClassCostModel()), texts,
+                                           rng.randint(1, 20))
+check("随机文本与整段统计一致", passed)
+
+# 完整的分析在进程池中运行，结果与逐段统计相同
+paragraphs = ["第一部分：引入", "大家好（展示", "图片）！"] * 200 + [
+    "第二部分：知识点讲解", "知识点1：加法", "（旁白：", "慢一点）一加一等于二。"] + [
+    "Let's count: one, two（停顿）."] * 300
+serial = CountingEngine(annotate_subsections=True).analyze(paragraphs)
+parallel = CountingEngine(annotate_subsections=True, split_jobs=2)
+parallel.SPLIT_CHUNK_CHARS = 500
+check("进程池中分块统计", parallel.analyze(paragraphs) == serial)
+check("配置指纹不受分块影响",
+      parallel.config_fingerprint() == CountingEngine(annotate_subsections=True).config_fingerprint())
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败")
+print("=" * 70)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""测试只替换主文档部件的 .docx 保存"""
+
+import io
+import zipfile
+
+from docx import Document
+
+from docx_io import write_patched
+
+
+print("=" * 70)
+print("测试只替换主文档部件的保存")
+print("=" * 70)
+
+doc = Document()
+doc.add_paragraph("第一部分：引入")
+doc.add_paragraph("大家好！")
+stream = io.BytesIO()
+doc.save(stream)
+source = stream.getvalue()
+
+# 修改标题后只替换 word/document.xml
+doc.paragraphs[0].text = "第一部分：引入（约3字，00:00-00:01）"
+output = io.BytesIO()
+write_patched(io.BytesIO(source), output, {'word/document.xml': doc.part.blob})
+result = output.getvalue()
+
+all_passed = True
+
+# 1. 修改后的文档可以正常打开，内容正确
+texts = [p.text for p in Document(io.BytesIO(result)).paragraphs]
+passed = texts == ["第一部分：引入（约3字，00:00-00:01）", "大家好！"]
+all_passed = all_passed and passed
+print(f"\n1. 输出文档内容正确: {'✓' if passed else '✗'} {texts}")
+
+# 2. 其他成员的解压内容不变
+with zipfile.ZipFile(io.BytesIO(source)) as before, zipfile.ZipFile(io.BytesIO(result)) as after:
+    passed = before.namelist() == after.namelist() and all(
+        before.read(name) == after.read(name)
+        for name in before.namelist() if name != 'word/document.xml'
+    )
+    all_passed = all_passed and passed
+    print(f"2. 其他成员内容不变: {'✓' if passed else '✗'}")
+
+    # 3. 其他成员的本地记录（文件头和压缩数据）逐字节复制
+    passed = all(
+        source[old.header_offset:old.header_offset + old.compress_size]
+        == result[new.header_offset:new.header_offset + new.compress_size]
+        for old, new in zip(before.infolist(), after.infolist())
+        if old.filename != 'word/document.xml'
+    )
+    all_passed = all_passed and passed
+    print(f"3. 其他成员的压缩数据逐字节复制: {'✓' if passed else '✗'}")
+
+# 4. 不替换任何成员时输出与原文件完全相同
+output = io.BytesIO()
+write_patched(io.BytesIO(source), output, {})
+passed = output.getvalue() == source
+all_passed = all_passed and passed
+print(f"4. 不替换时输出与原文件相同: {'✓' if passed else '✗'}")
+
+print("\n" + "=" * 70)
+if all_passed:
+    print("✅ 所有测试通过！")
+else:
+    print("❌ 部分测试失败！")
+print("=" * 70)
@@ -7,22 +7,707 @@ Video Script Counter
 
 功能：
 1. 读取Word文档（.docx）
-2. 识别四个固定部分：引入、知识点讲解、综合练习、总结
+2. 识别脚本的各个部分：默认为引入、知识点讲解、综合练习、总结，可用方案文件自定义
 3. 移除括号内容并统计字数
 4. 基于220字/分钟计算时间轴
 5. 在标题后添加字数和时间标注
 """
 
+import argparse
+import glob
+import io
+import json
+import os
 import re
 import sys
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
-from docx import Document
-from docx.shared import RGBColor
-from copy import deepcopy
 
+from docx_io import (FOOTER_REL, HEADER_REL, iter_block_paragraphs, iter_paragraphs,
+                     read_main_part, write_patched)
+from duration_models import load_model
+from profiling import NULL_TIMER, Profiler
+from report import REPORT_FORMATS, REPORT_LAYOUTS, document_record, open_report
+from result_cache import ResultCache
+
+
+def _is_stream(source):
+    """判断是文件对象（内存中的文档）而不是路径"""
+    return hasattr(source, 'read') or hasattr(source, 'write')
+
+
+def _open_source(source):
+    """
+    整理输入：文件内容（bytes）包装为文件对象
+
+    Returns:
+        (路径或二进制文件对象, 文档名称或 None)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source), None
+    if _is_stream(source):
+        name = getattr(source, 'name', None)
+        return source, name if isinstance(name, str) else None
+    return source, str(source)
+
+
+def load_docx(source):
+    """
+    用 python-docx 读取文档
+
+    python-docx（及 lxml）只在需要生成带标注的文档时才导入，
+    只统计的路径（流式读取、报表、缓存命中）不会加载它们。
+
+    Args:
+        source: 文件路径或可随机读取的二进制文件对象
+    """
+    from docx import Document
+    return Document(source if _is_stream(source) else str(source))
+
+
+def document_parts(doc, headers_footers=False):
+    """
+    按段落顺序列出包含段落的部件：页眉、主文档、页脚（与 docx_io.iter_paragraphs 一致）
+
+    Args:
+        doc: Document 对象
+        headers_footers: 是否包括页眉和页脚
+
+    Returns:
+        python-docx 部件列表
+    """
+    if not headers_footers:
+        return [doc.part]
+    related = {HEADER_REL: [], FOOTER_REL: []}
+    for rel in doc.part.rels.values():
+        found = related.get(rel.reltype)
+        if found is not None and not rel.is_external and rel.target_part not in found:
+            found.append(rel.target_part)
+    return related[HEADER_REL] + [doc.part] + related[FOOTER_REL]
+
+
+def document_paragraphs(doc, headers_footers=False):
+    """
+    按文档顺序列出全部段落
+
+    与 doc.paragraphs 不同，包括表格单元格、嵌套表格和文本框中的段落，
+    下标与流式读取（docx_io.iter_paragraphs）的段落序号一致。
+
+    Args:
+        doc: Document 对象
+        headers_footers: 是否包括页眉（排在正文之前）和页脚（排在正文之后）
+
+    Returns:
+        Paragraph 对象列表
+    """
+    from docx.text.paragraph import Paragraph
+
+    paragraphs = []
+    for part in document_parts(doc, headers_footers):
+        root = doc.element.body if part is doc.part else part.element
+        # 标注只读写段落文本，页眉页脚中的段落也以正文为父对象
+        paragraphs.extend(Paragraph(p, doc._body) for p in iter_block_paragraphs(root))
+    return paragraphs
+
+
+@lru_cache(maxsize=None)
+def _bracket_table(bracket_pairs):
+    """
+    根据括号对预先生成查找表
+
+    Args:
+        bracket_pairs: ((左括号, 右括号), ...) 元组
+
+    Returns:
+        (openers, closers, bracket_re, flat_re): 左/右括号到类型编号的映射、
+        匹配任意括号字符的正则，以及匹配不含其他括号的最内层括号对的正则
+    """
+    openers = {}
+    closers = {}
+    for kind, (open_br, close_br) in enumerate(bracket_pairs):
+        openers.setdefault(open_br, kind)
+        closers.setdefault(close_br, kind)
+
+    chars = ''.join(re.escape(c) for c in {**openers, **closers})
+    flat = '|'.join(
+        re.escape(open_br) + '[^' + chars + ']*' + re.escape(close_br)
+        for open_br, close_br in bracket_pairs
+    )
+    return openers, closers, re.compile('[' + chars + ']'), re.compile(flat)
+
+
+# 字数统计的单次扫描分词正则，每个分组对应一类字符：
+# \u4e00-\u9fff: CJK统一汉字
+# \u3000-\u303f: CJK符号和标点
+# \uff00-\uffef: 全角ASCII、全角标点（全角数字 \uff10-\uff19 单独分组）
+# 英文单词包括缩写词如Let's, don't等：字母 + 可选的撇号和字母
+# 空白字符不匹配，由 finditer 直接跳过
+_COUNT_TOKEN_RE = re.compile(
+    r'([\u4e00-\u9fff]+)'
+    r'|([\u3000-\u303f\uff00-\uff0f\uff1a-\uffef]+)'
+    r'|([\uff10-\uff19]+)'
+    r"|([a-zA-Z]+(?:'[a-zA-Z]+)?)"
+    r'|([^\D\uff10-\uff19]+)'
+    r'|([^\u4e00-\u9fff\u3000-\u303f\uff00-\uffefa-zA-Z\d\s]+)'
+)
+(_TOKEN_CJK, _TOKEN_PUNCT, _TOKEN_FULLWIDTH_DIGIT,
+ _TOKEN_WORD, _TOKEN_DIGIT, _TOKEN_OTHER) = range(1, 7)
+
+
+class CharBreakdown(namedtuple('CharBreakdown', 'cjk punct words digits other pause_ms',
+                               defaults=(0,))):
+    """
+    字符分类统计结果
+
+    - cjk: 汉字数
+    - punct: 中文标点、CJK符号及全角字符数
+    - words: 英文单词数
+    - digits: 数字个数
+    - other: 不计入字数的其他非空白字符（如英文标点）
+    - pause_ms: 停顿标记（如"（停顿3秒）"）的总时长，单位毫秒，不计入字数；
+      只在时长模型识别停顿标记时统计（见 duration_models）
+    """
+
+    __slots__ = ()
+
+    @property
+    def total(self):
+        """总字数 = 汉字 + 中文标点 + 英文单词 + 数字"""
+        return self.cjk + self.punct + self.words + self.digits
+
+
+_NO_CHARS = CharBreakdown(0, 0, 0, 0, 0)
+
+
+def _sum_breakdowns(breakdowns):
+    """逐项相加多个 CharBreakdown（整数相加，没有舍入误差）"""
+    return CharBreakdown(*map(sum, zip(*breakdowns, _NO_CHARS)))
+
+
+def _required_literals(pattern):
+    """
+    从正则中提取匹配时必须出现的字面量关键词
+
+    只看顶层的连续字面字符（分组会展开，重复、字符类等会打断连续段），
+    取最长的一段；顶层是多个备选（a|b）时每个备选各取一个。
+
+    解析依赖 re 的内部模块，其接口在不同 Python 版本中可能变化；
+    解析过程出现任何异常时都视为无法提取（该部分的模式对每段都运行，结果不变）。
+
+    Returns:
+        关键词列表（文本包含其中之一是匹配的必要条件）；
+        无法提取（某个备选没有字面量、或使用了忽略大小写等标志）时为 None
+    """
+    try:
+        return _extract_literals(pattern)
+    except Exception:
+        return None
+
+
+def _extract_literals(pattern):
+    """_required_literals 的实现（可能因 re 内部接口变化而抛出异常）"""
+    try:
+        from re import _constants as sre_constants, _parser as sre_parse
+    except ImportError:  # Python < 3.11
+        import sre_constants
+        import sre_parse
+
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+
+    def longest_run(items):
+        runs = ['']
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                runs[-1] += chr(av)
+            elif (op is sre_constants.SUBPATTERN and not av[1] and not av[2]
+                  and not any(o is sre_constants.BRANCH for o, _ in av[3])):
+                # 无标志、无备选的分组：内容照常必须出现
+                inner = longest_run(av[3])
+                runs.append(inner)
+                runs.append('')
+            elif op is sre_constants.AT:
+                continue
+            else:
+                runs.append('')
+        return max(runs, key=len)
+
+    if len(parsed) == 1 and parsed[0][0] is sre_constants.BRANCH:
+        branches = parsed[0][1][1]
+    else:
+        branches = [parsed]
+    keywords = [longest_run(branch) for branch in branches]
+    if not all(keywords):
+        return None
+    return keywords
+
+
+def _trie_pattern(words):
+    """
+    把关键词编成前缀树形式的正则（公共前缀只匹配一次，同一位置优先匹配最长的关键词）
+
+    例如 ['练习', '练习题', '总结'] -> '(?:总结|练习(?:题)?)'
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        optional = '' in node
+        branches = []
+        leaves = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if list(child) == ['']:
+                leaves.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + build(child))
+        if leaves:
+            branches.append(leaves[0] if len(leaves) == 1 else '[' + ''.join(leaves) + ']')
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+    return build(trie)
+
+
+class RuleRegistry:
+    """
+    预编译的识别规则：部分标题、子标题和旧标注
+
+    所有模式在创建时编译一次：
+    - 每个部分的备选模式合并为一个带命名分组的正则（s<部分>_<备选>）
+    - 所有部分的关键词（如"引入"、"练习"、"总结"）合并为一个前缀树正则，
+      一次扫描找出可能是标题的部分，只对这些部分运行标题正则
+    - 子标题模式合并为一个从行首匹配的正则
+    - 旧标注模式合并为一个替换正则
+
+    可以整体替换（counter.rules = RuleRegistry(...)、RuleRegistry.load(方案文件)），
+    也可以在副本上扩展（rules = counter.rules.copy(); rules.add_section_pattern(...)）。
+    """
+
+    def __init__(self, sections, subtitle_patterns, annotation_patterns):
+        """
+        初始化
+
+        Args:
+            sections: [(部分名称, [备选模式, ...]), ...]，按在文档中的顺序排列；
+                也可以是 (部分名称, [备选模式, ...], [关键词, ...])，
+                关键词省略时从模式中自动提取
+            subtitle_patterns: 子标题模式列表（从行首匹配）
+            annotation_patterns: 旧标注模式列表
+        """
+        self.section_names = []
+        self.section_patterns = []
+        self.section_keywords = []
+        for name, patterns, *keywords in sections:
+            self.section_names.append(name)
+            self.section_patterns.append(list(patterns))
+            self.section_keywords.append(list(keywords[0]) if keywords and keywords[0] else None)
+        self.subtitle_patterns = list(subtitle_patterns)
+        self.annotation_patterns = list(annotation_patterns)
+        self.compile()
+
+    @classmethod
+    def from_schema(cls, schema, base=None):
+        """
+        根据部分方案创建规则
+
+        方案格式（JSON）：
+            {
+              "sections": [
+                {"name": "引入", "patterns": ["第一部分[：:]\\s*引入", "^引入$"]},
+                {"name": "练习", "patterns": ["练习"], "keywords": ["练习"]}
+              ],
+              "subtitle_patterns": [...],
+              "annotation_patterns": [...]
+            }
+
+        keywords 可选：标题中一定会出现的字面量，省略时从模式中自动提取；
+        subtitle_patterns、annotation_patterns 可选，省略时沿用 base 的模式。
+
+        Args:
+            schema: 方案字典
+            base: 提供默认子标题和旧标注模式的 RuleRegistry（默认为内置规则）
+
+        Raises:
+            ValueError: 方案格式错误或模式无法编译
+        """
+        if base is None:
+            base = VideoScriptCounter.rules
+        sections = schema.get('sections') if isinstance(schema, dict) else None
+        if not isinstance(sections, list) or not sections:
+            raise ValueError("方案必须包含非空的 sections 列表")
+
+        parsed = []
+        for number, section in enumerate(sections, 1):
+            name = section.get('name') if isinstance(section, dict) else None
+            patterns = section.get('patterns') if isinstance(section, dict) else None
+            if not isinstance(name, str) or not name:
+                raise ValueError(f"第 {number} 个部分缺少名称（name）")
+            if (not isinstance(patterns, list) or not patterns
+                    or not all(isinstance(pattern, str) for pattern in patterns)):
+                raise ValueError(f"部分「{name}」缺少标题模式（patterns）")
+            keywords = section.get('keywords')
+            if keywords is not None and (not isinstance(keywords, list)
+                                         or not all(isinstance(k, str) and k for k in keywords)):
+                raise ValueError(f"部分「{name}」的 keywords 必须是非空字符串列表")
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"部分「{name}」的模式 {pattern!r} 无法编译: {e}") from None
+            parsed.append((name, patterns, keywords))
+
+        def pattern_list(key, default):
+            patterns = schema.get(key)
+            if patterns is None:
+                return list(default)
+            if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+                raise ValueError(f"{key} 必须是字符串列表")
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"{key} 中的模式 {pattern!r} 无法编译: {e}") from None
+            return patterns
+
+        return cls(
+            parsed,
+            pattern_list('subtitle_patterns', base.subtitle_patterns),
+            pattern_list('annotation_patterns', base.annotation_patterns),
+        )
+
+    @classmethod
+    def load(cls, path, base=None):
+        """
+        从 JSON 方案文件创建规则（格式见 from_schema）
+
+        Raises:
+            ValueError: 文件不是合法的 JSON 或方案格式错误
+        """
+        with open(path, encoding='utf-8') as f:
+            try:
+                schema = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"方案文件不是合法的 JSON: {e}") from None
+        return cls.from_schema(schema, base)
+
+    def compile(self):
+        """重新编译所有模式（直接修改模式列表后调用）"""
+        self._section_res = [
+            re.compile('|'.join(
+                f'(?P<s{i}_{j}>{pattern})' for j, pattern in enumerate(patterns)
+            ))
+            for i, patterns in enumerate(self.section_patterns)
+        ]
+        # 空的模式列表编译为不匹配任何文本的正则（空正则会匹配所有文本）
+        self._subtitle_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.subtitle_patterns) or '(?!)'
+        )
+        self._annotation_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.annotation_patterns) or '(?!)'
+        )
+        self._compile_keywords()
+
+    def _compile_keywords(self):
+        """
+        编译关键词预筛选
+
+        每个部分的关键词集合满足：文本能匹配该部分的标题模式，则一定包含其中某个关键词。
+        无法提取关键词的部分不参与预筛选，每段都运行其标题正则。
+        """
+        owners = {}
+        unfiltered = set()
+        for i, patterns in enumerate(self.section_patterns):
+            keywords = self.section_keywords[i]
+            if keywords is None:
+                keywords = []
+                for pattern in patterns:
+                    literals = _required_literals(pattern)
+                    if literals is None:
+                        keywords = None
+                        break
+                    keywords.extend(literals)
+            if not keywords:
+                unfiltered.add(i)
+                continue
+            for keyword in keywords:
+                owners.setdefault(keyword, set()).add(i)
+
+        # 前缀树正则在同一位置只报告最长的关键词，
+        # 因此每个关键词还要带上作为其前缀的其他关键词所属的部分
+        self._keyword_sections = {
+            keyword: frozenset(i for other, sections in owners.items()
+                               if keyword.startswith(other) for i in sections)
+            for keyword in owners
+        }
+        self._unfiltered = frozenset(unfiltered)
+        # 前瞻分组：每个位置都尝试匹配，关键词相互重叠时也不会漏掉
+        self._keyword_re = (re.compile(f'(?=({_trie_pattern(owners)}))')
+                            if owners else None)
+
+    def copy(self):
+        """返回一份可以独立修改的副本"""
+        return RuleRegistry(
+            zip(self.section_names, self.section_patterns, self.section_keywords),
+            self.subtitle_patterns,
+            self.annotation_patterns,
+        )
+
+    def add_section(self, name, patterns, keywords=None):
+        """在末尾追加一个部分（keywords 省略时从模式中自动提取）"""
+        self.section_names.append(name)
+        self.section_patterns.append(list(patterns))
+        self.section_keywords.append(list(keywords) if keywords else None)
+        self.compile()
+
+    def add_section_pattern(self, section_index, pattern):
+        """为指定部分追加一个备选标题模式"""
+        self.section_patterns[section_index].append(pattern)
+        keywords = self.section_keywords[section_index]
+        if keywords is not None:
+            # 指定过关键词时补上新模式的关键词；提取不到时该部分不再预筛选
+            literals = _required_literals(pattern)
+            self.section_keywords[section_index] = None if literals is None else keywords + literals
+        self.compile()
+
+    def add_subtitle_pattern(self, pattern):
+        """追加一个子标题模式"""
+        self.subtitle_patterns.append(pattern)
+        self.compile()
+
+    def add_annotation_pattern(self, pattern):
+        """追加一个旧标注模式"""
+        self.annotation_patterns.append(pattern)
+        self.compile()
+
+    def describe(self):
+        """返回所有模式的可序列化描述（用于计算缓存指纹）"""
+        return {
+            'sections': [
+                [name, patterns] + ([keywords] if keywords is not None else [])
+                for name, patterns, keywords in zip(
+                    self.section_names, self.section_patterns, self.section_keywords)
+            ],
+            'subtitles': self.subtitle_patterns,
+            'annotations': self.annotation_patterns,
+        }
+
+    def match_section(self, section_index, text):
+        """
+        判断文本是否是指定部分的标题
+
+        Returns:
+            匹配对象（lastgroup 为命中的备选模式，如 's0_1'），未匹配时为 None
+        """
+        return self._section_res[section_index].search(text)
+
+    def candidate_sections(self, text):
+        """
+        关键词预筛选：一次扫描找出文本可能匹配的部分
+
+        Returns:
+            部分序号的集合；不在其中的部分一定不匹配
+        """
+        candidates = self._unfiltered
+        if self._keyword_re is not None:
+            for keyword in self._keyword_re.findall(text):
+                candidates = candidates | self._keyword_sections[keyword]
+        return candidates
+
+    def match_sections(self, text):
+        """
+        判断文本是哪些部分的标题（只对预筛选出的部分运行标题正则）
 
-class VideoScriptCounter:
-    """视频脚本字数统计与时间预估工具"""
+        Returns:
+            与部分一一对应的布尔值列表
+        """
+        candidates = self.candidate_sections(text)
+        if not candidates:
+            return [False] * len(self._section_res)
+        return [i in candidates and section_re.search(text) is not None
+                for i, section_re in enumerate(self._section_res)]
+
+    def is_subtitle(self, text):
+        """判断去除首尾空白后的文本是否是子标题"""
+        return self._subtitle_re.match(text.strip()) is not None
+
+    def strip_annotations(self, text):
+        """一次替换删除所有旧标注，并去除首尾空白"""
+        return self._annotation_re.sub('', text).strip()
+
+
+class _Stats:
+    """
+    __slots__ 统计结果的公共方法：按字段比较和显示
+
+    也可以像原来的统计信息字典一样按字段名读取（如 info['char_count']、info.get('subsections')），
+    已有的调用方不需要修改。
+    """
+
+    __slots__ = ()
+
+    # 可按字段名读取的字段（除 __slots__ 外还有 time_range 等计算出的字段）
+    _KEYS = ()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._KEYS else default
+
+    def __repr__(self):
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class _TimedStats(_Stats):
+    """带时间轴的统计结果（时间单位为秒）"""
+
+    __slots__ = ()
+
+    @property
+    def time_range(self):
+        """时间轴文本，如 "00:22-01:13\""""
+        format_time = CountingEngine.format_time
+        return f"{format_time(self.start_time)}-{format_time(self.end_time)}"
+
+
+class SubsectionStats(_TimedStats):
+    """子部分（子标题及其后的正文）的统计结果"""
+
+    __slots__ = ('title', 'para_index', 'char_count', 'duration', 'start_time', 'end_time')
+    _KEYS = frozenset(__slots__) | {'time_range'}
+
+    def __init__(self, title, para_index, char_count, duration=0, start_time=0, end_time=0):
+        self.title = title
+        self.para_index = para_index
+        self.char_count = char_count
+        self.duration = duration
+        self.start_time = start_time
+        self.end_time = end_time
+
+    @classmethod
+    def from_dict(cls, info):
+        """由 sections_info 中的子部分字典创建"""
+        return cls(info['title'], info['para_index'], info['char_count'],
+                   info['duration'], info['start_time'], info['end_time'])
+
+    def as_dict(self):
+        """转换为 sections_info 中的子部分字典"""
+        return {
+            'title': self.title,
+            'para_index': self.para_index,
+            'char_count': self.char_count,
+            'duration': self.duration,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'time_range': self.time_range,
+        }
+
+
+class SectionStats(_TimedStats):
+    """单个部分的统计结果"""
+
+    __slots__ = ('index', 'name', 'para_index', 'char_count', 'duration',
+                 'start_time', 'end_time', 'subsections')
+    _KEYS = frozenset(__slots__) | {'time_range'}
+
+    def __init__(self, index, name, para_index, char_count, duration=0, start_time=0, end_time=0,
+                 subsections=()):
+        self.index = index
+        self.name = name
+        self.para_index = para_index
+        self.char_count = char_count
+        self.duration = duration
+        self.start_time = start_time
+        self.end_time = end_time
+        self.subsections = tuple(subsections)
+
+    @classmethod
+    def from_dict(cls, info):
+        """由 sections_info 中的部分字典创建"""
+        return cls(info['index'], info['name'], info['para_index'], info['char_count'],
+                   info['duration'], info['start_time'], info['end_time'],
+                   [SubsectionStats.from_dict(sub) for sub in info.get('subsections', ())])
+
+    def as_dict(self):
+        """转换为 sections_info 中的部分字典"""
+        return {
+            'index': self.index,
+            'name': self.name,
+            'para_index': self.para_index,
+            'char_count': self.char_count,
+            'subsections': [sub.as_dict() for sub in self.subsections],
+            'duration': self.duration,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'time_range': self.time_range,
+        }
+
+
+class DocumentStats(_Stats):
+    """
+    单个文档的统计结果
+
+    - file: 文档名称（来自路径或文件对象的 name，可能为 None）
+    - sections: 找到的各部分的 SectionStats 元组
+    """
+
+    __slots__ = ('file', 'sections')
+
+    def __init__(self, file, sections):
+        self.file = file
+        self.sections = tuple(sections)
+
+    @classmethod
+    def from_sections_info(cls, sections_info, file=None):
+        """由 sections_info（各部分的统计信息字典列表）创建"""
+        return cls(file, [SectionStats.from_dict(info) for info in sections_info])
+
+    @property
+    def total_chars(self):
+        return sum(section.char_count for section in self.sections)
+
+    @property
+    def total_duration(self):
+        return sum(section.duration for section in self.sections)
+
+    def sections_info(self):
+        """转换为 sections_info（缓存、报表等使用的字典列表）"""
+        return [section.as_dict() for section in self.sections]
+
+    def as_record(self):
+        """转换为报表记录（与 --report json 中的单个文档相同）"""
+        return document_record({'file': self.file, 'output': None, 'stats': self, 'error': None},
+                               CountingEngine.format_time)
+
+
+class CountingEngine:
+    """
+    无状态的统计引擎
+
+    持有统计配置（识别规则、语速、括号类型等）和算法，不绑定任何文件：
+    输入和输出在每次调用时提供，调用之间不保存状态，
+    创建一次即可在多个线程或工作进程中共用。
+
+    用法：
+        engine = CountingEngine()
+        stats = engine.count('脚本.docx')                   # DocumentStats
+        stats = engine.process(data, '脚本_带标注.docx')    # 统计并写入标注
+    """
 
     # 配置参数
     SPEECH_RATE = 220  # 儿童教学语速：220字/分钟
@@ -39,7 +724,16 @@ class VideoScriptCounter:
         ('｛', '｝'),
     ]
 
-    # 四个固定部分的识别模式 - 每个部分可以有多个备选模式
+    # 未闭合左括号的处理方式：
+    # 'keep' - 左括号按普通文字保留，其后的内容照常统计（与手工统计一致）
+    # 'drop' - 从最外层未闭合的左括号开始，移除到文本末尾
+    UNCLOSED_BRACKET_POLICY = 'keep'
+
+    # 栈扫描前用正则预先删除的最内层括号层数
+    FLAT_BRACKET_PASSES = 3
+
+    # 默认四个部分的识别模式 - 每个部分可以有多个备选模式
+    # 其他结构的脚本可以用方案文件（--schema，见 RuleRegistry.from_schema）替换
     SECTION_PATTERNS = [
         # 第一部分：引入
         [
@@ -69,23 +763,123 @@ class VideoScriptCounter:
         ],
     ]
 
-    def __init__(self, input_file):
-        """初始化"""
-        self.input_file = Path(input_file)
-        if not self.input_file.exists():
-            raise FileNotFoundError(f"文件不存在: {input_file}")
+    # 四个部分的名称，与 SECTION_PATTERNS 一一对应
+    SECTION_NAMES = ['引入', '知识点讲解', '综合练习', '总结']
+
+    # 子标题模式：匹配"知识点1"、"知识点2"、"练习题1"等格式
+    SUBTITLE_PATTERNS = [
+        r'^知识点\s*\d+',
+        r'^练习题?\s*\d+',
+        r'^例题\s*\d+',
+        r'^第[一二三四五六七八九十\d]+题',
+        # 移除了 r'^题目\s*\d+' - "题目1"、"题目2"等应该被统计，不是子标题
+    ]
+
+    # 旧标注模式（包括旧格式和新格式），工具会全部删除后添加最新计算的标注
+    ANNOTATION_PATTERNS = [
+        # 匹配包含字数和时间的标注（新旧格式都删除）
+        r'[（(]\s*约?\s*\d+\s*字\s*[,，]\s*\d{1,2}:\d{2}\s*[-\-~～]\s*\d{1,2}:\d{2}\s*[）)]',
+        # 匹配只有时间范围的标注
+        r'[（(]\s*\d{1,2}:\d{2}\s*[-\-~～]\s*\d{1,2}:\d{2}\s*[）)]',
+        # 匹配只有字数的标注
+        r'[（(]\s*约?\s*\d+\s*字\s*[）)]',
+    ]
+
+    # 预编译的识别规则，导入时编译一次；可替换或扩展（见 RuleRegistry）
+    rules = RuleRegistry(
+        zip(SECTION_NAMES, SECTION_PATTERNS),
+        SUBTITLE_PATTERNS,
+        ANNOTATION_PATTERNS,
+    )
+
+    # 是否同时在子标题行（如"知识点1"）后添加子部分的字数和时间标注
+    ANNOTATE_SUBSECTIONS = False
+
+    # 是否统计页眉和页脚中的文字（页眉排在正文之前，页脚排在正文之后）
+    INCLUDE_HEADERS_FOOTERS = False
 
-        if self.input_file.suffix.lower() != '.docx':
-            raise ValueError("仅支持 .docx 格式文件")
+    # 口播时长模型（duration_models.DurationModel；None 表示按 SPEECH_RATE 匀速换算）
+    duration_model = None
 
-        # 生成输出文件名
-        output_name = self.input_file.stem + '_带标注.docx'
-        self.output_file = self.input_file.parent / output_name
+    # 大文档分块并行统计的工作进程数（None 表示在当前进程中统计，见 split_count）
+    SPLIT_JOBS = None
+
+    # 分块并行统计时每块的字符数；文本总长不超过该值时不分块
+    SPLIT_CHUNK_CHARS = 100_000
+
+    # 统计结果格式版本：修改统计或标注逻辑后递增，使已有缓存失效
+    CACHE_VERSION = 3
+
+    # 分阶段计时（profiling.Profiler 对象，None 表示不计时）
+    profiler = None
+
+    def __init__(self, rules=None, speech_rate=None, annotate_subsections=None,
+                 headers_footers=None, duration_model=None, split_jobs=None, profiler=None):
+        """
+        初始化（省略的参数使用类属性中的默认配置）
+
+        Args:
+            rules: RuleRegistry 对象（如 RuleRegistry.load(方案文件)）
+            speech_rate: 语速（字/分钟）
+            annotate_subsections: 是否同时标注子部分
+            headers_footers: 是否统计页眉和页脚
+            duration_model: 时长模型（见 duration_models），或传给 load_model 的模型名称、模型文件；
+                按名称创建的 speech_rate 模型使用本引擎的语速
+            split_jobs: 大文档分块并行统计的工作进程数（见 split_count）
+            profiler: profiling.Profiler 对象（可选；计时的引擎不要在线程之间共用）
+        """
+        if rules is not None:
+            self.rules = rules
+        if speech_rate is not None:
+            self.SPEECH_RATE = speech_rate
+        if annotate_subsections is not None:
+            self.ANNOTATE_SUBSECTIONS = annotate_subsections
+        if headers_footers is not None:
+            self.INCLUDE_HEADERS_FOOTERS = headers_footers
+        if isinstance(duration_model, str):
+            duration_model = load_model(duration_model, self.SPEECH_RATE)
+        if duration_model is not None:
+            self.duration_model = duration_model
+        if split_jobs is not None:
+            self.SPLIT_JOBS = split_jobs
+        self.profiler = profiler
+
+    def config(self):
+        """
+        当前的统计配置，作为构造参数可创建配置相同的对象（不含 profiler）
+
+        用法：
+            counter = VideoScriptCounter('脚本.docx', engine=engine)
+        """
+        return {
+            'rules': self.rules,
+            'speech_rate': self.SPEECH_RATE,
+            'annotate_subsections': self.ANNOTATE_SUBSECTIONS,
+            'headers_footers': self.INCLUDE_HEADERS_FOOTERS,
+            'duration_model': self.duration_model,
+            'split_jobs': self.SPLIT_JOBS,
+        }
+
+    def stage(self, name):
+        """
+        进入一个处理阶段（见 profiling.Profiler.stage）
+
+        未设置 profiler 时返回空操作的计时器。
+        """
+        if self.profiler is None:
+            return NULL_TIMER
+        return self.profiler.stage(name)
 
     def remove_brackets(self, text):
         """
         移除文本中所有括号及括号内的内容
-        支持嵌套括号
+        支持嵌套括号（包括不同类型括号的混合嵌套，如"（展示[图片]）"）
+
+        单次扫描，用栈记录所有类型括号的嵌套状态，时间复杂度 O(n)：
+        - 右括号与栈中最近的同类型左括号配对，两者之间的内容全部移除
+          （其间未闭合的其他类型左括号一并移除）
+        - 没有可配对左括号的右括号按普通文字保留
+        - 未闭合的左括号按 UNCLOSED_BRACKET_POLICY 处理
 
         Args:
             text: 输入文本
@@ -93,26 +887,73 @@ class VideoScriptCounter:
         Returns:
             移除括号后的文本
         """
-        result = text
+        return self._scan_brackets(text)[0]
 
-        # 对每种括号类型进行处理
-        for open_br, close_br in self.BRACKET_PAIRS:
-            # 使用栈来处理嵌套括号
-            while True:
-                # 转义特殊字符
-                open_escaped = re.escape(open_br)
-                close_escaped = re.escape(close_br)
+    def _scan_brackets(self, text, trace=None):
+        """
+        移除括号（见 remove_brackets），同时报告扫描结束时是否还有未闭合的左括号
 
-                # 查找最内层的括号对
-                pattern = open_escaped + r'[^' + open_escaped + close_escaped + r']*?' + close_escaped
-                new_result = re.sub(pattern, '', result)
+        没有未闭合左括号的文本，拼接后移除括号的结果等于分别移除后再拼接，
+        增量统计据此判断段落结果能否直接累加。
 
-                # 如果没有更多的括号，退出循环
-                if new_result == result:
-                    break
-                result = new_result
+        Args:
+            text: 输入文本
+            trace: 可选的列表，按顺序追加栈扫描遇到的括号字符（即最内层括号对之外剩下的括号，
+                分块统计据此在块之间传递括号状态，见 split_count）
+
+        Returns:
+            (移除括号后的文本, 是否有未闭合的左括号)
+        """
+        openers, closers, bracket_re, flat_re = _bracket_table(tuple(self.BRACKET_PAIRS))
+
+        # 不含其他括号的最内层括号对无论处在哪一层都会被整体移除，
+        # 先用正则删掉几层（每层一次线性替换，层数有上限），
+        # 栈扫描只需处理更深的嵌套和不配对的括号
+        for _ in range(self.FLAT_BRACKET_PASSES):
+            text, removed = flat_re.subn('', text)
+            if not removed:
+                break
+
+        # 输出片段；左括号入栈时记录其片段位置，配对时截断回该位置
+        pieces = []
+        stack = []
+        open_counts = [0] * len(self.BRACKET_PAIRS)
+        pos = 0
+
+        for match in bracket_re.finditer(text):
+            start = match.start()
+            if start > pos:
+                pieces.append(text[pos:start])
+            pos = start + 1
+            char = text[start]
+            if trace is not None:
+                trace.append(char)
+
+            kind = closers.get(char)
+            if kind is not None and open_counts[kind]:
+                # 弹出到配对的左括号为止，移除括号及其中的内容
+                while True:
+                    top, mark = stack.pop()
+                    open_counts[top] -= 1
+                    if top == kind:
+                        break
+                del pieces[mark:]
+                continue
+
+            kind = openers.get(char)
+            if kind is not None:
+                stack.append((kind, len(pieces)))
+                open_counts[kind] += 1
+
+            # 左括号先原样输出，配对后再截断；不配对的右括号原样保留
+            pieces.append(char)
+
+        pieces.append(text[pos:])
 
-        return result
+        if stack and self.UNCLOSED_BRACKET_POLICY == 'drop':
+            del pieces[stack[0][1]:]
+
+        return ''.join(pieces), bool(stack)
 
     def remove_old_annotation(self, text):
         """
@@ -135,21 +976,7 @@ class VideoScriptCounter:
         Returns:
             删除标注后的文本
         """
-        # 匹配所有标注格式（包括旧格式和新格式），工具会添加最新计算的标注
-        patterns = [
-            # 匹配包含字数和时间的标注（新旧格式都删除）
-            r'[（(]\s*约?\s*\d+\s*字\s*[,，]\s*\d{1,2}:\d{2}\s*[-\-~～]\s*\d{1,2}:\d{2}\s*[）)]',
-            # 匹配只有时间范围的标注
-            r'[（(]\s*\d{1,2}:\d{2}\s*[-\-~～]\s*\d{1,2}:\d{2}\s*[）)]',
-            # 匹配只有字数的标注
-            r'[（(]\s*约?\s*\d+\s*字\s*[）)]',
-        ]
-
-        result = text
-        for pattern in patterns:
-            result = re.sub(pattern, '', result)
-
-        return result.strip()
+        return self.rules.strip_annotations(text)
 
     def is_subtitle(self, text):
         """
@@ -161,20 +988,36 @@ class VideoScriptCounter:
         Returns:
             是否是子标题
         """
-        # 匹配"知识点1"、"知识点2"、"练习题1"等格式
-        subtitle_patterns = [
-            r'^知识点\s*\d+',
-            r'^练习题?\s*\d+',
-            r'^例题\s*\d+',
-            r'^第[一二三四五六七八九十\d]+题',
-            # 移除了 r'^题目\s*\d+' - "题目1"、"题目2"等应该被统计，不是子标题
-        ]
+        return self.rules.is_subtitle(text)
+
+    def count_breakdown(self, text):
+        """
+        单次扫描统计各类字符（Word标准），不生成中间列表
 
-        text = text.strip()
-        for pattern in subtitle_patterns:
-            if re.match(pattern, text):
-                return True
-        return False
+        Args:
+            text: 输入文本
+
+        Returns:
+            CharBreakdown: 汉字、中文标点、英文单词、数字、其他字符的数量
+        """
+        counts = [0] * 7
+        for match in _COUNT_TOKEN_RE.finditer(text):
+            kind = match.lastindex
+            if kind == _TOKEN_WORD:
+                counts[kind] += 1
+            else:
+                start, end = match.span()
+                counts[kind] += end - start
+
+        # 全角数字同时计入全角字符和数字（与 Word 标准的分别统计一致）
+        fullwidth_digits = counts[_TOKEN_FULLWIDTH_DIGIT]
+        return CharBreakdown(
+            cjk=counts[_TOKEN_CJK],
+            punct=counts[_TOKEN_PUNCT] + fullwidth_digits,
+            words=counts[_TOKEN_WORD],
+            digits=counts[_TOKEN_DIGIT] + fullwidth_digits,
+            other=counts[_TOKEN_OTHER],
+        )
 
     def count_characters(self, text):
         """
@@ -186,24 +1029,11 @@ class VideoScriptCounter:
         Returns:
             字符数
         """
-        # 统计中文字符（包括汉字和中文标点）
-        # Unicode范围：
-        # \u4e00-\u9fff: CJK统一汉字
-        # \u3000-\u303f: CJK符号和标点
-        # \uff00-\uffef: 全角ASCII、全角标点
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff\u3000-\u303f\uff00-\uffef]', text))
-
-        # 统计英文单词数（包括缩写词如Let's, don't等）
-        # 匹配：字母 + 可选的撇号和字母
-        english_words = len(re.findall(r"[a-zA-Z]+(?:'[a-zA-Z]+)?", text))
+        # 总字数 = 中文字符（含中文标点） + 英文单词 + 数字
+        return self.count_breakdown(text).total
 
-        # 统计数字
-        digits = len(re.findall(r'\d', text))
-
-        # 总字数 = 中文字符 + 英文单词 + 数字
-        return chinese_chars + english_words + digits
-
-    def format_time(self, seconds):
+    @staticmethod
+    def format_time(seconds):
         """
         将秒数转换为时间格式 MM:SS 或 HH:MM:SS
 
@@ -236,155 +1066,1562 @@ class VideoScriptCounter:
         duration = (char_count / self.SPEECH_RATE) * 60
         return round(duration)  # 四舍五入到整秒
 
+    def estimate_duration(self, breakdown):
+        """
+        根据字符分类统计估算时长（秒）
+
+        没有设置时长模型时按 SPEECH_RATE 匀速换算（与 calculate_duration 相同）。
+
+        Args:
+            breakdown: CharBreakdown（可以是多段文本统计的合计）
+
+        Returns:
+            时长（秒，四舍五入）
+        """
+        model = self.duration_model
+        if model is None:
+            return self.calculate_duration(breakdown.total)
+        return round(model.seconds(breakdown))
+
+    def segment_sections(self, paragraph_texts):
+        """
+        单次遍历段落，切分出所有部分（排除标题行和子标题行）
+
+        每个段落只清理一次旧标注、只对每个部分的模式匹配一次，
+        各部分的识别规则与逐部分扫描完全一致：
+        - 匹配到当前部分的模式时，记为标题行（以最后一次匹配为准）
+        - 进入当前部分后，遇到下一部分的标题即结束
+        - 最后一部分一直延续到文档末尾
+
+        部分内的子标题行（如"知识点1"、"练习题2"）把正文分成子部分，
+        子标题之前的正文为该部分的开场（intro_text）。
+
+        Args:
+            paragraph_texts: 段落文本序列（如 [p.text for p in document_paragraphs(doc)]）
+
+        Returns:
+            每个部分一个字典的列表，包含：
+            - para_index: 标题段落索引（未找到时为 None）
+            - start: 第一次匹配到标题的段落索引（未找到时为 None）
+            - end: 部分结束位置（不含），即下一部分标题的段落索引或段落总数
+            - text: 正文内容（每段以换行结尾）
+            - intro_text: 第一个子标题之前的正文
+            - subsections: 子部分列表，每个包含 para_index（子标题段落索引）、
+              title（去除旧标注的子标题）和 text（正文内容）
+        """
+        rules = self.rules
+
+        def entries():
+            for raw_text in paragraph_texts:
+                para_text = raw_text.strip()
+                # 删除旧标注后再匹配；每个部分的模式只匹配一次（备选模式已合并为一个正则）
+                matched = rules.match_sections(rules.strip_annotations(para_text))
+                yield para_text, para_text, matched
+
+        def join(parts):
+            return '\n'.join(parts) + '\n' if parts else ''
+
+        sections = self._segment(entries())
+        for section in sections:
+            members = section.pop('members')
+            section['text'] = join(members)
+
+            subsections = section['subsections']
+            bounds = [sub.pop('start') for sub in subsections] + [len(members)]
+            section['intro_text'] = join(members[:bounds[0]])
+            for sub, start, end in zip(subsections, bounds, bounds[1:]):
+                sub['title'] = rules.strip_annotations(sub['title'])
+                sub['text'] = join(members[start:end])
+        return sections
+
+    def _segment(self, entries, is_subtitle=None):
+        """
+        切分的核心逻辑（见 segment_sections）
+
+        Args:
+            entries: 每个段落一个 (member, para_text, matched) 元组：
+                member 是计入正文时记录的值（文本或段落索引），
+                para_text 是传给 is_subtitle 的值（通常为去除首尾空白的段落文本），
+                matched 是与部分一一对应的标题匹配结果
+            is_subtitle: 判断子标题的函数（默认为 self.rules.is_subtitle）
+
+        Returns:
+            每个部分一个字典的列表，包含 para_index、start、end、正文成员列表 members
+            和子部分列表 subsections（每个包含 para_index、title 即子标题的 para_text，
+            以及 start 即子部分第一个成员在 members 中的位置）
+        """
+        section_count = len(self.rules.section_names)
+        if is_subtitle is None:
+            is_subtitle = self.rules.is_subtitle
+        sections = [
+            {'para_index': None, 'start': None, 'end': None, 'members': [], 'subsections': []}
+            for _ in range(section_count)
+        ]
+        # 已经进入的部分
+        active = []
+
+        i = -1
+        for i, (member, para_text, matched) in enumerate(entries):
+            subtitle = None
+
+            for index in active:
+                section = sections[index]
+                if section['end'] is not None:
+                    continue
+
+                # 当前部分的标题优先于下一部分的标题
+                heading = matched[index]
+                if heading:
+                    section['para_index'] = i
+                # 检查是否到达下一部分
+                elif index + 1 < section_count and matched[index + 1]:
+                    section['end'] = i
+                    continue
+
+                # 子标题行（如"知识点1"）开始一个子部分，本身不计入字数；
+                # 同时匹配当前部分标题的子标题行（如"知识点2：..."）也开始子部分
+                if subtitle is None:
+                    subtitle = is_subtitle(para_text)
+                if subtitle:
+                    section['subsections'].append({
+                        'para_index': i,
+                        'title': para_text,
+                        'start': len(section['members']),
+                    })
+                elif not heading:
+                    section['members'].append(member)
+
+            # 记录新进入的部分（跳过主标题行，不计入字数）
+            for index in range(section_count):
+                if matched[index] and sections[index]['start'] is None:
+                    sections[index]['start'] = i
+                    sections[index]['para_index'] = i
+                    active.append(index)
+
+        for section in sections:
+            if section['start'] is not None and section['end'] is None:
+                section['end'] = i + 1
+
+        return sections
+
     def extract_section_text(self, doc, section_index):
         """
         提取指定部分的文本内容（排除标题行）
 
+        处理整篇文档时请使用 segment_sections，只需遍历一次段落。
+
         Args:
             doc: Document对象
-            section_index: 部分索引（0-3）
+            section_index: 部分索引（从0开始）
 
         Returns:
             (section_para_index, section_text): 部分起始段落索引和文本内容
         """
-        section_patterns = self.SECTION_PATTERNS[section_index]  # 现在是列表
-        next_section_patterns = self.SECTION_PATTERNS[section_index + 1] if section_index < 3 else None
-
-        section_text = ""
-        section_para_index = None
-        in_section = False
+        paragraphs = document_paragraphs(doc, self.INCLUDE_HEADERS_FOOTERS)
+        section = self.segment_sections(p.text for p in paragraphs)[section_index]
+        return section['para_index'], section['text']
 
-        for i, para in enumerate(doc.paragraphs):
-            para_text = para.text.strip()
-            # 删除旧标注后再匹配
-            cleaned_text = self.remove_old_annotation(para_text)
+    def analyze(self, paragraph_texts):
+        """
+        统计各部分的字数、时长和时间轴
 
-            # 检查是否是当前部分的开始 - 尝试所有备选模式
-            if any(re.search(pattern, cleaned_text) for pattern in section_patterns):
-                section_para_index = i
-                in_section = True
-                continue  # 跳过主标题行，不计入字数
+        Args:
+            paragraph_texts: 段落文本序列（只遍历一次）
 
-            # 检查是否到达下一部分 - 尝试所有备选模式
-            if in_section and next_section_patterns:
-                if any(re.search(pattern, cleaned_text) for pattern in next_section_patterns):
-                    break
+        Returns:
+            sections_info: 找到的各部分的 SectionStats 列表（未找到的部分不包含在内）
+        """
+        # 一次遍历切分出所有部分
+        with self.stage('segment') as stage:
+            sections = self.segment_sections(paragraph_texts)
+            for section in sections:
+                if section['start'] is not None:
+                    stage.count(section['end'] - section['start'], len(section['text']))
+
+        # 没有子部分的部分统计整段正文，有子部分的分别统计开场和各子部分
+        texts = []
+        for section in sections:
+            if section['para_index'] is None:
+                continue
+            if not section['subsections']:
+                texts.append(section['text'])
+            else:
+                texts.append(section['intro_text'])
+                texts.extend(sub['text'] for sub in section['subsections'])
+        results = iter(self._count_texts(texts))
+
+        breakdowns = []
+        subsection_breakdowns = []
+        spanning = []
+        for index, section in enumerate(sections):
+            if section['para_index'] is None:
+                breakdowns.append(None)
+                subsection_breakdowns.append(None)
+                continue
 
-            # 如果在当前部分内
-            if in_section:
-                # 跳过子标题行（如"知识点1"），不计入字数
-                if self.is_subtitle(para_text):
-                    continue
+            if not section['subsections']:
+                breakdowns.append(next(results)[0])
+                subsection_breakdowns.append([])
+                continue
 
-                # 添加正文内容
-                section_text += para_text + "\n"
+            # 部分的字数为开场和各子部分之和
+            parts = []
+            unclosed = False
+            for _ in range(len(section['subsections']) + 1):
+                breakdown, part_unclosed = next(results)
+                parts.append(breakdown)
+                unclosed = unclosed or part_unclosed
+            if unclosed:
+                spanning.append(index)
+            breakdowns.append(_sum_breakdowns(parts))
+            subsection_breakdowns.append(parts[1:])
+
+        # 括号跨越了子部分，部分的字数按整段正文统计（与不分子部分时一致）
+        if spanning:
+            results = self._count_texts([sections[index]['text'] for index in spanning])
+            for index, (breakdown, _) in zip(spanning, results):
+                breakdowns[index] = breakdown
+
+        return self.build_sections_info(sections, breakdowns, subsection_breakdowns)
+
+    def _count_texts(self, texts):
+        """
+        统计多段文本（逐段调用 _count_text）
 
-        return section_para_index, section_text
+        设置了 SPLIT_JOBS 且文本总长超过 SPLIT_CHUNK_CHARS 时，把文本按段落分块，
+        在进程池中并行统计后合并（见 split_count），结果与逐段统计完全一致；
+        计时时在当前进程中逐段统计。
 
-    def process_document(self):
-        """处理文档，添加字数和时间标注"""
-        print(f"正在处理文件: {self.input_file}")
+        Returns:
+            每段文本一个 (CharBreakdown, 是否有未闭合的左括号) 元组的列表
+        """
+        if (self.SPLIT_JOBS and self.profiler is None
+                and sum(map(len, texts)) > self.SPLIT_CHUNK_CHARS):
+            from split_count import count_texts
+            return count_texts(self, texts, self.SPLIT_JOBS, self.SPLIT_CHUNK_CHARS)
+        return [self._count_text(text) for text in texts]
 
-        # 读取文档
-        doc = Document(str(self.input_file))
+    def _count_text(self, text, trace=None):
+        """
+        移除括号并统计各类字符
 
-        # 存储每个部分的统计信息
-        sections_info = []
-        cumulative_time = 0  # 累积时间（秒）
+        时长模型识别停顿标记时，同时在移除括号前的文本中统计停顿时长，
+        时长由统计结果换算，不再为时长模型重新扫描文本。
 
-        # 处理四个部分
-        section_names = ['引入', '知识点讲解', '综合练习', '总结']
+        Args:
+            text: 输入文本
+            trace: 可选的列表，记录栈扫描遇到的括号字符（见 _scan_brackets）
 
-        for i, section_name in enumerate(section_names):
-            print(f"\n处理第{i+1}部分：{section_name}")
+        Returns:
+            (CharBreakdown, 是否有未闭合的左括号)
+        """
+        # 移除括号内容
+        with self.stage('remove_brackets') as stage:
+            text_without_brackets, unclosed = self._scan_brackets(text, trace)
+            stage.count(chars=len(text))
+
+        # 统计字数
+        with self.stage('count_characters') as stage:
+            breakdown = self.count_breakdown(text_without_brackets)
+            model = self.duration_model
+            if model is not None and model.pause_re is not None:
+                breakdown = breakdown._replace(pause_ms=model.pause_ms(text))
+            stage.count(chars=len(text_without_brackets))
+        return breakdown, unclosed
+
+    def build_sections_info(self, sections, breakdowns, subsection_breakdowns=None):
+        """
+        根据各部分的字符分类统计生成统计信息
 
-            # 提取部分文本
-            para_index, section_text = self.extract_section_text(doc, i)
+        Args:
+            sections: segment_sections 的结果
+            breakdowns: 与部分一一对应的 CharBreakdown（未找到的部分为 None）
+            subsection_breakdowns: 与部分一一对应的子部分 CharBreakdown 列表（可选）
 
-            if para_index is None:
-                print(f"  ⚠️  未找到该部分")
+        Returns:
+            sections_info: 找到的各部分的 SectionStats 列表，
+            每个部分的 subsections 为其子部分的 SubsectionStats 元组
+        """
+        # 存储每个部分的统计信息
+        sections_info = []
+        found_breakdowns = []
+        for i, section_name in enumerate(self.rules.section_names):
+            if sections[i]['para_index'] is None:
                 continue
+            parts = subsection_breakdowns[i] if subsection_breakdowns is not None else []
+            subsections = [
+                SubsectionStats(sub['title'], sub['para_index'], breakdown.total)
+                for sub, breakdown in zip(sections[i]['subsections'], parts)
+            ]
+            sections_info.append(SectionStats(i, section_name, sections[i]['para_index'],
+                                              breakdowns[i].total, subsections=subsections))
+            found_breakdowns.append((breakdowns[i], parts))
+
+        self.update_timeline(sections_info, found_breakdowns)
+        return sections_info
+
+    def update_timeline(self, sections_info, breakdowns=None):
+        """
+        根据各部分的字数，原地更新时长和累积时间轴
 
-            # 移除括号内容
-            text_without_brackets = self.remove_brackets(section_text)
+        Args:
+            sections_info: 各部分的 SectionStats 列表（需包含 char_count）
+            breakdowns: 与 sections_info 一一对应的 (部分的 CharBreakdown, 子部分的 CharBreakdown 列表)；
+                省略时只根据 char_count 换算（时长模型把全部字数按汉字计）
+        """
+        cumulative_time = 0  # 累积时间（秒）
 
-            # 统计字数
-            char_count = self.count_characters(text_without_brackets)
+        for k, info in enumerate(sections_info):
+            if breakdowns is None:
+                breakdown = CharBreakdown(info.char_count, 0, 0, 0, 0)
+                parts = [CharBreakdown(sub.char_count, 0, 0, 0, 0) for sub in info.subsections]
+            else:
+                breakdown, parts = breakdowns[k]
 
             # 计算时长
-            duration = self.calculate_duration(char_count)
+            duration = self.estimate_duration(breakdown)
 
-            # 计算时间范围
+            # 计算时间范围（时间轴文本由 SectionStats.time_range 格式化）
             start_time = cumulative_time
             end_time = cumulative_time + duration
             cumulative_time = end_time
 
-            # 格式化时间
-            start_str = self.format_time(start_time)
-            end_str = self.format_time(end_time)
-
-            # 保存信息
-            sections_info.append({
-                'index': i,
-                'name': section_name,
-                'para_index': para_index,
-                'char_count': char_count,
-                'duration': duration,
-                'time_range': f"{start_str}-{end_str}"
-            })
+            info.duration = duration
+            info.start_time = start_time
+            info.end_time = end_time
 
-            print(f"  ✓ 字数: {char_count}")
-            print(f"  ✓ 时长: {duration}秒")
-            print(f"  ✓ 时间轴: {start_str}-{end_str}")
+            self._update_subsection_timeline(info, breakdown, parts)
 
-        # 在文档中添加标注
-        print("\n\n正在生成带标注的文档...")
+    def _update_subsection_timeline(self, info, breakdown, parts):
+        """
+        原地更新子部分的时间轴
+
+        子部分的起止时间由部分开头到该子部分的累计统计换算，
+        保证子部分首尾相接并落在部分的时间范围内。
+        """
+        subsections = info.subsections
+        if not subsections:
+            return
+
+        # 第一个子标题之前的开场（括号跨子部分时可能为负，按 0 计）
+        offset = CharBreakdown(*(total - sum(values) for total, values
+                                 in zip(breakdown, zip(*parts, _NO_CHARS))))
+        if offset.total < 0:
+            offset = _NO_CHARS
+        for sub, part in zip(subsections, parts):
+            start_time = min(info.start_time + self.estimate_duration(offset), info.end_time)
+            offset = _sum_breakdowns((offset, part))
+            end_time = min(info.start_time + self.estimate_duration(offset), info.end_time)
+
+            sub.duration = end_time - start_time
+            sub.start_time = start_time
+            sub.end_time = end_time
+
+    def config_fingerprint(self):
+        """
+        统计配置的指纹：规则、括号类型、语速等任何一项变化都会改变指纹
+
+        Returns:
+            JSON 字符串
+        """
+        return json.dumps({
+            'version': self.CACHE_VERSION,
+            'speech_rate': self.SPEECH_RATE,
+            'bracket_pairs': [list(pair) for pair in self.BRACKET_PAIRS],
+            'unclosed_bracket_policy': self.UNCLOSED_BRACKET_POLICY,
+            'rules': self.rules.describe(),
+            'annotate_subsections': self.ANNOTATE_SUBSECTIONS,
+            'headers_footers': self.INCLUDE_HEADERS_FOOTERS,
+            'duration_model': (self.duration_model.describe()
+                               if self.duration_model is not None else None),
+        }, ensure_ascii=False, sort_keys=True)
+
+    def annotate(self, doc, sections_info):
+        """
+        在各部分标题后添加字数和时间标注（替换旧标注），不保存
+
+        ANNOTATE_SUBSECTIONS 为 True 时，子标题行也添加子部分的标注
+        （子标题行同时是部分的标题行时，只保留部分的标注）。
+
+        Args:
+            doc: Document 对象
+            sections_info: 各部分的 SectionStats 列表
+        """
+        # 段落索引 -> 统计信息（部分优先于子部分）
+        targets = {}
         for info in sections_info:
-            para = doc.paragraphs[info['para_index']]
+            targets[info.para_index] = info
+        if self.ANNOTATE_SUBSECTIONS:
+            for info in sections_info:
+                for sub in info.subsections:
+                    targets.setdefault(sub.para_index, sub)
+
+        paragraphs = document_paragraphs(doc, self.INCLUDE_HEADERS_FOOTERS)
+        for para_index, info in targets.items():
+            para = paragraphs[para_index]
 
             # 删除旧的时间标注
             clean_text = self.remove_old_annotation(para.text)
 
             # 构建新的标注文本
-            annotation = f"（约{info['char_count']}字，{info['time_range']}）"
+            annotation = f"（约{info.char_count}字，{info.time_range}）"
 
             # 添加新标注
             para.text = clean_text + annotation
 
-        # 保存文档
-        doc.save(str(self.output_file))
-        print(f"\n✅ 处理完成！")
-        print(f"输出文件: {self.output_file}")
+    def write_document(self, doc, source, output):
+        """
+        保存带标注的文档
+
+        只重新压缩包含段落的部件（主文档，统计页眉页脚时还有页眉页脚部件），
+        图片等其他部件按原压缩数据逐字节复制；
+        压缩包格式不支持时退回 python-docx 的完整保存。
+
+        Args:
+            doc: 已添加标注的 Document 对象
+            source: 原文档的路径或二进制文件对象
+            output: 输出路径或二进制文件对象
+        """
+        replacements = {part.partname.lstrip('/'): part.blob
+                        for part in document_parts(doc, self.INCLUDE_HEADERS_FOOTERS)}
+        start = output.tell() if _is_stream(output) else None
+        try:
+            write_patched(source, output, replacements)
+        except ValueError:
+            if start is None:
+                doc.save(str(output))
+            else:
+                output.seek(start)
+                output.truncate()
+                doc.save(output)
+
+    def count(self, source):
+        """
+        只统计、不生成文档（流式读取，不导入 python-docx）
+
+        Args:
+            source: .docx 的路径、二进制文件对象或文件内容（bytes）
+
+        Returns:
+            DocumentStats
+        """
+        source, name = _open_source(source)
+        if self.profiler is not None:
+            self.profiler.documents += 1
+        paragraph_texts = (text for _, text in
+                           iter_paragraphs(source, self.INCLUDE_HEADERS_FOOTERS))
+        return DocumentStats(name, self.analyze(paragraph_texts))
+
+    def process(self, source, output):
+        """
+        统计并把带标注的文档写入 output
+
+        Args:
+            source: .docx 的路径、二进制文件对象或文件内容（bytes）
+            output: 输出路径或二进制文件对象
+
+        Returns:
+            DocumentStats
+        """
+        source, name = _open_source(source)
+        if self.profiler is not None:
+            self.profiler.documents += 1
+        with self.stage('load') as stage:
+            doc = load_docx(source)
+            paragraph_texts = [p.text for p in
+                               document_paragraphs(doc, self.INCLUDE_HEADERS_FOOTERS)]
+            stage.count(len(paragraph_texts))
+        sections_info = self.analyze(paragraph_texts)
+        with self.stage('annotate') as stage:
+            self.annotate(doc, sections_info)
+            stage.count(len(sections_info))
+        with self.stage('save'):
+            self.write_document(doc, source, output)
+        return DocumentStats(name, sections_info)
+
+
+class VideoScriptCounter(CountingEngine):
+    """
+    视频脚本字数统计与时间预估工具
+
+    绑定一个输入文件：检查路径、生成输出文件名、打印处理过程，可使用结果缓存。
+    统计配置和算法见 CountingEngine。
+    """
+
+    # 输出文件名后缀
+    OUTPUT_SUFFIX = '_带标注.docx'
+
+    def __init__(self, input_file, verbose=True, cache=None, profiler=None, output_file=None,
+                 engine=None):
+        """
+        初始化
+
+        Args:
+            input_file: 输入文件路径（.docx），或内存中文档的二进制文件对象（如 io.BytesIO）
+            verbose: 是否打印处理过程（批量处理时关闭）
+            cache: ResultCache 对象（可选），用于跳过未修改文档的统计和写入
+            profiler: profiling.Profiler 对象（可选），记录各处理阶段的用时
+            output_file: 带标注文档的输出路径或二进制文件对象
+                （默认为输入文件旁的"<文件名>_带标注.docx"；输入为文件对象时必须指定才能写入）
+            engine: 提供统计配置的 CountingEngine 对象（可选，默认使用类属性中的配置）
+        """
+        super().__init__(profiler=profiler, **(engine.config() if engine is not None else {}))
+        self.verbose = verbose
+        self.cache = cache
+        if _is_stream(input_file):
+            # 内存中的文档：没有路径可检查，输出由调用方指定
+            self.input_file = input_file
+        else:
+            self.input_file = Path(input_file)
+            if not self.input_file.exists():
+                raise FileNotFoundError(f"文件不存在: {input_file}")
+
+            if self.input_file.suffix.lower() != '.docx':
+                raise ValueError("仅支持 .docx 格式文件")
+
+        if output_file is not None:
+            self.output_file = output_file if _is_stream(output_file) else Path(output_file)
+        elif isinstance(self.input_file, Path):
+            # 生成输出文件名
+            output_name = self.input_file.stem + self.OUTPUT_SUFFIX
+            self.output_file = self.input_file.parent / output_name
+        else:
+            self.output_file = None
+
+    def log(self, message=''):
+        """打印处理过程（verbose 为 False 时不输出）"""
+        if self.verbose:
+            print(message)
+
+    def count_document(self):
+        """
+        只统计、不生成文档
+
+        流式读取正文段落，不加载 python-docx 对象模型，内存占用与文档大小无关。
+        有缓存时，未修改的文档直接使用缓存的结果。
+
+        Returns:
+            sections_info: 各部分的 SectionStats 列表
+        """
+        if self.profiler is not None:
+            self.profiler.documents += 1
+
+        cache_key = None
+        if self.cache is not None:
+            with self.stage('cache'):
+                cache_key = self.cache.make_key(
+                    read_main_part(self.input_file, self.INCLUDE_HEADERS_FOOTERS),
+                    self.config_fingerprint())
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                return [SectionStats.from_dict(info) for info in cached['sections']]
+
+        paragraph_texts = (text for _, text in
+                           iter_paragraphs(self.input_file, self.INCLUDE_HEADERS_FOOTERS))
+        if self.profiler is not None:
+            # 计时时先读出全部段落，读取和切分分别计时
+            with self.stage('load') as stage:
+                paragraph_texts = list(paragraph_texts)
+                stage.count(len(paragraph_texts))
+
+        sections_info = self.analyze(paragraph_texts)
+        if self.cache is not None:
+            self.cache.put(cache_key, {'sections': [info.as_dict() for info in sections_info],
+                                       'outputs': {}})
+        return sections_info
+
+    def _output_state(self):
+        """
+        输入和输出文件的大小和修改时间，用于判断输出是否仍是缓存时由同一输入写入的版本
+
+        缓存键只包含正文部分：样式、图片等其他部分修改后，输入文件的状态随之变化，
+        输出需要重新写入。输入或输出不是文件路径（或无法读取）时为 None，每次都写入。
+        """
+        states = []
+        for path in (self.input_file, self.output_file):
+            if not isinstance(path, Path):
+                return None
+            try:
+                stat = path.stat()
+            except OSError:
+                return None
+            states.append([stat.st_size, stat.st_mtime_ns])
+        return states
+
+    def save_document(self, doc):
+        """保存带标注的文档到 output_file（见 CountingEngine.write_document）"""
+        self.write_document(doc, self.input_file, self.output_file)
+
+    def process_document(self):
+        """
+        处理文档，添加字数和时间标注
+
+        Returns:
+            sections_info: 各部分的 SectionStats 列表
+        """
+        if self.output_file is None:
+            raise ValueError("处理内存中的文档需要指定输出（output_file）")
+        self.log(f"正在处理文件: {self.input_file}")
+        if self.profiler is not None:
+            self.profiler.documents += 1
+
+        # 查询缓存：主文档内容和统计配置都未变化时直接使用缓存的结果
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            with self.stage('cache'):
+                cache_key = self.cache.make_key(
+                    read_main_part(self.input_file, self.INCLUDE_HEADERS_FOOTERS),
+                    self.config_fingerprint())
+                cached = self.cache.get(cache_key)
+
+        doc = None
+        if cached is not None:
+            sections_info = [SectionStats.from_dict(info) for info in cached['sections']]
+        else:
+            # 读取文档
+            with self.stage('load') as stage:
+                doc = load_docx(self.input_file)
+                paragraph_texts = [p.text for p in
+                                   document_paragraphs(doc, self.INCLUDE_HEADERS_FOOTERS)]
+                stage.count(len(paragraph_texts))
+            sections_info = self.analyze(paragraph_texts)
+
+        found = {info.index: info for info in sections_info}
+
+        for i, section_name in enumerate(self.rules.section_names):
+            self.log(f"\n处理第{i+1}部分：{section_name}")
+
+            info = found.get(i)
+            if info is None:
+                self.log(f"  ⚠️  未找到该部分")
+                continue
+
+            self.log(f"  ✓ 字数: {info.char_count}")
+            self.log(f"  ✓ 时长: {info.duration}秒")
+            self.log(f"  ✓ 时间轴: {info.time_range}")
+            if self.ANNOTATE_SUBSECTIONS:
+                for sub in info.subsections:
+                    self.log(f"    - {sub.title}: {sub.char_count}字，{sub.time_range}")
+
+        # 同一内容可能对应多个输出文件，按输出路径分别记录
+        # 输出到文件对象时每次都写入
+        output_key = (str(self.output_file.resolve())
+                      if isinstance(self.output_file, Path) else None)
+        outputs = cached['outputs'] if cached is not None else {}
+        state = self._output_state()
+        if (output_key is not None and state is not None
+                and outputs.get(output_key) == state):
+            self.log("\n\n文档未修改，使用缓存的结果（输出文件已是最新）")
+        else:
+            self._write_annotated(doc, sections_info)
+            if self.cache is not None:
+                if output_key is not None:
+                    outputs[output_key] = self._output_state()
+                self.cache.put(cache_key, {
+                    'sections': [info.as_dict() for info in sections_info],
+                    'outputs': outputs,
+                })
+
+        self.log(f"\n✅ 处理完成！")
+        self.log(f"输出文件: {self.output_file}")
 
         # 打印总结
-        print("\n" + "="*50)
-        print("统计摘要")
-        print("="*50)
-        total_chars = sum(info['char_count'] for info in sections_info)
-        total_duration = sum(info['duration'] for info in sections_info)
-        print(f"总字数: {total_chars} 字")
-        print(f"总时长: {self.format_time(total_duration)} ({total_duration}秒)")
-        print(f"平均语速: {self.SPEECH_RATE} 字/分钟")
-        print("="*50)
+        self.log("\n" + "="*50)
+        self.log("统计摘要")
+        self.log("="*50)
+        total_chars = sum(info.char_count for info in sections_info)
+        total_duration = sum(info.duration for info in sections_info)
+        self.log(f"总字数: {total_chars} 字")
+        self.log(f"总时长: {self.format_time(total_duration)} ({total_duration}秒)")
+        self.log(f"平均语速: {self.SPEECH_RATE} 字/分钟")
+        self.log("="*50)
+
+        return sections_info
+
+    def _write_annotated(self, doc, sections_info):
+        """
+        在各部分标题后添加标注并保存
+
+        Args:
+            doc: Document 对象（为 None 时重新读取输入文件）
+            sections_info: 各部分的 SectionStats 列表
+        """
+        if doc is None:
+            with self.stage('load'):
+                doc = load_docx(self.input_file)
+
+        # 在文档中添加标注
+        self.log("\n\n正在生成带标注的文档...")
+        with self.stage('annotate') as stage:
+            self.annotate(doc, sections_info)
+            stage.count(len(sections_info))
+
+        # 保存文档
+        with self.stage('save'):
+            self.save_document(doc)
+
+
+class _ParagraphResult:
+    """单个段落的统计结果（按段落原文缓存）"""
+
+    __slots__ = ('key', 'text', 'matched', 'subtitle', 'unclosed', 'breakdown')
+
+    def __init__(self, counter, raw_text):
+        rules = counter.rules
+        # 缓存中的键（段落原文）
+        self.key = raw_text
+        self.text = raw_text.strip()
+        self.matched = tuple(rules.match_sections(rules.strip_annotations(self.text)))
+        self.subtitle = rules.is_subtitle(self.text)
+        # 移除括号后的口播文本的分类统计（含停顿时长）
+        self.breakdown, self.unclosed = counter._count_text(self.text)
+
+
+class IncrementalCounter:
+    """
+    增量统计：按段落缓存移除括号和字数统计的结果，文档修改后只重新计算变化的段落
+
+    段落没有未闭合的左括号时，一个部分的字数等于其各段字数之和，
+    修改正文段落只需按差值调整所在部分的合计；修改标题或增删段落时，
+    用缓存的匹配结果重新切分（不再重复正则匹配）。
+    有未闭合左括号的部分（括号跨段）按整段正文重新统计，结果与 analyze() 完全一致。
+    子部分（见 segment_sections）的字数按同样的方式维护。
+
+    用法：
+        info = counter.process_document()
+        incremental = IncrementalCounter(counter, info)
+        incremental.update(paragraph_texts)   # 原地更新 info
+        incremental.edit(12, "修改后的段落")
+    """
+
+    def __init__(self, counter, sections_info=None):
+        """
+        初始化
+
+        Args:
+            counter: VideoScriptCounter 或 CountingEngine 对象（提供统计规则和语速）
+            sections_info: 要原地更新的 SectionStats 列表（如 process_document() 的返回值）
+        """
+        self.counter = counter
+        self.sections_info = sections_info if sections_info is not None else []
+        # 段落原文 -> _ParagraphResult
+        self._memo = {}
+        self._records = []
+        # 每个部分的正文段落索引（未找到的部分为 None）
+        self._members = []
+        # 每个部分按子标题分成的开场和各子部分（每项为正文段落索引列表）
+        self._parts = []
+        # 段落索引 -> [(部分, 子部分序号), ...]（各部分可能重叠；序号 0 为开场）
+        self._owners = {}
+        self._breakdowns = []
+        self._part_breakdowns = []
+        # 每个部分是否有括号跨段（需要按整段正文统计）
+        self._spanning = []
+
+    def _record(self, raw_text):
+        record = self._memo.get(raw_text)
+        if record is None:
+            record = self._memo[raw_text] = _ParagraphResult(self.counter, raw_text)
+        return record
+
+    def update(self, paragraph_texts):
+        """
+        用新的段落文本更新统计
+
+        Args:
+            paragraph_texts: 全部段落文本序列
+
+        Returns:
+            sections_info: 原地更新后的 SectionStats 列表
+        """
+        records = [self._record(raw_text) for raw_text in paragraph_texts]
+        old_records = self._records
+
+        if len(records) == len(old_records):
+            changed = [i for i, (old, new) in enumerate(zip(old_records, records))
+                       if old is not new]
+            if all(self._same_structure(old_records[i], records[i]) for i in changed):
+                self._records = records
+                self._recount(changed, old_records)
+                self._prune()
+                return self.sections_info
+
+        self._records = records
+        self._resegment()
+        self._prune()
+        return self.sections_info
+
+    def _prune(self):
+        """缓存明显多于当前段落数时，丢弃已不在文档中的段落结果（逐字编辑时缓存不会无限增长）"""
+        if len(self._memo) > 2 * len(self._records) + 64:
+            self._memo = {record.key: record for record in self._records}
+
+    def edit(self, para_index, text):
+        """
+        修改单个段落
+
+        Args:
+            para_index: 段落索引
+            text: 新的段落文本
+
+        Returns:
+            sections_info: 原地更新后的 SectionStats 列表
+        """
+        old = self._records[para_index]
+        new = self._record(text)
+        if old is new:
+            return self.sections_info
+
+        self._records[para_index] = new
+        if self._same_structure(old, new):
+            self._recount([para_index], {para_index: old})
+        else:
+            self._resegment()
+        self._prune()
+        return self.sections_info
+
+    @staticmethod
+    def _same_structure(old, new):
+        """
+        两个段落对切分的影响是否相同（标题匹配和子标题判断都不变）
+
+        子标题行的文字就是子部分的标题，修改子标题也按结构变化处理。
+        """
+        return (old.matched == new.matched and old.subtitle == new.subtitle
+                and not new.subtitle)
+
+    def _breakdown(self, members):
+        """
+        计算一组正文段落的字数分类统计
+
+        Returns:
+            (CharBreakdown, 是否有括号跨段)
+        """
+        records = self._records
+        if any(records[i].unclosed for i in members):
+            # 括号跨段，按整段正文统计（与 analyze() 一致）
+            text = '\n'.join(records[i].text for i in members) + '\n' if members else ''
+            return self.counter._count_text(text)[0], True
+        return _sum_breakdowns(records[i].breakdown for i in members), False
+
+    def _count_section(self, index):
+        """重新统计一个部分及其开场和各子部分"""
+        self._breakdowns[index], self._spanning[index] = self._breakdown(self._members[index])
+        parts = self._parts[index]
+        if len(parts) == 1:
+            self._part_breakdowns[index] = [self._breakdowns[index]]
+        else:
+            self._part_breakdowns[index] = [self._breakdown(part)[0] for part in parts]
+
+    def _resegment(self):
+        """用缓存的匹配结果重新切分，并重建统计信息"""
+        counter = self.counter
+        records = self._records
+        sections = counter._segment(
+            ((i, record, record.matched) for i, record in enumerate(records)),
+            is_subtitle=lambda record: record.subtitle,
+        )
+
+        count = len(sections)
+        self._members = [section['members'] for section in sections]
+        self._parts = [None] * count
+        self._owners = {}
+        self._breakdowns = [None] * count
+        self._part_breakdowns = [None] * count
+        self._spanning = [False] * count
+        for index, section in enumerate(sections):
+            if section['para_index'] is None:
+                continue
+
+            # 按子标题把正文分为开场和各子部分
+            members = section['members']
+            subsections = section['subsections']
+            bounds = [sub['start'] for sub in subsections] + [len(members)]
+            parts = [members[:bounds[0]]] + [members[start:end]
+                                              for start, end in zip(bounds, bounds[1:])]
+            for sub in subsections:
+                sub['title'] = counter.rules.strip_annotations(sub['title'].text)
+            for part_index, part in enumerate(parts):
+                for i in part:
+                    self._owners.setdefault(i, []).append((index, part_index))
+            self._parts[index] = parts
+
+            self._count_section(index)
+
+        self.sections_info[:] = counter.build_sections_info(
+            sections, self._breakdowns,
+            [parts and parts[1:] for parts in self._part_breakdowns])
+
+    def _recount(self, changed, old_records):
+        """切分不变时，只重新计算包含变化段落的部分"""
+        if not changed:
+            return
+
+        def shift(totals, before, after):
+            return CharBreakdown(*(total - old + new
+                                   for total, old, new in zip(totals, before, after)))
+
+        records = self._records
+        dirty = set()
+        for i in changed:
+            for index, part_index in self._owners.get(i, ()):
+                if index in dirty:
+                    continue
+                old, new = old_records[i], records[i]
+                if old.unclosed or new.unclosed or self._spanning[index]:
+                    dirty.add(index)
+                    continue
+                self._breakdowns[index] = shift(
+                    self._breakdowns[index], old.breakdown, new.breakdown)
+                part_breakdowns = self._part_breakdowns[index]
+                if len(part_breakdowns) == 1:
+                    part_breakdowns[0] = self._breakdowns[index]
+                else:
+                    part_breakdowns[part_index] = shift(
+                        part_breakdowns[part_index], old.breakdown, new.breakdown)
+
+        for index in dirty:
+            self._count_section(index)
+
+        for info in self.sections_info:
+            info.char_count = self._breakdowns[info.index].total
+            for sub, breakdown in zip(info.subsections, self._part_breakdowns[info.index][1:]):
+                sub.char_count = breakdown.total
+        self.counter.update_timeline(self.sections_info, [
+            (self._breakdowns[info.index], self._part_breakdowns[info.index][1:])
+            for info in self.sections_info])
+
+
+def is_script_file(path):
+    """判断是否为待处理的脚本：.docx 文件，且不是带标注的输出或 Word 临时文件（~$ 开头）"""
+    name = path.name
+    return (name.lower().endswith('.docx') and not name.startswith('~$')
+            and not name.endswith(VideoScriptCounter.OUTPUT_SUFFIX))
+
+
+def collect_inputs(inputs, file_list=None):
+    """
+    展开命令行输入：文件、目录（递归查找 .docx）、通配符或文件列表
+
+    已生成的带标注文件和 Word 临时文件（~$ 开头）会被跳过。
+
+    Args:
+        inputs: 路径、目录或通配符列表
+        file_list: 文件列表路径（每行一个路径，可选）
+
+    Returns:
+        去重后按输入顺序排列的 Path 列表
+    """
+    patterns = list(inputs)
+    if file_list:
+        with open(file_list, encoding='utf-8') as f:
+            patterns.extend(line.strip() for line in f if line.strip())
+
+    paths = []
+    seen = set()
+
+    def add(path):
+        if path.name.startswith('~$') or path.name.endswith(VideoScriptCounter.OUTPUT_SUFFIX):
+            return
+        key = path.resolve()
+        if key not in seen:
+            seen.add(key)
+            paths.append(path)
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            for found in sorted(path.rglob('*.docx')):
+                add(found)
+        elif glob.has_magic(pattern):
+            for found in sorted(glob.glob(pattern, recursive=True)):
+                if found.lower().endswith('.docx'):
+                    add(Path(found))
+        else:
+            # 单个文件：不存在或格式错误时由处理过程记录错误
+            add(path)
+
+    return paths
+
+
+def _error_result(file, error):
+    """处理失败的文件的结果字典（见 process_files）"""
+    return {'file': file, 'output': None, 'stats': None,
+            'error': f"{type(error).__name__}: {error}"}
+
+
+def process_files(paths, cache_dir=None, write=True, profiler=None, engine=None):
+    """
+    依次处理一组文件（批量处理的工作进程入口）
+
+    单个文件出错不会中断其他文件的处理。
+
+    Args:
+        paths: 文件路径列表
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        write: 是否写入带标注的文档（为 False 时只统计，output 为 None）
+        profiler: profiling.Profiler 对象（可选），累计各文件各阶段的用时
+        engine: 提供统计配置的 CountingEngine 对象（可选，见 VideoScriptCounter）
+
+    Returns:
+        每个文件一个结果字典：file、output、stats（成功时为 DocumentStats）或 error（失败时）
+    """
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    results = []
+    for path in paths:
+        try:
+            counter = VideoScriptCounter(path, verbose=False, cache=cache, profiler=profiler,
+                                         engine=engine)
+            if write:
+                sections_info = counter.process_document()
+            else:
+                sections_info = counter.count_document()
+            results.append({
+                'file': str(path),
+                'output': str(counter.output_file) if write else None,
+                'stats': DocumentStats(str(path), sections_info),
+                'error': None,
+            })
+        except Exception as e:
+            results.append(_error_result(str(path), e))
+    return results
+
+
+def process_bytes(data, write=True, cache_dir=None, engine=None):
+    """
+    处理内存中的 .docx（HTTP 服务、异步接口和压缩包的工作进程入口）
+
+    Args:
+        data: .docx 文件内容
+        write: 是否生成带标注的文档（为 False 时只统计，不导入 python-docx）
+        cache_dir: 结果缓存目录（为 None 时不使用缓存；命中时仍生成带标注的文档）
+        engine: 提供统计配置的 CountingEngine 对象（可选，见 VideoScriptCounter）
+
+    Returns:
+        (DocumentStats, 带标注的文档内容；只统计时为 None)
+    """
+    source = io.BytesIO(data)
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    if not write:
+        counter = VideoScriptCounter(source, verbose=False, cache=cache, engine=engine)
+        return DocumentStats(None, counter.count_document()), None
+    output = io.BytesIO()
+    counter = VideoScriptCounter(source, verbose=False, cache=cache, output_file=output,
+                                 engine=engine)
+    return DocumentStats(None, counter.process_document()), output.getvalue()
+
+
+def _run_isolated(function, item, initializer=None, initargs=()):
+    """
+    在单独的工作进程中运行一个任务（该进程异常退出只影响这一个任务）
+
+    Returns:
+        (结果, 异常)，两者之一为 None
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1, initializer=initializer,
+                             initargs=initargs) as executor:
+        try:
+            return executor.submit(function, item).result(), None
+        except Exception as e:
+            return None, e
+
+
+def iter_pool(function, items, jobs=None, initializer=None, initargs=(), ordered=False):
+    """
+    在进程池中对每个任务调用 function，按需读取任务，同时在途的任务数不超过工作进程数的两倍
+
+    工作进程异常退出（内存不足被杀、lxml 崩溃等）时，进程池中在途的任务都会失败，
+    无法确定是哪一个引起的：这些任务在单独的工作进程中逐个重新运行，
+    再次导致进程退出的任务记为出错，然后重建进程池继续处理，不会中断整批任务。
+
+    Args:
+        function: 在工作进程中调用的函数（可 pickle），参数为一个任务
+        items: 任务的可迭代对象
+        jobs: 工作进程数（默认为 CPU 核数）
+        initializer, initargs: 工作进程的初始化函数及参数
+        ordered: 为 True 时按任务顺序返回，否则按完成顺序返回
+
+    Yields:
+        (任务, 结果, 异常)：任务出错（包括工作进程异常退出）时结果为 None、异常为出错原因，
+        否则异常为 None
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    jobs = jobs or os.cpu_count() or 1
+    max_pending = jobs * 2
+    items = iter(items)
+    exhausted = object()
+    pending = {}  # future -> 任务，按提交顺序
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+    try:
+        while True:
+            broken = False
+            while len(pending) < max_pending:
+                item = next(items, exhausted)
+                if item is exhausted:
+                    break
+                try:
+                    future = executor.submit(function, item)
+                except BrokenProcessPool:
+                    retry = list(pending.values()) + [item]
+                    broken = True
+                    break
+                pending[future] = item
+            if not pending and not broken:
+                return
+
+            if not broken:
+                if ordered:
+                    done = [next(iter(pending))]
+                    wait(done)
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+                if broken:
+                    retry = list(pending.values())
+                else:
+                    for future in done:
+                        item = pending.pop(future)
+                        error = future.exception()
+                        yield item, None if error is not None else future.result(), error
+                    continue
+
+            # 工作进程异常退出：在途的任务逐个在单独的进程中重新运行，然后重建进程池
+            executor.shutdown(wait=False, cancel_futures=True)
+            pending.clear()
+            for item in retry:
+                yield (item, *_run_isolated(function, item, initializer, initargs))
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=initializer,
+                                           initargs=initargs)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_batch(paths, jobs=None, chunk_size=8, cache_dir=None, write=True, profiler=None,
+               engine=None):
+    """
+    用进程池批量处理文件，按完成顺序逐个返回结果
+
+    文件按 chunk_size 分块提交，同时在途的分块数量有上限（见 iter_pool），
+    处理上万个文件时也不会一次性创建全部任务。工作进程异常退出时，
+    引起退出的分块中的文件记为出错，其他文件照常处理。
+
+    Args:
+        paths: 文件路径列表
+        jobs: 工作进程数（默认为 CPU 核数；为 1 时在当前进程中处理）
+        chunk_size: 每个任务处理的文件数
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        write: 是否写入带标注的文档
+        profiler: profiling.Profiler 对象（可选；计时时在当前进程中处理）
+        engine: 提供统计配置的 CountingEngine 对象（可选；随任务传给工作进程）
+
+    Yields:
+        每个文件的结果字典（见 process_files）
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = (paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size))
+
+    if jobs == 1 or profiler is not None:
+        for chunk in chunks:
+            yield from process_files(chunk, cache_dir, write, profiler, engine)
+        return
+
+    from functools import partial
+
+    function = partial(process_files, cache_dir=cache_dir, write=write, engine=engine)
+    for chunk, results, error in iter_pool(function, chunks, jobs):
+        if error is not None:
+            results = [_error_result(str(path), error) for path in chunk]
+        yield from results
+
+
+def run_batch(paths, jobs=None, chunk_size=8, cache_dir=None, profiler=None, engine=None):
+    """
+    批量处理并打印汇总
+
+    Returns:
+        失败的文件数
+    """
+    print(f"批量处理 {len(paths)} 个文件...")
+    results = iter_batch(paths, jobs, chunk_size, cache_dir, profiler=profiler, engine=engine)
+    return print_batch(results, len(paths))
+
+
+def print_batch(results, total=None):
+    """
+    逐个打印批量处理的结果，最后打印汇总
+
+    Args:
+        results: 结果字典的可迭代对象（见 process_files）
+        total: 文件总数（事先不知道时为 None，只显示序号）
+
+    Returns:
+        失败的文件数
+    """
+    format_time = VideoScriptCounter.format_time
+    done = 0
+    succeeded = 0
+    failures = []
+    total_chars = 0
+    total_duration = 0
+
+    for result in results:
+        done += 1
+        progress = f"[{done}/{total}]" if total is not None else f"[{done}]"
+        if result['error'] is None:
+            succeeded += 1
+            chars = result['stats'].total_chars
+            duration = result['stats'].total_duration
+            total_chars += chars
+            total_duration += duration
+            print(f"{progress} ✓ {result['file']} ({chars}字，{format_time(duration)})")
+        else:
+            failures.append(result)
+            print(f"{progress} ✗ {result['file']}: {result['error']}")
+
+    print("\n" + "="*50)
+    print("批量处理摘要")
+    print("="*50)
+    print(f"文件总数: {done}")
+    print(f"成功: {succeeded}")
+    print(f"失败: {len(failures)}")
+    print(f"总字数: {total_chars} 字")
+    print(f"总时长: {format_time(total_duration)} ({total_duration}秒)")
+    if failures:
+        print("\n失败的文件:")
+        for result in failures:
+            print(f"  - {result['file']}: {result['error']}")
+    print("="*50)
+
+    return len(failures)
+
+
+def run_report(paths, report_format, report_file=None, jobs=None, chunk_size=8,
+               cache_dir=None, layout='section', profiler=None, totals=None, engine=None):
+    """
+    只统计、不写入文档，输出 JSON、CSV 或 Excel 报表
+
+    不加载 python-docx 对象模型，也不生成带标注的文档；
+    处理完一个文档就写出一个，内存占用与文档数量无关。
+    报表输出到文件或标准输出，错误信息输出到标准错误。
+
+    Args:
+        paths: 文件路径列表
+        report_format: 'json'、'csv' 或 'xlsx'
+        report_file: 报表文件路径（为 None 时输出到标准输出；xlsx 必须指定）
+        layout: 表格报表的布局：'section'（每个部分一行）或 'document'（每个文档一行）
+        totals: 表格报表是否追加合计行（默认 Excel 追加、CSV 不追加）
+        engine: 提供统计配置的 CountingEngine 对象（可选）
+
+    Returns:
+        失败的文件数
+    """
+    if len(paths) == 1:
+        jobs = 1
+
+    if report_format == 'xlsx':
+        if not report_file:
+            raise ValueError("Excel 报表需要用 --report-file 指定输出文件")
+        stream = open(report_file, 'wb')
+    elif report_file:
+        stream = open(report_file, 'w', encoding='utf-8', newline='')
+    else:
+        stream = sys.stdout
+
+    try:
+        results = iter_batch(paths, jobs, chunk_size, cache_dir, write=False, profiler=profiler,
+                             engine=engine)
+        return write_report(results, report_format, stream, layout, totals, engine)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def write_report(results, report_format, stream, layout='section', totals=None, engine=None):
+    """
+    把结果逐个写入报表，失败的文件同时输出到标准错误
+
+    Args:
+        results: 结果字典的可迭代对象（见 process_files）
+        report_format: 'json'、'csv' 或 'xlsx'
+        stream: 输出流（见 report.open_report）
+        layout: 表格报表的布局
+        totals: 表格报表是否追加合计行（默认 Excel 追加、CSV 不追加）
+        engine: 提供部分名称和语速的 CountingEngine 对象（可选，默认使用类属性中的配置）
+
+    Returns:
+        失败的文件数
+    """
+    engine = engine if engine is not None else CountingEngine
+    failures = 0
+    writer = open_report(
+        report_format, stream, layout,
+        section_names=engine.rules.section_names,
+        speech_rate=engine.SPEECH_RATE,
+        format_time=VideoScriptCounter.format_time,
+        totals=totals,
+    )
+    for result in results:
+        if result['error'] is not None:
+            failures += 1
+            print(f"✗ {result['file']}: {result['error']}", file=sys.stderr)
+        writer.write(document_record(result, VideoScriptCounter.format_time))
+    writer.close()
+    return failures
+
+
+def run_watch(roots, cache_dir=None, debounce=1.0, poll_interval=1.0, polling=False,
+              engine=None):
+    """
+    监视目录，脚本保存后自动重新统计并写入标注
+
+    常驻进程只导入一次 python-docx、编译一次规则。启动时先处理一遍已有的脚本
+    （有缓存时未修改的文档直接跳过），之后只处理发生变化的文件；
+    自己写出的带标注文件不会触发处理。
+
+    Args:
+        roots: 要监视的目录列表
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        debounce: 去抖动时间（秒），文件在此时间内没有新的写入后才处理
+        poll_interval: 轮询间隔（秒，inotify 不可用时使用）
+        polling: 为 True 时强制使用轮询
+        engine: 提供统计配置的 CountingEngine 对象（可选）
+    """
+    from watcher import InotifyWatcher, open_watcher, watch
+
+    format_time = VideoScriptCounter.format_time
+
+    def process(paths):
+        for result in process_files(paths, cache_dir, engine=engine):
+            if result['error'] is None:
+                stats = result['stats']
+                print(f"✓ {result['file']} ({stats.total_chars}字，"
+                      f"{format_time(stats.total_duration)})")
+            else:
+                print(f"✗ {result['file']}: {result['error']}")
+        sys.stdout.flush()
+
+    watcher = open_watcher(roots, is_script_file, poll_interval, polling)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"轮询，每 {poll_interval} 秒"
+    try:
+        existing = collect_inputs(roots)
+        if existing:
+            process(existing)
+        print(f"正在监视 {', '.join(str(root) for root in roots)}（{mode}），按 Ctrl+C 停止")
+        sys.stdout.flush()
+        watch(watcher, process, debounce)
+    except KeyboardInterrupt:
+        print("\n已停止监视")
+    finally:
+        watcher.close()
+
+
+def _positive_int(value):
+    """命令行参数：正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"需要正整数: {value!r}")
+    return number
+
+
+def _non_negative_int(value):
+    """命令行参数：非负整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"需要非负整数: {value!r}")
+    return number
 
 
 def main():
     """主函数"""
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(
+        description="视频脚本字数统计与时间预估工具",
+    )
+    parser.add_argument('inputs', nargs='*',
+                        help="输入文件（.docx）、目录或通配符；多个输入时批量处理；"
+                             ".zip/.tar(.gz) 压缩包的结果写入输入包旁的新压缩包")
+    parser.add_argument('--file-list',
+                        help="批量处理：从文件中读取输入路径（每行一个）")
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=None,
+                        help="批量处理：工作进程数（默认为 CPU 核数）")
+    parser.add_argument('--chunk-size', type=_positive_int, default=8,
+                        help="批量处理：每个任务处理的文件数（默认 8）")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="不使用结果缓存，重新统计并写入所有文档")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="清空结果缓存")
+    parser.add_argument('--cache-dir',
+                        help="结果缓存目录（默认 ~/.cache/video_script_counter）")
+    parser.add_argument('--report', choices=REPORT_FORMATS,
+                        help="只统计、不写入文档，输出 JSON、CSV 或 Excel 报表")
+    parser.add_argument('--report-file',
+                        help="报表文件路径（默认输出到标准输出；xlsx 必须指定）")
+    parser.add_argument('--report-by', choices=REPORT_LAYOUTS, default='section',
+                        help="CSV/Excel 报表每个部分一行（section，默认）或每个文档一行（document）")
+    parser.add_argument('--report-totals', action='store_true',
+                        help="CSV 报表最后追加合计行（Excel 报表总是追加）")
+    parser.add_argument('--watch', action='store_true',
+                        help="监视输入目录，脚本保存后自动重新统计")
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help="监视模式：文件停止写入多少秒后再处理（默认 1）")
+    parser.add_argument('--poll', type=float, default=None, metavar='SECONDS',
+                        help="监视模式：改用轮询，指定扫描间隔（默认优先使用 inotify）")
+    parser.add_argument('--schema', metavar='FILE',
+                        help="从 JSON 方案文件读取部分的名称和标题模式（默认为内置的四个部分）")
+    parser.add_argument('--subsections', action='store_true',
+                        help="同时标注子部分（知识点N、练习题N 等）的字数和时间")
+    parser.add_argument('--headers-footers', action='store_true',
+                        help="同时统计页眉和页脚中的文字（默认只统计正文、表格和文本框）")
+    parser.add_argument('--duration-model', metavar='MODEL',
+                        help="时长模型：speech_rate（默认，按字数匀速换算）、class_cost"
+                             "（按字符类别和停顿标记估算）或 JSON 模型文件")
+    parser.add_argument('--split-jobs', type=_positive_int, default=None, metavar='N',
+                        help="单个大文档：把正文分块，用 N 个工作进程并行统计（结果与不分块时相同）")
+    parser.add_argument('--profile', action='store_true',
+                        help="打印各处理阶段的用时（批量处理时在当前进程中依次处理）")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="同时把 cProfile 结果保存到文件（可用 python -m pstats 查看）")
+    args = parser.parse_args()
+
+    cache_dir = None if args.no_cache else (args.cache_dir or ResultCache.default_directory())
+    if args.clear_cache:
+        removed = ResultCache(args.cache_dir).clear()
+        print(f"已清空结果缓存（{removed} 个条目）")
+        if not args.inputs and not args.file_list:
+            return
+
+    if not args.inputs and not args.file_list:
         print("使用方法: python video_script_counter.py <输入文件.docx>")
         print("\n示例:")
         print("  python video_script_counter.py 我的视频脚本.docx")
+        print("  python video_script_counter.py 脚本目录/ -j 8")
+        print("  python video_script_counter.py '脚本/**/*.docx' --file-list 列表.txt")
+        print("  python video_script_counter.py 供应商.zip")
+        print("  python video_script_counter.py 脚本目录/ --watch")
+        print("  python video_script_counter.py 脚本目录/ --report xlsx --report-file 统计.xlsx")
         sys.exit(1)
 
-    input_file = sys.argv[1]
-
+    duration_model = rules = None
+    if args.duration_model:
+        try:
+            duration_model = load_model(args.duration_model, CountingEngine.SPEECH_RATE)
+        except (OSError, ValueError) as e:
+            print(f"❌ 错误: 无法读取时长模型 {args.duration_model}: {e}", file=sys.stderr)
+            sys.exit(1)
+    if args.schema:
+        try:
+            rules = RuleRegistry.load(args.schema)
+        except (OSError, ValueError) as e:
+            print(f"❌ 错误: 无法读取方案文件 {args.schema}: {e}", file=sys.stderr)
+            sys.exit(1)
+    # 按命令行配置的统计引擎，传给各处理路径和工作进程
+    engine = CountingEngine(rules=rules, annotate_subsections=args.subsections or None,
+                            headers_footers=args.headers_footers or None,
+                            duration_model=duration_model, split_jobs=args.split_jobs)
+
+    profiler = Profiler() if args.profile or args.profile_output else None
+    code_profile = None
+    if args.profile_output:
+        import cProfile
+        code_profile = cProfile.Profile()
+        code_profile.enable()
     try:
-        counter = VideoScriptCounter(input_file)
-        counter.process_document()
-    except Exception as e:
-        print(f"\n❌ 错误: {e}")
-        import traceback
-        traceback.print_exc()
+        run_inputs(args, cache_dir, engine, profiler)
+    finally:
+        if code_profile is not None:
+            code_profile.disable()
+            code_profile.dump_stats(args.profile_output)
+        if profiler is not None:
+            # 输出到标准错误，不混入报表
+            print("\n" + profiler.format(), file=sys.stderr)
+            if code_profile is not None:
+                print(f"cProfile 结果已保存: {args.profile_output}", file=sys.stderr)
+
+
+def run_inputs(args, cache_dir, engine=None, profiler=None):
+    """
+    按命令行参数处理输入（监视、报表、单个文件或批量处理）
+
+    Args:
+        args: 解析后的命令行参数
+        cache_dir: 结果缓存目录（为 None 时不使用缓存）
+        engine: 按命令行配置的 CountingEngine 对象（可选）
+        profiler: profiling.Profiler 对象（可选）
+    """
+    if args.watch:
+        roots = [Path(path) for path in args.inputs]
+        not_dirs = [str(root) for root in roots if not root.is_dir()]
+        if not_dirs or args.file_list:
+            print(f"❌ 错误: 监视模式只接受目录: {', '.join(not_dirs) or args.file_list}")
+            sys.exit(1)
+        run_watch(roots, cache_dir, args.debounce,
+                  args.poll or 1.0, polling=args.poll is not None, engine=engine)
+        return
+
+    # 压缩包：包内的脚本在内存中处理，带标注的文档或报表写入新的压缩包
+    from bundles import is_bundle, run_bundles
+    bundles = [path for path in args.inputs if is_bundle(path)]
+    if bundles:
+        if args.report_file:
+            print("❌ 错误: 压缩包的报表写入输入包旁的 <包名>_统计 压缩包，"
+                  "不能与 --report-file 同时使用", file=sys.stderr)
+            sys.exit(1)
+        failures = run_bundles(bundles, args.jobs, args.report, args.report_by, cache_dir,
+                               args.report_totals or None, engine)
+        args.inputs = [path for path in args.inputs if not is_bundle(path)]
+        if args.inputs or args.file_list:
+            run_inputs(args, cache_dir, engine, profiler)
+        if failures:
+            sys.exit(1)
+        return
+
+    if args.report:
+        paths = collect_inputs(args.inputs, args.file_list)
+        if not paths:
+            print("❌ 错误: 没有找到 .docx 文件", file=sys.stderr)
+            sys.exit(1)
+        try:
+            failures = run_report(paths, args.report, args.report_file, args.jobs,
+                                  args.chunk_size, cache_dir, args.report_by, profiler,
+                                  totals=args.report_totals or None, engine=engine)
+        except ValueError as e:
+            print(f"❌ 错误: {e}", file=sys.stderr)
+            sys.exit(1)
+        if failures:
+            sys.exit(1)
+        return
+
+    # 单个文件：逐部分打印处理过程
+    if (len(args.inputs) == 1 and not args.file_list
+            and not Path(args.inputs[0]).is_dir() and not glob.has_magic(args.inputs[0])):
+        try:
+            cache = ResultCache(cache_dir) if cache_dir is not None else None
+            counter = VideoScriptCounter(args.inputs[0], cache=cache, profiler=profiler,
+                                         engine=engine)
+            counter.process_document()
+        except Exception as e:
+            print(f"\n❌ 错误: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+        return
+
+    paths = collect_inputs(args.inputs, args.file_list)
+    if not paths:
+        print("❌ 错误: 没有找到 .docx 文件")
+        sys.exit(1)
+
+    if run_batch(paths, args.jobs, args.chunk_size, cache_dir, profiler, engine):
         sys.exit(1)
 
 
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+目录监视工具
+
+监视目录树中文件的写入，用于保存后自动重新处理：
+- InotifyWatcher: Linux 上通过 ctypes 调用 inotify，无需额外依赖
+- PollingWatcher: 定期扫描文件的修改时间和大小（其他平台或 inotify 不可用时）
+- watch: 合并短时间内的多次保存（去抖动）后再回调
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# inotify 事件（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+               | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+def _walk_dirs(root):
+    """列出 root 及其下所有子目录"""
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        for name in dirnames:
+            yield Path(dirpath) / name
+
+
+def _walk_files(root, accept):
+    """列出 root 下所有满足 accept 的文件"""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = Path(dirpath) / name
+            if accept(path):
+                yield path
+
+
+class InotifyWatcher:
+    """用 inotify 监视目录树（Linux）"""
+
+    def __init__(self, roots, accept):
+        """
+        初始化
+
+        Args:
+            roots: 要监视的目录列表（递归监视子目录，包括之后新建的子目录）
+            accept: 判断文件是否需要报告的函数，参数为 Path
+
+        Raises:
+            OSError: 系统不支持 inotify 或监视数量超过上限
+        """
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError(errno.ENOSYS, "找不到 C 标准库")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        try:
+            self._add_watch_func = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except AttributeError:
+            raise OSError(errno.ENOSYS, "系统不支持 inotify") from None
+        self._add_watch_func.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.accept = accept
+        self.roots = [Path(root) for root in roots]
+        # 监视描述符 -> 目录
+        self._dirs = {}
+        try:
+            for root in self.roots:
+                self._add_tree(root)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, directory):
+        wd = self._add_watch_func(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            # 目录在添加监视前已被删除
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, f"{os.strerror(err)}: {directory}")
+        self._dirs[wd] = Path(directory)
+
+    def _add_tree(self, root):
+        for directory in _walk_dirs(root):
+            self._add_watch(directory)
+
+    def read(self, timeout=None):
+        """
+        等待文件变化
+
+        Args:
+            timeout: 最长等待秒数（None 表示一直等待）
+
+        Returns:
+            发生变化的文件路径集合（超时时为空集合）
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                self._handle(wd, mask, name, changed)
+        return changed
+
+    def _handle(self, wd, mask, name, changed):
+        if mask & IN_Q_OVERFLOW:
+            # 事件队列溢出，可能丢失了事件：重新扫描全部文件
+            for root in self.roots:
+                changed.update(_walk_files(root, self.accept))
+            return
+        if mask & IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return
+
+        directory = self._dirs.get(wd)
+        if directory is None or not name:
+            return
+        path = directory / name
+
+        if mask & IN_ISDIR:
+            # 新建或移入的子目录：添加监视，并报告在添加监视前已写入的文件
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+                changed.update(_walk_files(path, self.accept))
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and self.accept(path):
+            changed.add(path)
+
+    def close(self):
+        """关闭 inotify 描述符"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """定期扫描目录树，比较文件的修改时间和大小"""
+
+    def __init__(self, roots, accept, interval=1.0):
+        """
+        初始化
+
+        Args:
+            roots: 要监视的目录列表
+            accept: 判断文件是否需要报告的函数，参数为 Path
+            interval: 扫描间隔（秒）
+        """
+        self.roots = [Path(root) for root in roots]
+        self.accept = accept
+        self.interval = interval
+        self._states = self._scan()
+
+    def _scan(self):
+        states = {}
+        for root in self.roots:
+            for path in _walk_files(root, self.accept):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                states[path] = (stat.st_mtime_ns, stat.st_size)
+        return states
+
+    def read(self, timeout=None):
+        """
+        等待一个扫描间隔（不超过 timeout）后扫描文件变化
+
+        Returns:
+            新增或修改的文件路径集合
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        states = self._scan()
+        changed = {path for path, state in states.items() if self._states.get(path) != state}
+        self._states = states
+        return changed
+
+    def close(self):
+        """轮询方式无需释放资源"""
+
+
+def open_watcher(roots, accept, poll_interval=1.0, polling=False):
+    """
+    创建监视器：优先使用 inotify，不可用时退回轮询
+
+    Args:
+        roots: 要监视的目录列表
+        accept: 判断文件是否需要报告的函数
+        poll_interval: 轮询间隔（秒）
+        polling: 为 True 时直接使用轮询
+
+    Returns:
+        InotifyWatcher 或 PollingWatcher
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(roots, accept)
+        except OSError:
+            pass
+    return PollingWatcher(roots, accept, poll_interval)
+
+
+def watch(watcher, callback, debounce=1.0):
+    """
+    持续监视文件变化，文件在 debounce 秒内没有新的写入后才调用回调
+
+    编辑器保存时常常连续写入多次（临时文件、重命名、再次写入），
+    去抖动可以把这些写入合并为一次处理。
+
+    Args:
+        watcher: InotifyWatcher 或 PollingWatcher
+        callback: 回调函数，参数为按路径排序的 Path 列表
+        debounce: 去抖动时间（秒）
+    """
+    # 文件路径 -> 最后一次写入的时间
+    pending = {}
+    while True:
+        if pending:
+            timeout = max(0.0, min(pending.values()) + debounce - time.monotonic())
+        else:
+            timeout = None
+
+        changed = watcher.read(timeout)
+        now = time.monotonic()
+        for path in changed:
+            pending[path] = now
+
+        ready = sorted(path for path, last in pending.items() if now - last >= debounce)
+        if ready:
+            for path in ready:
+                del pending[path]
+            callback(ready)